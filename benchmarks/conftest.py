@@ -0,0 +1,55 @@
+import tracemalloc
+from typing import Any, Callable, Iterator, Protocol
+
+import knuckles
+import pytest
+from knuckles import Subsonic
+from knuckles.mock_server import MockServer, SyntheticLibrary
+from pytest_benchmark.fixture import BenchmarkFixture
+
+
+@pytest.fixture(scope="session")
+def library() -> SyntheticLibrary:
+    return SyntheticLibrary(
+        num_of_artists=100,
+        albums_per_artist=20,
+        songs_per_album=5,
+        song_size=16 * 1024 * 1024,
+    )
+
+
+@pytest.fixture(scope="session")
+def server(library: SyntheticLibrary) -> Iterator[MockServer]:
+    with MockServer(library) as mock_server:
+        yield mock_server
+
+
+@pytest.fixture(params=list(knuckles.RequestMethod))
+def subsonic(request: pytest.FixtureRequest, server: MockServer) -> Subsonic:
+    return server.subsonic(client="benchmarks", request_method=request.param)
+
+
+class BenchmarkWithMemory(Protocol):
+    def __call__(self, function: Callable[..., Any], *args: Any) -> Any: ...
+
+
+@pytest.fixture
+def benchmark_with_memory(benchmark: BenchmarkFixture) -> BenchmarkWithMemory:
+    """Record the peak of memory allocated by a single call of the function
+    before benchmarking it, so regressions in memory usage are also stored
+    with the results.
+    """
+
+    def inner(function: Callable[..., Any], *args: Any) -> Any:
+        tracemalloc.start()
+        try:
+            function(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info["peak_memory_bytes"] = peak
+
+        return benchmark(function, *args)
+
+    return inner
@@ -0,0 +1,23 @@
+from knuckles import Subsonic
+
+from benchmarks.conftest import BenchmarkWithMemory
+
+
+def test_json_request_small(
+    benchmark_with_memory: BenchmarkWithMemory, subsonic: Subsonic
+) -> None:
+    response = benchmark_with_memory(subsonic.api.json_request, "ping")
+
+    assert response["status"] == "ok"
+
+
+def test_json_request_large(
+    benchmark_with_memory: BenchmarkWithMemory, subsonic: Subsonic
+) -> None:
+    response = benchmark_with_memory(
+        subsonic.api.json_request,
+        "getAlbumList2",
+        {"type": "alphabeticalByName", "size": 500, "offset": 0},
+    )
+
+    assert len(response["albumList2"]["album"]) == 500
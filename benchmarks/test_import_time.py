@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+# Every snippet runs in a new interpreter, as the imported modules are
+# cached by the one running the benchmarks
+SNIPPETS = {
+    "interpreter": "pass",
+    "import": "import knuckles",
+    "client": (
+        "import knuckles\n"
+        "knuckles.Subsonic('127.0.0.1', 'user', 'password', 'benchmarks')"
+    ),
+    "single_helper": (
+        "import knuckles\n"
+        "knuckles.Subsonic('127.0.0.1', 'user', 'password', 'benchmarks').system"
+    ),
+    "all_helpers": (
+        "import functools\n"
+        "import knuckles\n"
+        "subsonic = knuckles.Subsonic('127.0.0.1', 'user', 'password', 'benchmarks')\n"
+        "for name, value in vars(knuckles.Subsonic).items():\n"
+        "    if isinstance(value, functools.cached_property):\n"
+        "        getattr(subsonic, name)\n"
+    ),
+}
+
+
+@pytest.mark.parametrize("snippet", SNIPPETS.keys())
+def test_cold_start(benchmark: BenchmarkFixture, snippet: str) -> None:
+    """Measure the time a new interpreter takes to run the snippet, the
+    `interpreter` one being the baseline to subtract from the rest.
+    """
+
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", SNIPPETS[snippet]],),
+        kwargs={"check": True},
+        rounds=10,
+    )
@@ -0,0 +1,28 @@
+from knuckles import Album, Subsonic
+from knuckles.mock_server import MockServer
+
+from benchmarks.conftest import BenchmarkWithMemory
+
+
+def test_album_list_pagination(
+    benchmark_with_memory: BenchmarkWithMemory,
+    subsonic: Subsonic,
+    server: MockServer,
+) -> None:
+    page_size = 500
+
+    def paginate() -> list[Album]:
+        albums: list[Album] = []
+
+        while True:
+            page = subsonic.lists.get_album_list_alphabetical_by_name(
+                page_size, len(albums)
+            )
+            albums += page
+
+            if len(page) < page_size:
+                return albums
+
+    albums = benchmark_with_memory(paginate)
+
+    assert len(albums) == len(server.library.albums)
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from knuckles import Subsonic
+from knuckles.mock_server import MockServer
+
+from benchmarks.conftest import BenchmarkWithMemory
+
+
+def test_download(
+    benchmark_with_memory: BenchmarkWithMemory,
+    subsonic: Subsonic,
+    server: MockServer,
+    tmp_path: Path,
+) -> None:
+    downloaded_path = benchmark_with_memory(
+        subsonic.media_retrieval.download, "so-1", tmp_path
+    )
+
+    assert downloaded_path.stat().st_size == server.library.song_size
@@ -0,0 +1,71 @@
+import knuckles
+import pytest
+from knuckles import Album, Artist, Song, Subsonic
+from knuckles.mock_server import SyntheticLibrary
+
+from benchmarks.conftest import BenchmarkWithMemory
+
+
+# No request is made, so there is no need to run them with every request method
+@pytest.fixture
+def subsonic() -> Subsonic:
+    return knuckles.Subsonic("127.0.0.1", "user", "password", "benchmarks")
+
+
+def test_song_construction(
+    benchmark_with_memory: BenchmarkWithMemory,
+    subsonic: Subsonic,
+    library: SyntheticLibrary,
+) -> None:
+    songs_data = list(library.songs.values())[:1_000]
+
+    def build() -> list[Song]:
+        return [Song(subsonic, **song) for song in songs_data]
+
+    songs = benchmark_with_memory(build)
+
+    assert len(songs) == 1_000
+
+
+def test_album_construction(
+    benchmark_with_memory: BenchmarkWithMemory,
+    subsonic: Subsonic,
+    library: SyntheticLibrary,
+) -> None:
+    albums_data = [
+        {
+            **album,
+            "song": [library.songs[song_id] for song_id in library.album_songs[id_]],
+        }
+        for id_, album in list(library.albums.items())[:200]
+    ]
+
+    def build() -> list[Album]:
+        return [Album(subsonic, **album) for album in albums_data]
+
+    albums = benchmark_with_memory(build)
+
+    assert len(albums[0].songs) == 5
+
+
+def test_artist_construction(
+    benchmark_with_memory: BenchmarkWithMemory,
+    subsonic: Subsonic,
+    library: SyntheticLibrary,
+) -> None:
+    artists_data = [
+        {
+            **artist,
+            "album": [
+                library.albums[album_id] for album_id in library.artist_albums[id_]
+            ],
+        }
+        for id_, artist in list(library.artists.items())[:50]
+    ]
+
+    def build() -> list[Artist]:
+        return [Artist(subsonic, **artist) for artist in artists_data]
+
+    artists = benchmark_with_memory(build)
+
+    assert len(artists[0].albums) == 20
@@ -0,0 +1,11 @@
+from knuckles import Subsonic
+
+from benchmarks.conftest import BenchmarkWithMemory
+
+
+def test_search(benchmark_with_memory: BenchmarkWithMemory, subsonic: Subsonic) -> None:
+    result = benchmark_with_memory(subsonic.searching.search, "", 500, 0, 200, 0, 100)
+
+    assert len(result.songs) == 500
+    assert len(result.albums) == 200
+    assert len(result.artists) == 100
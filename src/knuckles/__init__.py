@@ -1,42 +1,169 @@
-from importlib.metadata import version
-
-from ._api import RequestMethod
-from ._media_retrieval import SubtitlesFileFormat
-from ._subsonic import Subsonic
-from .models._album import Album, AlbumInfo, Disc, RecordLabel, ReleaseDate
-from .models._artist import Artist, ArtistInfo
-from .models._artist_index import ArtistIndex
-from .models._bookmark import Bookmark
-from .models._chat_message import ChatMessage
-from .models._contributor import Contributor
-from .models._cover_art import CoverArt
-from .models._genre import Genre, ItemGenre
-from .models._internet_radio_station import InternetRadioStation
-from .models._jukebox import Jukebox
-from .models._lyrics import Lyrics
-from .models._music_directory import MusicDirectory
-from .models._music_folder import MusicFolder
-from .models._now_playing_entry import NowPlayingEntry
-from .models._play_queue import PlayQueue
-from .models._playlist import Playlist
-from .models._podcast import Channel, Episode
-from .models._replay_gain import ReplayGain
-from .models._scan_status import ScanStatus
-from .models._search_result import SearchResult
-from .models._share import Share
-from .models._song import Song
-from .models._starred_content import StarredContent
-from .models._system import License, SubsonicResponse
-from .models._user import User
-from .models._video import AudioTrack, Captions, Video, VideoInfo
-
-__version__ = version("knuckles")
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._api import RequestMethod
+    from ._arrow_export import ArrowExporter, ParquetAppendResult
+    from ._concurrency import generate_many, process_map
+    from ._crawler import LibraryCrawler
+    from ._identity_map import IdentityMap
+    from ._lists import CatalogSharding
+    from ._media_library_scanning import ScanProgress
+    from ._media_retrieval import SubtitlesFileFormat
+    from ._podcast_sync import PodcastSync, PodcastSyncResult
+    from ._poller import Poller
+    from ._pool import RoutingStrategy, ServerHealth, SubsonicPool
+    from ._profiler import Profiler, ProfileRecord, ProfileSummary
+    from ._queue_prefetcher import QueuePrefetcher
+    from ._scrobble_buffer import Scrobble, ScrobbleBuffer
+    from ._smart_playlist import Operator, Rule, SmartPlaylist, SmartPlaylistEngine
+    from ._song_table import SongTable
+    from ._starred_tracker import StarredChanges, StarredTracker
+    from ._stream_cache import Segment, StreamCache, StreamReader
+    from ._subsonic import Subsonic
+    from .models._album import Album, AlbumInfo, Disc, RecordLabel, ReleaseDate
+    from .models._artist import Artist, ArtistInfo
+    from .models._artist_index import ArtistIndex
+    from .models._bookmark import Bookmark
+    from .models._chat_message import ChatMessage
+    from .models._contributor import Contributor
+    from .models._cover_art import CoverArt
+    from .models._genre import Genre, ItemGenre
+    from .models._internet_radio_station import InternetRadioStation
+    from .models._jukebox import Jukebox
+    from .models._lyrics import Lyrics
+    from .models._music_directory import MusicDirectory
+    from .models._music_folder import MusicFolder
+    from .models._now_playing_entry import NowPlayingEntry
+    from .models._play_queue import PlayQueue
+    from .models._playlist import Playlist
+    from .models._podcast import Channel, Episode
+    from .models._replay_gain import ReplayGain
+    from .models._scan_status import ScanStatus
+    from .models._search_result import SearchResult
+    from .models._serialization import from_msgpack, to_msgpack
+    from .models._share import Share
+    from .models._song import Song
+    from .models._starred_content import StarredContent
+    from .models._system import License, SubsonicResponse
+    from .models._user import User
+    from .models._video import AudioTrack, Captions, Video, VideoInfo
+
+    __version__: str
+
+# The module where each public name is defined, they are only imported the first
+# time they are accessed so the cost of importing the helpers, the models and
+# their dependencies is only paid when they are really used (PEP 562)
+_LAZY_IMPORTS: dict[str, str] = {
+    "RequestMethod": "._api",
+    "generate_many": "._concurrency",
+    "process_map": "._concurrency",
+    "LibraryCrawler": "._crawler",
+    "CatalogSharding": "._lists",
+    "SongTable": "._song_table",
+    "Operator": "._smart_playlist",
+    "Rule": "._smart_playlist",
+    "SmartPlaylist": "._smart_playlist",
+    "SmartPlaylistEngine": "._smart_playlist",
+    "ArrowExporter": "._arrow_export",
+    "ParquetAppendResult": "._arrow_export",
+    "ScanProgress": "._media_library_scanning",
+    "SubtitlesFileFormat": "._media_retrieval",
+    "PodcastSync": "._podcast_sync",
+    "PodcastSyncResult": "._podcast_sync",
+    "Poller": "._poller",
+    "SubsonicPool": "._pool",
+    "RoutingStrategy": "._pool",
+    "ServerHealth": "._pool",
+    "Profiler": "._profiler",
+    "IdentityMap": "._identity_map",
+    "ProfileRecord": "._profiler",
+    "ProfileSummary": "._profiler",
+    "QueuePrefetcher": "._queue_prefetcher",
+    "ScrobbleBuffer": "._scrobble_buffer",
+    "Scrobble": "._scrobble_buffer",
+    "StarredTracker": "._starred_tracker",
+    "StarredChanges": "._starred_tracker",
+    "StreamCache": "._stream_cache",
+    "StreamReader": "._stream_cache",
+    "Segment": "._stream_cache",
+    "Subsonic": "._subsonic",
+    "Album": ".models._album",
+    "AlbumInfo": ".models._album",
+    "Disc": ".models._album",
+    "RecordLabel": ".models._album",
+    "ReleaseDate": ".models._album",
+    "Artist": ".models._artist",
+    "ArtistInfo": ".models._artist",
+    "ArtistIndex": ".models._artist_index",
+    "Bookmark": ".models._bookmark",
+    "ChatMessage": ".models._chat_message",
+    "Contributor": ".models._contributor",
+    "CoverArt": ".models._cover_art",
+    "Genre": ".models._genre",
+    "ItemGenre": ".models._genre",
+    "InternetRadioStation": ".models._internet_radio_station",
+    "Jukebox": ".models._jukebox",
+    "Lyrics": ".models._lyrics",
+    "MusicDirectory": ".models._music_directory",
+    "MusicFolder": ".models._music_folder",
+    "NowPlayingEntry": ".models._now_playing_entry",
+    "PlayQueue": ".models._play_queue",
+    "Playlist": ".models._playlist",
+    "Channel": ".models._podcast",
+    "Episode": ".models._podcast",
+    "ReplayGain": ".models._replay_gain",
+    "ScanStatus": ".models._scan_status",
+    "SearchResult": ".models._search_result",
+    "Share": ".models._share",
+    "Song": ".models._song",
+    "StarredContent": ".models._starred_content",
+    "License": ".models._system",
+    "SubsonicResponse": ".models._system",
+    "User": ".models._user",
+    "AudioTrack": ".models._video",
+    "Captions": ".models._video",
+    "Video": ".models._video",
+    "VideoInfo": ".models._video",
+    "to_msgpack": ".models._serialization",
+    "from_msgpack": ".models._serialization",
+}
 
 __all__ = [
     "__version__",
     "Subsonic",
+    "SubsonicPool",
+    "RoutingStrategy",
+    "ServerHealth",
     "RequestMethod",
     "SubtitlesFileFormat",
+    "Profiler",
+    "IdentityMap",
+    "ProfileRecord",
+    "ProfileSummary",
+    "ScrobbleBuffer",
+    "Scrobble",
+    "StarredTracker",
+    "StarredChanges",
+    "Poller",
+    "ScanProgress",
+    "StreamCache",
+    "StreamReader",
+    "Segment",
+    "QueuePrefetcher",
+    "PodcastSync",
+    "PodcastSyncResult",
+    "generate_many",
+    "process_map",
+    "LibraryCrawler",
+    "CatalogSharding",
+    "SongTable",
+    "Operator",
+    "Rule",
+    "SmartPlaylist",
+    "SmartPlaylistEngine",
+    "ArrowExporter",
+    "ParquetAppendResult",
     "RecordLabel",
     "Disc",
     "ReleaseDate",
@@ -74,4 +201,46 @@ __all__ = [
     "Captions",
     "VideoInfo",
     "Video",
+    "to_msgpack",
+    "from_msgpack",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the requested public name from its module the first time
+    it is accessed.
+
+    Args:
+        name: The name of the attribute being accessed.
+
+    Raises:
+        AttributeError: Raised if the name is not part of the public API.
+
+    Returns:
+        The value of the requested name.
+    """
+
+    if name == "__version__":
+        from importlib.metadata import version
+
+        value: Any = version("knuckles")
+    elif name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache the value so this function is not called again for the same name
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    """List all the names of the module, including the ones that have not
+    been imported yet.
+
+    Returns:
+        The sorted names of the module.
+    """
+
+    return sorted({*globals(), *__all__})
@@ -1,15 +1,16 @@
 import hashlib
 import secrets
+import time
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from urllib.parse import ParseResult, urlparse
 
-import requests
-from requests import Response
-from requests.models import PreparedRequest
-
+from ._profiler import Profiler
 from .exceptions import ERROR_CODE_EXCEPTION, get_error_code_exception
 
+if TYPE_CHECKING:
+    from requests import Response
+
 
 class RequestMethod(Enum):
     GET = "get"
@@ -30,6 +31,7 @@ class Api:
         use_https: bool = True,
         use_token: bool = True,
         request_method: RequestMethod = RequestMethod.GET,
+        profiler: Profiler | None = None,
     ) -> None:
         """Class in charge of managing the access to the REST API of
         the OpenSubsonic server.
@@ -44,6 +46,8 @@ class Api:
             use_token: If the modern token based authentication should be used.
             request_method: If the requests should send the data as
                 GET parameters or POST form data.
+            profiler: A profiler where the network and JSON decode time
+                of the requests should be recorded.
         """
         pass
 
@@ -52,6 +56,7 @@ class Api:
         self.client = client
         self.use_token = use_token
         self.request_method = request_method
+        self.profiler = profiler
 
         # Sanitize url and ensure the correct protocol is used
         parsed_url: ParseResult = urlparse(url)
@@ -64,6 +69,11 @@ class Api:
         else:
             self.url = f"http://{base_url}"
 
+    def __getstate__(self) -> dict[str, Any]:
+        # Only the configuration is pickled, the profiler records the
+        # calls of a single process
+        return {**self.__dict__, "profiler": None}
+
     def _generate_params(
         self, extra_params: dict[str, Any] | None = None
     ) -> dict[str, Any]:
@@ -116,6 +126,9 @@ class Api:
                 for authentication.
         """
 
+        # Requests is slow to import, so it is only done when it is really needed
+        from requests.models import PreparedRequest
+
         prepared_request = PreparedRequest()
         prepared_request.prepare_url(
             f"{self.url}/rest/{endpoint}", {**self._generate_params(extra_params)}
@@ -126,14 +139,19 @@ class Api:
         return prepared_request.url  # type: ignore [return-value]
 
     def raw_request(
-        self, endpoint: str, extra_params: dict[str, Any] | None = None
-    ) -> Response:
+        self,
+        endpoint: str,
+        extra_params: dict[str, Any] | None = None,
+        request_method: RequestMethod | None = None,
+    ) -> "Response":
         """Makes a request to the OpenSubsonic server REST API.
 
         Args:
             endpoint: The endpoint to be appended in the URL, **without** the
                 leading `/rest/`.
             extra_params: Extra parameters to the added to the request.
+            request_method: The verb to use only for this request, the one
+                of the object by default.
 
         Returns:
             The
@@ -141,21 +159,34 @@ class Api:
                 `response` object of the executed request.
         """
 
-        match self.request_method:
+        # The first import of requests is slow, so it is timed too
+        start = time.perf_counter()
+
+        import requests
+
+        match request_method or self.request_method:
             case RequestMethod.POST:
-                return requests.post(
+                response = requests.post(
                     url=f"{self.url}/rest/{endpoint}",
                     data=self._generate_params(extra_params),
                 )
 
             case RequestMethod.GET | _:
-                return requests.get(
+                response = requests.get(
                     url=f"{self.url}/rest/{endpoint}",
                     params=self._generate_params(extra_params),
                 )
 
+        if self.profiler is not None:
+            self.profiler.add_network_time(time.perf_counter() - start)
+
+        return response
+
     def json_request(
-        self, endpoint: str, extra_params: dict[str, Any] | None = None
+        self,
+        endpoint: str,
+        extra_params: dict[str, Any] | None = None,
+        request_method: RequestMethod | None = None,
     ) -> dict[str, Any]:
         """Makes a request to the OpenSubsonic server REST API and returns the
         data from the `subsonic_response` property. Should **never** be used
@@ -165,6 +196,8 @@ class Api:
             endpoint: The endpoint to be appended in the URL, **without** the
                 leading `/rest/`.
             extra_params: Extra parameters to the added to the request.
+            request_method: The verb to use only for this request, the one
+                of the object by default.
 
         Raises:
             code_error: Raise an error if the server reports and issue with the
@@ -177,10 +210,14 @@ class Api:
             The data contained in the `subsonic_response` property.
         """
 
-        response = self.raw_request(endpoint, extra_params)
+        response = self.raw_request(endpoint, extra_params, request_method)
 
+        start = time.perf_counter()
         json_response: dict[str, Any] = response.json()["subsonic-response"]
 
+        if self.profiler is not None:
+            self.profiler.add_decode_time(time.perf_counter() - start)
+
         if json_response["status"] == "failed":
             code_error: ERROR_CODE_EXCEPTION = get_error_code_exception(
                 json_response["error"]["code"]
@@ -0,0 +1,423 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, NamedTuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as error:
+    raise ImportError(
+        "PyArrow is needed to export the library, install it with 'knuckles[arrow]'"
+    ) from error
+
+from dateutil import parser
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+# The kinds of models that can be exported
+ExportKind = Literal["song", "album", "artist"]
+
+
+class _Column(NamedTuple):
+    """A column of an exported table and where its values come from."""
+
+    name: str
+    key: str
+    type: Any
+    convert: Callable[[Any], Any] | None = None
+
+
+def _timestamp(value: str) -> Any:
+    return parser.parse(value)
+
+
+def _names(value: list[dict[str, Any]]) -> list[str]:
+    return [item["name"] for item in value]
+
+
+def _artists(value: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [{"id": item.get("id"), "name": item.get("name")} for item in value]
+
+
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+_STRINGS = pa.list_(pa.string())
+_ARTISTS = pa.list_(pa.struct([("id", pa.string()), ("name", pa.string())]))
+
+_COLUMNS: dict[ExportKind, list[_Column]] = {
+    "song": [
+        _Column("id", "id", pa.string()),
+        _Column("title", "title", pa.string()),
+        _Column("parent", "parent", pa.string()),
+        _Column("track", "track", pa.int32()),
+        _Column("year", "year", pa.int32()),
+        _Column("genre", "genre", pa.string()),
+        _Column("size", "size", pa.int64()),
+        _Column("content_type", "contentType", pa.string()),
+        _Column("suffix", "suffix", pa.string()),
+        _Column("duration", "duration", pa.int32()),
+        _Column("bit_rate", "bitRate", pa.int32()),
+        _Column("path", "path", pa.string()),
+        _Column("user_rating", "userRating", pa.int8()),
+        _Column("average_rating", "averageRating", pa.float64()),
+        _Column("play_count", "playCount", pa.int64()),
+        _Column("disc_number", "discNumber", pa.int32()),
+        _Column("type", "type", pa.string()),
+        _Column("album_id", "albumId", pa.string()),
+        _Column("album", "album", pa.string()),
+        _Column("artist_id", "artistId", pa.string()),
+        _Column("artist", "artist", pa.string()),
+        _Column("cover_art", "coverArt", pa.string()),
+        _Column("created", "created", _TIMESTAMP, _timestamp),
+        _Column("starred", "starred", _TIMESTAMP, _timestamp),
+        _Column("played", "played", _TIMESTAMP, _timestamp),
+        _Column("bpm", "bpm", pa.int32()),
+        _Column("comment", "comment", pa.string()),
+        _Column("sort_name", "sortName", pa.string()),
+        _Column("music_brainz_id", "musicBrainzId", pa.string()),
+        _Column("genres", "genres", _STRINGS, _names),
+        _Column("artists", "artists", _ARTISTS, _artists),
+        _Column("display_artist", "displayArtist", pa.string()),
+        _Column("album_artists", "albumArtists", _ARTISTS, _artists),
+        _Column("display_album_artist", "displayAlbumArtist", pa.string()),
+        _Column("display_composer", "displayComposer", pa.string()),
+        _Column("moods", "moods", _STRINGS),
+        _Column("media_type", "mediaType", pa.string()),
+    ],
+    "album": [
+        _Column("id", "id", pa.string()),
+        _Column("name", "name", pa.string()),
+        _Column("artist_id", "artistId", pa.string()),
+        _Column("artist", "artist", pa.string()),
+        _Column("cover_art", "coverArt", pa.string()),
+        _Column("song_count", "songCount", pa.int32()),
+        _Column("duration", "duration", pa.int64()),
+        _Column("play_count", "playCount", pa.int64()),
+        _Column("created", "created", _TIMESTAMP, _timestamp),
+        _Column("starred", "starred", _TIMESTAMP, _timestamp),
+        _Column("played", "played", _TIMESTAMP, _timestamp),
+        _Column("year", "year", pa.int32()),
+        _Column("genre", "genre", pa.string()),
+        _Column("user_rating", "userRating", pa.int8()),
+        _Column("record_labels", "recordLabels", _STRINGS, _names),
+        _Column("music_brainz_id", "musicBrainzId", pa.string()),
+        _Column("genres", "genres", _STRINGS, _names),
+        _Column("artists", "artists", _ARTISTS, _artists),
+        _Column("display_artist", "displayArtist", pa.string()),
+        _Column("release_types", "releaseTypes", _STRINGS),
+        _Column("moods", "moods", _STRINGS),
+        _Column("sort_name", "sortName", pa.string()),
+        _Column("is_compilation", "isCompilation", pa.bool_()),
+    ],
+    "artist": [
+        _Column("id", "id", pa.string()),
+        _Column("name", "name", pa.string()),
+        _Column("cover_art", "coverArt", pa.string()),
+        _Column("album_count", "albumCount", pa.int32()),
+        _Column("artist_image_url", "artistImageUrl", pa.string()),
+        _Column("starred", "starred", _TIMESTAMP, _timestamp),
+        _Column("user_rating", "userRating", pa.int8()),
+        _Column("average_rating", "averageRating", pa.float64()),
+        _Column("music_brainz_id", "musicBrainzId", pa.string()),
+        _Column("sort_name", "sortName", pa.string()),
+        _Column("roles", "roles", _STRINGS),
+    ],
+}
+
+# The schema of the exported table of every kind of model, with the
+# same names as the attributes of the models
+SCHEMAS: dict[ExportKind, pa.Schema] = {
+    kind: pa.schema([(column.name, column.type) for column in columns])
+    for kind, columns in _COLUMNS.items()
+}
+
+
+class ParquetAppendResult(NamedTuple):
+    """What has been appended to a dataset of Parquet files.
+
+    Attributes:
+        path: The new file with the changed rows, `None` if nothing
+            has changed.
+        written_rows: The number of new or changed rows.
+        removed_ids: The IDs of the rows that no longer exist in
+            the server.
+    """
+
+    path: Path | None
+    written_rows: int
+    removed_ids: list[str]
+
+
+class ArrowExporter:
+    """Object that exports the songs, albums and artists of the library
+    as Arrow record batches with a fixed schema, one for every page of
+    the server, so the library can be written to Parquet files without
+    keeping all of it in memory.
+
+    Attributes:
+        page_size: The number of models requested in every page.
+        music_folder_id: The ID of the music folder to export, if any.
+        state_file: The file where the fingerprints of the exported rows
+            are saved between incremental exports, if any.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        page_size: int = 500,
+        music_folder_id: str | None = None,
+        state_file: Path | None = None,
+    ) -> None:
+        """Create a new exporter.
+
+        Args:
+            subsonic: The object used to make the requests.
+            page_size: The number of models to request in every page,
+                which is also the maximum size of every record batch.
+            music_folder_id: If given, the ID of the music folder whose
+                models should be exported.
+            state_file: The file where the fingerprints of the exported
+                rows should be saved between incremental exports, they
+                are only kept in memory if it is `None`.
+        """
+
+        self.subsonic = subsonic
+        self.page_size = page_size
+        self.music_folder_id = music_folder_id
+        self.state_file = state_file
+
+        # The fingerprint of every exported row by kind and ID
+        self._fingerprints: dict[str, dict[str, str]] = {}
+
+        if self.state_file is not None and self.state_file.exists():
+            self._fingerprints = json.loads(self.state_file.read_text())
+
+    def batches(self, kind: ExportKind) -> Iterator[pa.RecordBatch]:
+        """Request all the models of a kind page by page.
+
+        Args:
+            kind: The kind of models to export.
+
+        Returns:
+            An iterator over a record batch for every page.
+        """
+
+        for page in self._pages(kind):
+            yield self._to_batch(kind, page)
+
+    def write_parquet(self, kind: ExportKind, path: Path) -> int:
+        """Write all the models of a kind to a Parquet file, with a row
+        group for every page. The file is replaced atomically, so a
+        failed export never leaves it half written.
+
+        Args:
+            kind: The kind of models to export.
+            path: The file to write.
+
+        Returns:
+            The number of written rows.
+        """
+
+        temporary = path.with_name(path.name + ".tmp")
+        written = 0
+
+        try:
+            with pq.ParquetWriter(temporary, SCHEMAS[kind]) as writer:
+                for batch in self.batches(kind):
+                    writer.write_batch(batch)
+                    written += batch.num_rows
+        except BaseException:
+            # A failed export never leaves the temporary file behind
+            temporary.unlink(missing_ok=True)
+            raise
+
+        os.replace(temporary, path)
+
+        return written
+
+    def append_changes(self, kind: ExportKind, directory: Path) -> ParquetAppendResult:
+        """Write the models of a kind that are new or have changed since
+        the last call to a new Parquet file of a directory, so together
+        all its files hold the history of the library.
+
+        Args:
+            kind: The kind of models to export.
+            directory: The directory of the dataset, the files are named
+                after the kind and a growing number.
+
+        Returns:
+            The written file and the rows that have changed.
+        """
+
+        known = self._fingerprints.get(kind, {})
+        current: dict[str, str] = {}
+
+        part = len(list(directory.glob(f"{kind}-*.parquet")))
+        path = directory / f"{kind}-{part:05}.parquet"
+        temporary = path.with_name(path.name + ".tmp")
+        writer: pq.ParquetWriter | None = None
+        written = 0
+
+        try:
+            for page in self._pages(kind):
+                changed = []
+
+                for entry in page:
+                    fingerprint = _fingerprint(entry)
+                    current[entry["id"]] = fingerprint
+
+                    if known.get(entry["id"]) != fingerprint:
+                        changed.append(entry)
+
+                if not changed:
+                    continue
+
+                # The file is only created if something has changed
+                if writer is None:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    writer = pq.ParquetWriter(temporary, SCHEMAS[kind])
+
+                writer.write_batch(self._to_batch(kind, changed))
+                written += len(changed)
+        except BaseException:
+            # A failed export never leaves the temporary file behind
+            if writer is not None:
+                writer.close()
+                temporary.unlink(missing_ok=True)
+
+            raise
+
+        if writer is not None:
+            writer.close()
+            os.replace(temporary, path)
+
+        self._fingerprints[kind] = current
+        self._save()
+
+        return ParquetAppendResult(
+            path if writer is not None else None,
+            written,
+            [id_ for id_ in known if id_ not in current],
+        )
+
+    def _pages(self, kind: ExportKind) -> Iterator[list[dict[str, Any]]]:
+        """Request all the models of a kind as sent by the server.
+
+        Args:
+            kind: The kind of models to request.
+
+        Returns:
+            An iterator over the entries of every page.
+        """
+
+        if kind == "artist":
+            response = self.subsonic.api.json_request(
+                "getArtists", {"musicFolderId": self.music_folder_id}
+            )["artists"]
+            artists = [
+                artist
+                for index in response.get("index", [])
+                for artist in index.get("artist", [])
+            ]
+
+            # All the artists are sent at once, they are split to keep
+            # the batches of the same size as the other kinds
+            for start in range(0, len(artists), self.page_size):
+                yield artists[start : start + self.page_size]
+
+            return
+
+        offset = 0
+
+        while True:
+            if kind == "song":
+                page = self.subsonic.api.json_request(
+                    "search3",
+                    {
+                        "query": "",
+                        "songCount": self.page_size,
+                        "songOffset": offset,
+                        "albumCount": 0,
+                        "artistCount": 0,
+                        "musicFolderId": self.music_folder_id,
+                    },
+                )["searchResult3"].get("song", [])
+            else:
+                page = self.subsonic.api.json_request(
+                    "getAlbumList2",
+                    {
+                        "type": "alphabeticalByName",
+                        "size": self.page_size,
+                        "offset": offset,
+                        "musicFolderId": self.music_folder_id,
+                    },
+                )["albumList2"].get("album", [])
+
+            if page:
+                yield page
+
+            if len(page) < self.page_size:
+                return
+
+            offset += self.page_size
+
+    def _to_batch(
+        self, kind: ExportKind, entries: list[dict[str, Any]]
+    ) -> pa.RecordBatch:
+        """Convert the entries sent by the server to a record batch.
+
+        Args:
+            kind: The kind of the entries.
+            entries: The entries to convert.
+
+        Returns:
+            A record batch with the schema of the kind.
+        """
+
+        columns = _COLUMNS[kind]
+
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(
+                    [
+                        column.convert(entry[column.key])
+                        if column.convert is not None
+                        and entry.get(column.key) is not None
+                        else entry.get(column.key)
+                        for entry in entries
+                    ],
+                    type=column.type,
+                )
+                for column in columns
+            ],
+            schema=SCHEMAS[kind],
+        )
+
+    def _save(self) -> None:
+        """Write the fingerprints to the state file, replacing it
+        atomically so a crash never leaves it half written.
+        """
+
+        if self.state_file is None:
+            return
+
+        temporary = self.state_file.with_name(self.state_file.name + ".tmp")
+        temporary.write_text(json.dumps(self._fingerprints))
+        os.replace(temporary, self.state_file)
+
+
+def _fingerprint(entry: dict[str, Any]) -> str:
+    """Get a short hash of the content of an entry sent by the server.
+
+    Args:
+        entry: The entry to hash.
+
+    Returns:
+        A hash that changes when any value of the entry changes.
+    """
+
+    content = json.dumps(entry, sort_keys=True, default=str).encode()
+
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
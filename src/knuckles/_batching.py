@@ -0,0 +1,116 @@
+from typing import Any
+
+from ._api import Api, RequestMethod
+
+# Conservative limits accepted by the most common HTTP servers and proxies
+MAX_URL_LENGTH = 2048
+MAX_FORM_KEYS = 1000
+
+
+def fits_in_url(
+    api: Api,
+    endpoint: str,
+    params: dict[str, Any],
+    max_url_length: int = MAX_URL_LENGTH,
+) -> bool:
+    """Check if the parameters of a request fit in the URL of a GET request.
+
+    Args:
+        api: The object that will make the request.
+        endpoint: The endpoint the request will be made to.
+        params: The parameters of the request, lists are sent as
+            repeated parameters.
+        max_url_length: The maximum length of the URL of a GET request.
+
+    Returns:
+        If the URL of the request, including the authentication
+            parameters, is not longer than the limit.
+    """
+
+    return len(api.generate_url(endpoint, params)) <= max_url_length
+
+
+def pack_params(
+    api: Api,
+    endpoint: str,
+    repeated_params: list[tuple[str, str]],
+    fixed_params: dict[str, Any] | None = None,
+    max_url_length: int = MAX_URL_LENGTH,
+    max_form_keys: int = MAX_FORM_KEYS,
+    chunk_size: int | None = None,
+) -> tuple[RequestMethod, list[dict[str, Any]]]:
+    """Split a list of repeated parameters in the fewest requests
+    the URL and form limits of the servers allow.
+
+    If the object is configured to use GET and all the parameters fit in
+    a single URL they are sent in one GET request, else they are split in
+    POST requests, as forms can hold many more parameters than an URL.
+
+    Args:
+        api: The object that will make the requests.
+        endpoint: The endpoint the requests will be made to.
+        repeated_params: The name and value of every repeated parameter,
+            in the order they should be sent.
+        fixed_params: Parameters that should be sent in every request.
+        max_url_length: The maximum length of the URL of a GET request.
+        max_form_keys: The maximum number of parameters of a POST request.
+        chunk_size: If given, the maximum number of repeated parameters
+            to send in each request.
+
+    Returns:
+        The verb to be used and the parameters of each request.
+    """
+
+    fixed_params = fixed_params or {}
+
+    if not repeated_params:
+        return api.request_method, []
+
+    # Leave room for the authentication parameters and the fixed ones
+    base_keys = len(api._generate_params(fixed_params))
+    max_chunk_size = max(max_form_keys - base_keys, 1)
+
+    if chunk_size is not None:
+        max_chunk_size = min(chunk_size, max_chunk_size)
+
+    batches = [
+        _group(repeated_params[start : start + max_chunk_size], fixed_params)
+        for start in range(0, len(repeated_params), max_chunk_size)
+    ]
+
+    if api.request_method == RequestMethod.GET:
+        # Without a fixed size sending everything in one URL is better
+        # than splitting it in multiple forms
+        if chunk_size is None:
+            single = _group(repeated_params, fixed_params)
+
+            if fits_in_url(api, endpoint, single, max_url_length):
+                return RequestMethod.GET, [single]
+
+        elif all(
+            fits_in_url(api, endpoint, batch, max_url_length) for batch in batches
+        ):
+            return RequestMethod.GET, batches
+
+    return RequestMethod.POST, batches
+
+
+def _group(
+    repeated_params: list[tuple[str, str]], fixed_params: dict[str, Any]
+) -> dict[str, Any]:
+    """Group repeated parameters by their name.
+
+    Args:
+        repeated_params: The name and value of every repeated parameter.
+        fixed_params: Other parameters to add to the result.
+
+    Returns:
+        The parameters with a list of values for each repeated one.
+    """
+
+    params: dict[str, Any] = dict(fixed_params)
+
+    for name, value in repeated_params:
+        params.setdefault(name, []).append(value)
+
+    return params
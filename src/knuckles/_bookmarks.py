@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from ._api import Api
+from ._api import Api, RequestMethod
+from ._batching import MAX_URL_LENGTH, fits_in_url
 from .models._bookmark import Bookmark
 from .models._play_queue import PlayQueue
 
@@ -122,24 +123,34 @@ class Bookmarks:
         song_ids: list[str],
         current_song_id: str | None = None,
         position: int | None = None,
+        max_url_length: int = MAX_URL_LENGTH,
     ) -> PlayQueue:
         """Saves a new play queue for the authenticated user.
 
+        As the queue is replaced with every request it cannot be split,
+        so if the songs do not fit in a GET request it is sent with POST.
+
         Args:
             song_ids: A list with all the songs to add to the queue.
             current_song_id: The ID of the current playing song.
             position: A position in milliseconds of where the current song
                 playback it at.
+            max_url_length: The maximum length of the URL of a GET request.
 
         Returns:
             An object that contains all the info of the new
                 saved play queue.
         """
 
-        self.api.json_request(
-            "savePlayQueue",
-            {"id": song_ids, "current": current_song_id, "position": position},
-        )
+        params = {"id": song_ids, "current": current_song_id, "position": position}
+
+        request_method = self.api.request_method
+        if request_method == RequestMethod.GET and not fits_in_url(
+            self.api, "savePlayQueue", params, max_url_length
+        ):
+            request_method = RequestMethod.POST
+
+        self.api.json_request("savePlayQueue", params, request_method)
 
         # Fake the song structure given by in the API.
         songs = []
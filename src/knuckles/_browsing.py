@@ -1,6 +1,9 @@
-from typing import TYPE_CHECKING
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import TYPE_CHECKING, Callable, Iterator
 
 from ._api import Api
+from ._concurrency import ContextThreadPoolExecutor
+from ._identity_map import full_fetch
 from .models._album import Album, AlbumInfo
 from .models._artist import Artist, ArtistInfo
 from .models._artist_index import ArtistIndex
@@ -74,6 +77,71 @@ class Browsing:
 
         return MusicDirectory(subsonic=self.subsonic, **response)
 
+    def walk_music_folder(
+        self,
+        music_folder_id: str,
+        max_depth: int | None = None,
+        prune: Callable[[Song], bool] | None = None,
+        max_workers: int = 8,
+    ) -> Iterator[tuple[MusicDirectory, list[Song], list[Song]]]:
+        """Walk the tree of directories of a music folder in the same way as
+        `os.walk`, fetching many directories at the same time.
+
+        The directories are yielded as soon as they are fetched, so the
+        order between siblings is not guaranteed. As in `os.walk` the
+        subdirectories can be removed from the yielded list to not
+        walk them.
+
+        Args:
+            music_folder_id: The ID of the music folder to walk.
+            max_depth: If given, the maximum depth of the directories to
+                walk, the top level ones having a depth of 0.
+            prune: Function called with every subdirectory found that
+                returns if it should not be walked.
+            max_workers: The maximum number of directories fetched at the
+                same time.
+
+        Returns:
+            An iterator over a tuple for every directory with the
+                directory itself, its subdirectories and its songs.
+        """
+
+        index = self.get_artists_indexed(music_folder_id, 0).index or {}
+        top_ids = [artist.id for artists in index.values() for artist in artists]
+
+        executor = ContextThreadPoolExecutor(max_workers)
+        in_flight: dict[Future[MusicDirectory], int] = {}
+
+        def submit(directory_id: str, depth: int) -> None:
+            future = executor.submit(self.get_music_directory, directory_id)
+            in_flight[future] = depth
+
+        try:
+            for directory_id in top_ids:
+                submit(directory_id, 0)
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    depth = in_flight.pop(future)
+                    directory = future.result()
+
+                    entries = directory.songs or []
+                    subdirectories = [entry for entry in entries if entry.is_dir]
+                    songs = [entry for entry in entries if not entry.is_dir]
+
+                    yield directory, subdirectories, songs
+
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+
+                    for subdirectory in subdirectories:
+                        if prune is None or not prune(subdirectory):
+                            submit(subdirectory.id, depth + 1)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
     def get_genres(self) -> list[Genre]:
         """Get all the available genres in the server.
 
@@ -141,7 +209,8 @@ class Browsing:
 
         response = self.api.json_request("getArtist", {"id": artist_id})["artist"]
 
-        return Artist(self.subsonic, **response)
+        with full_fetch(Artist, artist_id):
+            return Artist(self.subsonic, **response)
 
     def get_artists_indexed(
         self, music_folder_id: str, modified_since: int
@@ -178,7 +247,8 @@ class Browsing:
 
         response = self.api.json_request("getAlbum", {"id": album_id})["album"]
 
-        return Album(self.subsonic, **response)
+        with full_fetch(Album, album_id):
+            return Album(self.subsonic, **response)
 
     def get_album_info_non_id3(self, album_id: str) -> AlbumInfo:
         """Get all the extra info about an album. Not organized according
@@ -224,7 +294,8 @@ class Browsing:
 
         response = self.api.json_request("getSong", {"id": song_id})["song"]
 
-        return Song(self.subsonic, **response)
+        with full_fetch(Song, song_id):
+            return Song(self.subsonic, **response)
 
     def get_videos(self) -> list[Video]:
         """Get all the registered videos in the server.
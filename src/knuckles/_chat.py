@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from ._api import Api
@@ -31,16 +32,23 @@ class Chat:
 
         return self.subsonic
 
-    def get_chat_messages(self) -> list[ChatMessage]:
+    def get_chat_messages(self, since: datetime | None = None) -> list[ChatMessage]:
         """Get all send chat messages.
 
+        Args:
+            since: If given, only the messages sent after this
+                timestamp are returned.
+
         Returns:
             A list with all the messages info.
         """
 
-        response: list[dict[str, Any]] = self.api.json_request("getChatMessages")[
-            "chatMessages"
-        ]["chatMessage"]
+        response: list[dict[str, Any]] = self.api.json_request(
+            "getChatMessages",
+            # Multiply by 1000 because the API uses
+            # milliseconds instead of seconds for UNIX time
+            {"since": round(since.timestamp() * 1000)} if since is not None else {},
+        )["chatMessages"].get("chatMessage", [])
 
         messages = [ChatMessage(self.subsonic, **message) for message in response]
 
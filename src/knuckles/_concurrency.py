@@ -0,0 +1,156 @@
+import contextvars
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+First = TypeVar("First")
+Second = TypeVar("Second")
+Generated = TypeVar("Generated", covariant=True)
+Result = TypeVar("Result")
+
+# The client of the current worker process of a process pool
+_worker_subsonic: "Subsonic | None" = None
+
+
+class Generable(Protocol[Generated]):
+    """Any model that can be refreshed from the API."""
+
+    def generate(self) -> Generated: ...
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """Pool of threads that runs every call with a copy of the context of
+    the thread that has submitted it, so the profiler assigns the time of
+    the workers to the helper method that is using the pool.
+    """
+
+    def submit(
+        self, fn: Callable[..., Result], /, *args: Any, **kwargs: Any
+    ) -> Future[Result]:
+        context = contextvars.copy_context()
+
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+def run_in_parallel(
+    first: Callable[[], First], second: Callable[[], Second]
+) -> tuple[First, Second]:
+    """Make two independent calls at the same time, the first one in the
+    current thread and the second one in a new one.
+
+    Args:
+        first: The first call to make.
+        second: The second call to make.
+
+    Returns:
+        The values returned by both calls.
+    """
+
+    with ContextThreadPoolExecutor(1) as executor:
+        second_result = executor.submit(second)
+
+        return first(), second_result.result()
+
+
+def generate_many(
+    models: Iterable[Generable[Generated]], max_workers: int = 8
+) -> list[Generated]:
+    """Refresh many models from the API at the same time, they can be
+    of different types.
+
+    Args:
+        models: The models to refresh.
+        max_workers: The maximum number of models refreshed at the
+            same time.
+
+    Returns:
+        The refreshed models, in the same order as the given ones.
+    """
+
+    with ContextThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(lambda model: model.generate(), models))
+
+
+def _init_worker(subsonic: "Subsonic", warm_up: bool) -> None:
+    """Store the client of a new worker process of a process pool.
+
+    Args:
+        subsonic: The client unpickled in the worker.
+        warm_up: If a first request should be made, so the modules
+            needed to make requests are imported before the first task.
+    """
+
+    global _worker_subsonic
+
+    _worker_subsonic = subsonic
+
+    if warm_up:
+        subsonic.system.ping()
+
+
+def _call_in_worker(
+    function: Callable[["Subsonic", str], Result], model_id: str
+) -> Result:
+    """Call a function with the client of the current worker process.
+
+    Args:
+        function: The function to call.
+        model_id: The ID to call it with.
+
+    Returns:
+        The value returned by the function.
+    """
+
+    if _worker_subsonic is None:
+        raise RuntimeError("The process pool has not been initialized")
+
+    return function(_worker_subsonic, model_id)
+
+
+def process_map(
+    subsonic: "Subsonic",
+    function: Callable[["Subsonic", str], Result],
+    ids: Iterable[str],
+    max_workers: int | None = None,
+    chunksize: int = 1,
+    warm_up: bool = True,
+    mp_context: BaseContext | None = None,
+) -> list[Result]:
+    """Call a function for many IDs in a pool of processes, useful for
+    work that needs more CPU than a single process can give.
+
+    Every worker process gets its own copy of the client when it starts
+    and reuses it for all its calls. Only the configuration of the client
+    is sent to the workers.
+
+    Args:
+        subsonic: The client to copy to the workers.
+        function: The function to call with the client of the worker and
+            every ID, it must be defined at the top level of a module so
+            it can be pickled.
+        ids: The IDs to call the function with.
+        max_workers: The maximum number of worker processes, the number
+            of CPUs by default.
+        chunksize: The number of IDs sent to a worker at once, bigger
+            values are faster for many short calls.
+        warm_up: If every worker should make a first request to the server
+            before any call.
+        mp_context: The multiprocessing context used to start the workers.
+
+    Returns:
+        The values returned by every call, in the same order as the IDs.
+    """
+
+    with ProcessPoolExecutor(
+        max_workers,
+        mp_context,
+        initializer=_init_worker,
+        initargs=(subsonic, warm_up),
+    ) as executor:
+        return list(
+            executor.map(_call_in_worker, repeat(function), ids, chunksize=chunksize)
+        )
@@ -0,0 +1,347 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterator, Literal
+
+from ._concurrency import ContextThreadPoolExecutor
+from .models._album import Album
+from .models._artist import Artist
+from .models._song import Song
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+# The kind of the nodes of the graph of the library
+Kind = Literal["artist", "album"]
+
+
+class LibraryCrawler:
+    """Object that walks the artists, albums and songs of the library
+    breadth first, fetching many of them at the same time.
+
+    The progress can be saved to a checkpoint file, so a crawl that has
+    been interrupted resumes where it stopped instead of starting again.
+    The checkpoint only holds the pending nodes, the yielded and completed
+    ones are appended to a log next to it with the `.log` suffix.
+
+    Attributes:
+        max_workers: The maximum number of requests made at the same time.
+        checkpoint: The file where the progress is saved, if any.
+        checkpoint_interval: The number of fetched artists and albums
+            between two saves of the progress.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        max_workers: int = 8,
+        checkpoint: Path | None = None,
+        checkpoint_interval: int = 50,
+    ) -> None:
+        """Create a new crawler.
+
+        Args:
+            subsonic: The object used to fetch the library.
+            max_workers: The maximum number of requests to make at the
+                same time.
+            checkpoint: The file where the progress should be saved, the
+                crawl is resumed from it if it exists.
+            checkpoint_interval: The number of fetched artists and albums
+                between two saves of the progress.
+        """
+
+        self.subsonic = subsonic
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+
+    def crawl(
+        self,
+        artist_ids: list[str] | None = None,
+        music_folder_id: str | None = None,
+        genre: str | None = None,
+    ) -> Iterator[Artist | Album | Song]:
+        """Walk the library from a root, yielding every artist, album and
+        song with all its info as soon as it is fetched.
+
+        The whole library is walked by default. Every artist and album is
+        only fetched once, and every song only yielded once.
+
+        Args:
+            artist_ids: If given, the IDs of the artists to start from.
+            music_folder_id: If given, the ID of the music folder whose
+                artists should be walked.
+            genre: If given, the name of the genre whose albums should
+                be walked, without their artists.
+
+        Returns:
+            An iterator over the fetched models, the artists and albums
+                with their albums and songs.
+        """
+
+        root = {
+            "artist_ids": artist_ids,
+            "music_folder_id": music_folder_id,
+            "genre": genre,
+        }
+
+        frontier: deque[tuple[Kind, str]] = deque()
+
+        # Nodes are identified by their kind too, as artists and albums
+        # may share IDs in some servers
+        seen: set[str] = set()
+        yielded: set[str] = set()
+        yielded_songs: set[str] = set()
+
+        state = self._load_checkpoint(root)
+        if state is not None:
+            frontier.extend((kind, id_) for kind, id_ in state["pending"])
+
+            # A yielded node is only seen once it is completed, so the
+            # songs of an interrupted one are found again
+            completed = self._load_log(yielded, yielded_songs)
+            seen.update(completed)
+        else:
+            frontier.extend(self._root_nodes(artist_ids, music_folder_id, genre))
+
+        seen.update(f"{kind}:{id_}" for kind, id_ in frontier)
+        log = self._open_log(append=state is not None)
+
+        executor = ContextThreadPoolExecutor(self.max_workers)
+        in_flight: dict[Future[Artist | Album], tuple[Kind, str]] = {}
+        current: tuple[Kind, str] | None = None
+        fetched = 0
+
+        def record(entry: str, value: str) -> None:
+            if log is not None:
+                log.write(json.dumps([entry, value]) + "\n")
+
+        def save() -> None:
+            # The log is never behind the checkpoint
+            if log is not None:
+                log.flush()
+
+            pending = [*([current] if current else []), *in_flight.values()]
+            self._save_checkpoint(root, pending + list(frontier))
+
+        try:
+            while frontier or in_flight:
+                # Keep the workers busy without fetching the whole
+                # frontier at once
+                while frontier and len(in_flight) < self.max_workers * 2:
+                    kind, id_ = frontier.popleft()
+                    in_flight[executor.submit(self._fetch, kind, id_)] = (kind, id_)
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    model = future.result()
+                    current = in_flight.pop(future)
+                    fetched += 1
+
+                    # The node stays pending until all its songs are yielded
+                    node = f"{current[0]}:{model.id}"
+                    if node not in yielded:
+                        yielded.add(node)
+                        record("yielded", node)
+
+                        yield model
+
+                    if isinstance(model, Artist):
+                        for album in model.albums or []:
+                            if f"album:{album.id}" not in seen:
+                                seen.add(f"album:{album.id}")
+                                frontier.append(("album", album.id))
+
+                    else:
+                        for song in model.songs or []:
+                            if song.id not in yielded_songs:
+                                yielded_songs.add(song.id)
+                                record("song", song.id)
+
+                                yield song
+
+                    record("completed", node)
+                    current = None
+
+                    if fetched % self.checkpoint_interval == 0:
+                        save()
+        except BaseException:
+            # Including when the consumer stops iterating the crawl
+            save()
+            raise
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+            if log is not None:
+                log.close()
+
+        if self.checkpoint is not None:
+            self.checkpoint.unlink(missing_ok=True)
+            self._log_path().unlink(missing_ok=True)
+
+    def _root_nodes(
+        self,
+        artist_ids: list[str] | None,
+        music_folder_id: str | None,
+        genre: str | None,
+    ) -> list[tuple[Kind, str]]:
+        """Get the nodes the crawl starts from.
+
+        Args:
+            artist_ids: If given, the IDs of the artists to start from.
+            music_folder_id: If given, the ID of the music folder whose
+                artists should be walked.
+            genre: If given, the name of the genre whose albums should
+                be walked.
+
+        Returns:
+            The kind and ID of every node of the root.
+        """
+
+        if artist_ids is not None:
+            return [("artist", artist_id) for artist_id in dict.fromkeys(artist_ids)]
+
+        if genre is not None:
+            nodes: list[tuple[Kind, str]] = []
+            page_size = 500
+
+            while True:
+                page = self.subsonic.lists.get_album_list_by_genre(
+                    genre, page_size, len(nodes), music_folder_id
+                )
+                nodes.extend(("album", album.id) for album in page)
+
+                if len(page) < page_size:
+                    return nodes
+
+        return [
+            ("artist", artist.id)
+            for artist in self.subsonic.browsing.get_artists(music_folder_id)
+        ]
+
+    def _fetch(self, kind: Kind, id_: str) -> Artist | Album:
+        """Fetch an artist with its albums or an album with its songs.
+
+        Args:
+            kind: If the node is an artist or an album.
+            id_: The ID of the node.
+
+        Returns:
+            The fetched model.
+        """
+
+        if kind == "artist":
+            return self.subsonic.browsing.get_artist(id_)
+
+        return self.subsonic.browsing.get_album(id_)
+
+    def _load_checkpoint(self, root: dict[str, Any]) -> dict[str, Any] | None:
+        """Load the progress of a previous crawl from the same root.
+
+        Args:
+            root: The root of the current crawl.
+
+        Returns:
+            The saved progress, `None` if there is not a checkpoint of
+                a crawl from the same root.
+        """
+
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return None
+
+        state: dict[str, Any] = json.loads(self.checkpoint.read_text())
+
+        return state if state["root"] == root else None
+
+    def _save_checkpoint(
+        self, root: dict[str, Any], pending: list[tuple[Kind, str]]
+    ) -> None:
+        """Save the pending nodes of the crawl, replacing the checkpoint
+        file atomically so a crash never leaves it half written.
+
+        Args:
+            root: The root of the crawl.
+            pending: The nodes not completely processed yet, they are
+                fetched again when the crawl is resumed.
+        """
+
+        if self.checkpoint is None:
+            return
+
+        content = json.dumps({"root": root, "pending": pending})
+
+        temporary = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        temporary.write_text(content)
+        os.replace(temporary, self.checkpoint)
+
+    def _log_path(self) -> Path:
+        """Get the path of the log of yielded and completed nodes.
+
+        Returns:
+            The path next to the checkpoint file.
+        """
+
+        assert self.checkpoint is not None
+
+        return self.checkpoint.with_name(self.checkpoint.name + ".log")
+
+    def _open_log(self, append: bool) -> IO[str] | None:
+        """Open the log of yielded and completed nodes.
+
+        Args:
+            append: If the log of the resumed crawl should be kept,
+                else it is emptied.
+
+        Returns:
+            The opened log, `None` if there is no checkpoint file.
+        """
+
+        if self.checkpoint is None:
+            return None
+
+        path = self._log_path()
+        log = path.open("a" if append else "w", encoding="utf-8")
+
+        # End a line left half written, so it is not joined with the next one
+        if log.tell() > 0:
+            with path.open("rb") as file:
+                file.seek(-1, os.SEEK_END)
+
+                if file.read() != b"\n":
+                    log.write("\n")
+
+        return log
+
+    def _load_log(self, yielded: set[str], yielded_songs: set[str]) -> set[str]:
+        """Read the log of a previous crawl.
+
+        Args:
+            yielded: Where the yielded nodes are added.
+            yielded_songs: Where the IDs of the yielded songs are added.
+
+        Returns:
+            The completed nodes.
+        """
+
+        completed: set[str] = set()
+        path = self._log_path()
+
+        if not path.exists():
+            return completed
+
+        targets = {"yielded": yielded, "song": yielded_songs, "completed": completed}
+
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                # The last line may have been left half written
+                try:
+                    entry, value = json.loads(line)
+                except ValueError:
+                    continue
+
+                targets[entry].add(value)
+
+        return completed
@@ -0,0 +1,119 @@
+import threading
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from .models._model import Model
+
+M = TypeVar("M", bound="Model")
+
+# The type and ID of the model being fetched with all its info
+_full_fetch: ContextVar[tuple[type, str] | None] = ContextVar(
+    "_full_fetch", default=None
+)
+
+
+@contextmanager
+def full_fetch(model_type: type["Model"], model_id: str) -> Iterator[None]:
+    """Mark the model with the given type and ID created inside the block
+    as a complete one, so it replaces all the attributes of its known
+    instance, letting the server clear any of them.
+
+    Args:
+        model_type: The type of the fetched model, e.g. `Song`.
+        model_id: The ID of the fetched model.
+    """
+
+    token = _full_fetch.set((model_type, str(model_id)))
+
+    try:
+        yield
+    finally:
+        _full_fetch.reset(token)
+
+
+class IdentityMap:
+    """Object that keeps a single instance of every model with an ID, so
+    the same artist, album or song found in different responses is always
+    the same object and the changes made to it are visible everywhere.
+
+    The models are weakly referenced, so they are forgotten as soon as
+    they are no longer used anywhere else.
+    """
+
+    def __init__(self) -> None:
+        """Create a new empty identity map."""
+
+        self._models: weakref.WeakValueDictionary[tuple[type, str], Model] = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def canonical(self, model: M) -> M:
+        """Get the known instance of a model, merging the new data into it.
+
+        The values sent by the server replace the known ones, but the
+        missing values never erase them, so a model found in a response
+        with less info keeps all the info already known. Only a model
+        fetched with all its info, see `full_fetch`, replaces all of them.
+
+        Args:
+            model: The model just created from a response.
+
+        Returns:
+            The known instance with the same type and ID, or the given
+                model itself if there is not any.
+        """
+
+        model_id = getattr(model, "id", None)
+
+        if model_id is None:
+            return model
+
+        key = (type(model), str(model_id))
+
+        with self._lock:
+            known = self._models.get(key)
+
+            if known is None:
+                self._models[key] = model
+
+                return model
+
+            complete = _full_fetch.get() == key
+
+            for name, value in vars(model).items():
+                # The attributes never sent by the server are always kept
+                if value is not None or (
+                    complete and name not in model._local_attributes
+                ):
+                    setattr(known, name, value)
+
+        # The type of the key is the type of the model
+        return known  # type: ignore[return-value]
+
+    def get(self, model_type: type[M], model_id: str) -> M | None:
+        """Get the known instance of a model.
+
+        Args:
+            model_type: The type of the model, e.g. `Artist`.
+            model_id: The ID of the model.
+
+        Returns:
+            The known instance, `None` if it is not known.
+        """
+
+        with self._lock:
+            return self._models.get((model_type, model_id))  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """Forget all the known models."""
+
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
@@ -1,6 +1,11 @@
-from typing import TYPE_CHECKING, Any
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import date
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
 from ._api import Api
+from ._concurrency import ContextThreadPoolExecutor
 from .models._album import Album
 from .models._now_playing_entry import NowPlayingEntry
 from .models._song import Song
@@ -10,6 +15,16 @@ if TYPE_CHECKING:
     from ._subsonic import Subsonic
 
 
+class CatalogSharding(Enum):
+    """How the albums of the library are split in independent lists
+    to fetch them at the same time.
+    """
+
+    GENRE = "genre"
+    YEAR = "year"
+    GENRE_AND_YEAR = "genre_and_year"
+
+
 class Lists:
     """Class that contains all the methods needed to interact with the
     [lists endpoints](https://opensubsonic.netlify.app/categories/lists)
@@ -691,7 +706,7 @@ class Lists:
                 song that are current playing by all the users.
         """
 
-        response = self.api.json_request("getNowPlaying")["nowPlaying"]["entry"]
+        response = self.api.json_request("getNowPlaying")["nowPlaying"].get("entry", [])
 
         return [NowPlayingEntry(subsonic=self.subsonic, **entry) for entry in response]
 
@@ -732,3 +747,169 @@ class Lists:
         )["starred2"]
 
         return StarredContent(subsonic=self.subsonic, **response)
+
+    def get_all_albums(
+        self,
+        sharding: CatalogSharding = CatalogSharding.GENRE,
+        max_workers: int = 8,
+        page_size: int = 500,
+        from_year: int = 1900,
+        to_year: int | None = None,
+        years_per_shard: int = 5,
+        music_folder_id: str | None = None,
+        without_genre: bool = True,
+    ) -> list[Album]:
+        """Get all the albums of the library, splitting them by genre or
+        by year range in lists whose pages are requested at the same time.
+
+        With the genre sharding the number of albums of every genre is
+        known beforehand, so all the pages of every genre are requested
+        at once. As the albums without a genre are not in any genre list,
+        the total number of albums is requested alongside the genres and,
+        only if some albums have not been found, all the albums are swept
+        by name with all the pages requested at once. The albums without
+        a year or outside the range are only found with the genre sharding.
+
+        Args:
+            sharding: How the albums should be split.
+            max_workers: The maximum number of pages requested at the
+                same time.
+            page_size: The number of albums requested in each page, 500 is
+                the maximum allowed by most servers.
+            from_year: The first year of the year sharding.
+            to_year: The last year of the year sharding, the current
+                year by default.
+            years_per_shard: The number of years of every range of the
+                year sharding.
+            music_folder_id: An ID of a music folder where all the albums
+                should be from.
+            without_genre: If the albums without a genre should be found
+                with the genre sharding. It costs a request of all the
+                artists, and a second pass over the whole catalog when
+                there are albums without a genre, so it can be disabled if
+                every album of the library is known to have a genre.
+
+        Returns:
+            All the found albums without duplicates, grouped by shard.
+        """
+
+        shards: list[Callable[[int], list[Album]]] = []
+        known_sizes: list[int | None] = []
+
+        if sharding in (CatalogSharding.GENRE, CatalogSharding.GENRE_AND_YEAR):
+            for genre in self.subsonic.browsing.get_genres():
+                if not genre.album_count:
+                    continue
+
+                shards.append(
+                    partial(
+                        self.get_album_list_by_genre,
+                        genre.value,
+                        page_size,
+                        music_folder_id=music_folder_id,
+                    )
+                )
+                known_sizes.append(genre.album_count)
+
+        if sharding in (CatalogSharding.YEAR, CatalogSharding.GENRE_AND_YEAR):
+            last_year = to_year if to_year is not None else date.today().year
+
+            for start in range(from_year, last_year + 1, years_per_shard):
+                end = min(start + years_per_shard - 1, last_year)
+
+                shards.append(
+                    partial(
+                        self.get_album_list_by_year,
+                        start,
+                        end,
+                        page_size,
+                        music_folder_id=music_folder_id,
+                    )
+                )
+                known_sizes.append(None)
+
+        albums: dict[str, Album] = {}
+
+        with ContextThreadPoolExecutor(max_workers) as executor:
+            # The total is only known from the album count of every artist
+            total: Future[int] | None = None
+            if without_genre and sharding != CatalogSharding.YEAR:
+                total = executor.submit(
+                    lambda: sum(
+                        artist.album_count or 0
+                        for artist in self.subsonic.browsing.get_artists(
+                            music_folder_id
+                        )
+                    )
+                )
+
+            for album in _fetch_pages(executor, shards, known_sizes, page_size):
+                albums.setdefault(album.id, album)
+
+            # Sweep the whole catalog only if some albums are missing,
+            # with all its pages requested at once as its size is known
+            if total is not None and len(albums) < total.result():
+                sweep = partial(
+                    self.get_album_list_alphabetical_by_name,
+                    page_size,
+                    music_folder_id=music_folder_id,
+                )
+
+                for album in _fetch_pages(
+                    executor, [sweep], [total.result()], page_size
+                ):
+                    albums.setdefault(album.id, album)
+
+        return list(albums.values())
+
+
+def _fetch_pages(
+    executor: ContextThreadPoolExecutor,
+    shards: list[Callable[[int], list[Album]]],
+    known_sizes: list[int | None],
+    page_size: int,
+) -> list[Album]:
+    """Request all the pages of many album lists at the same time.
+
+    Args:
+        executor: The executor where the pages are requested.
+        shards: The functions that request a page of every list given
+            its offset.
+        known_sizes: The expected number of albums of every list, `None`
+            if it is unknown.
+        page_size: The number of albums requested in each page.
+
+    Returns:
+        The albums of all the pages, grouped by list and sorted by offset.
+    """
+
+    pages: dict[tuple[int, int], list[Album]] = {}
+    in_flight: dict[Future[list[Album]], tuple[int, int]] = {}
+
+    def request(shard: int, offset: int) -> None:
+        future = executor.submit(shards[shard], offset)
+        in_flight[future] = (shard, offset)
+
+    for shard, size in enumerate(known_sizes):
+        # Without a known size the pages of the shard can only be
+        # requested one after the other
+        for offset in range(0, size or 1, page_size):
+            request(shard, offset)
+
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            shard, offset = in_flight.pop(future)
+            pages[(shard, offset)] = future.result()
+
+            next_offset = offset + page_size
+            size = known_sizes[shard]
+
+            # Keep paging if the shard is larger than expected
+            if len(pages[(shard, offset)]) == page_size and (
+                size is None or next_offset >= size
+            ):
+                request(shard, next_offset)
+
+    return [album for key in sorted(pages) for album in pages[key]]
@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from ._api import Api
+from ._batching import MAX_FORM_KEYS, MAX_URL_LENGTH, pack_params
+from ._concurrency import ContextThreadPoolExecutor
 from .exceptions import InvalidRatingNumber
 
 if TYPE_CHECKING:
@@ -108,6 +110,101 @@ class MediaAnnotation:
 
         return self.subsonic
 
+    def _bulk_annotate(
+        self,
+        endpoint: str,
+        song_ids: Iterable[str],
+        album_ids: Iterable[str],
+        artist_ids: Iterable[str],
+        max_url_length: int,
+        max_form_keys: int,
+    ) -> None:
+        """Send all the given IDs to the `star` or `unstar` endpoint in
+        the fewest requests possible.
+
+        Args:
+            endpoint: The endpoint to send the IDs to.
+            song_ids: The IDs of the songs.
+            album_ids: The IDs of the albums.
+            artist_ids: The IDs of the artists.
+            max_url_length: The maximum length of the URL of a GET request.
+            max_form_keys: The maximum number of parameters of a
+                POST request.
+        """
+
+        ids = [("id", song_id) for song_id in song_ids]
+        ids += [("albumId", album_id) for album_id in album_ids]
+        ids += [("artistId", artist_id) for artist_id in artist_ids]
+
+        request_method, batches = pack_params(
+            self.api, endpoint, ids, None, max_url_length, max_form_keys
+        )
+
+        for params in batches:
+            self.api.json_request(endpoint, params, request_method)
+
+    def star(
+        self,
+        song_ids: Iterable[str] = (),
+        album_ids: Iterable[str] = (),
+        artist_ids: Iterable[str] = (),
+        max_url_length: int = MAX_URL_LENGTH,
+        max_form_keys: int = MAX_FORM_KEYS,
+    ) -> "Subsonic":
+        """Star many songs, albums and artists at once, packing them in
+        the fewest requests possible. If they do not fit in a single GET
+        request they are sent with POST requests.
+
+        Args:
+            song_ids: The IDs of the songs to star.
+            album_ids: The IDs of the albums to star.
+            artist_ids: The IDs of the artists to star.
+            max_url_length: The maximum length of the URL of a GET request.
+            max_form_keys: The maximum number of parameters of a
+                POST request.
+
+        Returns:
+            The Subsonic object where this method was called to allow
+                method chaining.
+        """
+
+        self._bulk_annotate(
+            "star", song_ids, album_ids, artist_ids, max_url_length, max_form_keys
+        )
+
+        return self.subsonic
+
+    def unstar(
+        self,
+        song_ids: Iterable[str] = (),
+        album_ids: Iterable[str] = (),
+        artist_ids: Iterable[str] = (),
+        max_url_length: int = MAX_URL_LENGTH,
+        max_form_keys: int = MAX_FORM_KEYS,
+    ) -> "Subsonic":
+        """Unstar many songs, albums and artists at once, packing them in
+        the fewest requests possible. If they do not fit in a single GET
+        request they are sent with POST requests.
+
+        Args:
+            song_ids: The IDs of the songs to unstar.
+            album_ids: The IDs of the albums to unstar.
+            artist_ids: The IDs of the artists to unstar.
+            max_url_length: The maximum length of the URL of a GET request.
+            max_form_keys: The maximum number of parameters of a
+                POST request.
+
+        Returns:
+            The Subsonic object where this method was called to allow
+                method chaining.
+        """
+
+        self._bulk_annotate(
+            "unstar", song_ids, album_ids, artist_ids, max_url_length, max_form_keys
+        )
+
+        return self.subsonic
+
     def set_rating(self, song_id: str, rating: int) -> "Subsonic":
         """The the rating of a song.
 
@@ -138,6 +235,39 @@ class MediaAnnotation:
 
         return self.subsonic
 
+    def set_ratings(self, ratings: dict[str, int], max_workers: int = 8) -> "Subsonic":
+        """Set the rating of many songs concurrently, as the server only
+        accepts one rating for each request.
+
+        Args:
+            ratings: The rating between 1 and 5 (inclusive) to set to each
+                song, indexed by the ID of the song.
+            max_workers: The maximum number of requests made at
+                the same time.
+
+        Raises:
+            InvalidRatingNumber: Raised when any of the ratings is not
+                between 1 and 5 (inclusive), before making any request.
+
+        Returns:
+            The Subsonic object where this method was called to allow
+                method chaining.
+        """
+
+        if any(rating not in range(1, 6) for rating in ratings.values()):
+            raise InvalidRatingNumber(
+                (
+                    "Invalid rating number, "
+                    + "only numbers between 1 and 5 (inclusive) are allowed"
+                )
+            )
+
+        with ContextThreadPoolExecutor(max_workers) as executor:
+            # Consume the results to raise any error of the requests
+            list(executor.map(self.set_rating, ratings.keys(), ratings.values()))
+
+        return self.subsonic
+
     def remove_rating(self, song_id: str) -> "Subsonic":
         """Remove the rating entry of a song.
 
@@ -1,10 +1,30 @@
-from typing import TYPE_CHECKING
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, NamedTuple
 
 from ._api import Api
 from .models._scan_status import ScanStatus
 
 if TYPE_CHECKING:
     from ._subsonic import Subsonic
+    from .models._album import Album
+
+
+class ScanProgress(NamedTuple):
+    """The progress of a scan of the library while it is being waited for.
+
+    Attributes:
+        status: The last status returned by the server.
+        elapsed: The seconds since the wait started.
+        rate: The media scanned per second, `None` if it is still unknown.
+        eta: The estimated seconds until the scan is completed, `None` if
+            it is unknown as the total number of media is not known yet.
+    """
+
+    status: ScanStatus
+    elapsed: float
+    rate: float | None
+    eta: float | None
 
 
 class MediaLibraryScanning:
@@ -20,6 +40,13 @@ class MediaLibraryScanning:
         # Only to pass it to the models
         self.subsonic = subsonic
 
+        # The count of the last completed scan, used to estimate
+        # how long the next one will take
+        self._last_count: int | None = None
+
+        # When the scan being waited for was started with this object
+        self._scan_started: datetime | None = None
+
     def get_scan_status(self) -> ScanStatus:
         """Get the status of the scanning of the library.
 
@@ -40,6 +67,145 @@ class MediaLibraryScanning:
                 current state of the scanning of the library.
         """
 
+        # Taken before the request, as the scan may add albums right away
+        self._scan_started = datetime.now(timezone.utc)
+
         response = self.api.json_request("startScan")["scanStatus"]
 
         return ScanStatus(self.subsonic, **response)
+
+    def wait_for_scan(
+        self,
+        timeout: float | None = None,
+        on_progress: Callable[[ScanProgress], None] | None = None,
+        expected_count: int | None = None,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        on_complete: Callable[[list["Album"]], None] | None = None,
+        since: datetime | None = None,
+    ) -> ScanStatus:
+        """Wait until the scanning of the library is completed, polling its
+        status less often while it does not make progress.
+
+        After every poll with progress the next one is scheduled in a
+        fraction of the estimated time left, and without progress the
+        interval between polls is doubled, always between the given limits.
+
+        Args:
+            timeout: The maximum seconds to wait, forever if it is `None`.
+            on_progress: Function called with the progress of the scan
+                after every poll.
+            expected_count: The number of media the scan should reach when
+                completed, used to estimate the time left. By default the
+                count of the last scan waited for with this object.
+            min_interval: The minimum seconds between two polls.
+            max_interval: The maximum seconds between two polls.
+            on_complete: Function called when the scan is completed with
+                the albums added since the given time, so only they need
+                to be fetched again instead of the whole library.
+            since: The time the albums passed to `on_complete` should be
+                added after, by default the time the scan was started with
+                `start_scan`, or the time the wait started if it was not.
+
+        Raises:
+            TimeoutError: Raised if the scan is not completed in time.
+
+        Returns:
+            An object that holds all the info about the
+                final state of the scanning of the library.
+        """
+
+        if since is None:
+            since = self._scan_started or datetime.now(timezone.utc)
+
+        expected_count = expected_count or self._last_count
+        start = time.monotonic()
+        interval = min_interval
+        rate: float | None = None
+        last_count: int | None = None
+        last_poll = start
+
+        while True:
+            status = self.get_scan_status()
+            now = time.monotonic()
+
+            if last_count is not None and status.count > last_count:
+                measured = (status.count - last_count) / max(now - last_poll, 1e-9)
+
+                # Smooth the measures so a single slow poll does not
+                # ruin the estimation
+                rate = measured if rate is None else rate + 0.5 * (measured - rate)
+
+            eta: float | None = None
+            if not status.scanning:
+                eta = 0.0
+            elif rate is not None and expected_count is not None:
+                eta = max(expected_count - status.count, 0) / rate
+
+            if on_progress is not None:
+                on_progress(ScanProgress(status, now - start, rate, eta))
+
+            if not status.scanning:
+                break
+
+            if last_count is not None and status.count > last_count:
+                # Check again when a part of the remaining work should be done
+                if eta is not None:
+                    interval = eta / 4
+            else:
+                interval *= 2
+
+            interval = min(max(interval, min_interval), max_interval)
+            last_count, last_poll = status.count, now
+
+            if timeout is not None:
+                remaining = timeout - (now - start)
+
+                if remaining <= 0:
+                    raise TimeoutError("The scan has not been completed in time")
+
+                interval = min(interval, remaining)
+
+            time.sleep(interval)
+
+        self._last_count = status.count
+        self._scan_started = None
+
+        if on_complete is not None:
+            on_complete(self.get_albums_added_since(since))
+
+        return status
+
+    def get_albums_added_since(
+        self, since: datetime, page_size: int = 50
+    ) -> list["Album"]:
+        """Get the albums added to the library after a given time, only
+        requesting the pages of the newest albums that contain them.
+
+        Args:
+            since: The time the albums should be added after.
+            page_size: The number of albums requested in each page.
+
+        Returns:
+            The added albums, from the newest to the oldest.
+        """
+
+        albums: list[Album] = []
+        offset = 0
+
+        while True:
+            page = self.subsonic.lists.get_album_list_newest(page_size, offset)
+
+            for album in page:
+                # Albums without a known creation time are considered old
+                if album.created is None or (
+                    album.created.timestamp() <= since.timestamp()
+                ):
+                    return albums
+
+                albums.append(album)
+
+            if len(page) < page_size:
+                return albums
+
+            offset += page_size
@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING
 
 from ._api import Api
+from ._batching import MAX_FORM_KEYS, MAX_URL_LENGTH, pack_params
 from .models._playlist import Playlist
+from .models._song import Song
 
 if TYPE_CHECKING:
     from ._subsonic import Subsonic
@@ -61,34 +63,91 @@ class Playlists:
         comment: str | None = None,
         public: bool | None = None,
         song_ids: list[str] | None = None,
+        chunk_size: int | None = None,
+        max_url_length: int = MAX_URL_LENGTH,
+        max_form_keys: int = MAX_FORM_KEYS,
     ) -> Playlist:
         """Create a new playlist for the authenticated user.
 
+        If the songs do not fit in a single request the playlist is created
+        with the first chunk of songs and the rest are appended with
+        successive updates, switching to POST requests if they do not fit
+        in a GET request.
+
         Args:
             name: The name of the playlist to be created.
             comment: A comment to be added to the new created playlist.
             public: If the song should be public or not.
             song_ids: A list of ID of the songs that should be included
                 with the playlist.
+            chunk_size: If given, the maximum number of songs to send
+                in each request.
+            max_url_length: The maximum length of the URL of a GET request.
+            max_form_keys: The maximum number of parameters of a
+                POST request.
 
         Returns:
             An object that holds all the info about the new created playlist.
         """
 
+        song_ids = song_ids or []
+
+        request_method, batches = pack_params(
+            self.api,
+            "createPlaylist",
+            [("songId", song_id) for song_id in song_ids],
+            {"name": name},
+            max_url_length,
+            max_form_keys,
+            chunk_size,
+        )
+
         response = self.api.json_request(
-            "createPlaylist", {"name": name, "songId": song_ids}
+            "createPlaylist",
+            batches[0] if batches else {"name": name},
+            request_method,
         )["playlist"]
 
         new_playlist = Playlist(self.subsonic, **response)
 
-        # Allow to modify comment and public
-        # with a workaround using the updatePlaylist endpoint
-
+        # Allow to modify comment and public with a workaround using the
+        # updatePlaylist endpoint, sent with the last chunk of songs if any
+        extra_info = {}
         if comment or public:
-            self.update_playlist(new_playlist.id, comment=comment, public=public)
+            extra_info = {"comment": comment, "public": public}
             new_playlist.comment = comment
             new_playlist.public = public
 
+        sent = len(batches[0]["songId"]) if batches else 0
+
+        # The appends have their own parameters, so their chunks are sized
+        # again, all of them with room for the extra info
+        append_method, appends = pack_params(
+            self.api,
+            "updatePlaylist",
+            [("songIdToAdd", song_id) for song_id in song_ids[sent:]],
+            {"playlistId": new_playlist.id, **extra_info},
+            max_url_length,
+            max_form_keys,
+            chunk_size,
+        )
+
+        for params in appends[:-1]:
+            for key in extra_info:
+                del params[key]
+
+        if not appends and extra_info:
+            appends.append({"playlistId": new_playlist.id, **extra_info})
+
+        for params in appends:
+            self.api.json_request("updatePlaylist", params, append_method)
+
+        if sent < len(song_ids):
+            new_playlist.songs = (new_playlist.songs or []) + [
+                Song(self.subsonic, song_id) for song_id in song_ids[sent:]
+            ]
+            new_playlist.song_count = len(song_ids)
+
         return new_playlist
 
     def update_playlist(
@@ -132,6 +191,67 @@ class Playlists:
             self.subsonic, id=playlist_id, name=name, comment=comment, public=public
         )
 
+    def sync_playlist(
+        self,
+        playlist_id: str,
+        song_ids: list[str],
+        max_url_length: int = MAX_URL_LENGTH,
+        max_form_keys: int = MAX_FORM_KEYS,
+    ) -> Playlist:
+        """Change the songs of a playlist to the given ones, making the
+        smallest possible change.
+
+        The current and the desired songs are compared and only the songs
+        that differ are removed or appended, in a single request unless
+        the changes do not fit in it. Nothing is sent if the playlist
+        already has the desired songs.
+
+        Args:
+            playlist_id: The ID of the playlist to sync.
+            song_ids: The IDs of all the songs the playlist should have,
+                in order.
+            max_url_length: The maximum length of the URL of a GET request.
+            max_form_keys: The maximum number of parameters of a
+                POST request.
+
+        Returns:
+            An object that holds all the info about the synced playlist.
+        """
+
+        playlist = self.get_playlist(playlist_id)
+        songs = playlist.songs or []
+
+        indexes_to_remove, song_ids_to_add = _diff_songs(
+            [song.id for song in songs], song_ids
+        )
+
+        # Remove from the end first, so if the changes are split in
+        # multiple requests the indexes of the next ones are still valid
+        changes = [
+            ("songIndexToRemove", str(index)) for index in indexes_to_remove[::-1]
+        ]
+        changes += [("songIdToAdd", song_id) for song_id in song_ids_to_add]
+
+        request_method, batches = pack_params(
+            self.api,
+            "updatePlaylist",
+            changes,
+            {"playlistId": playlist_id},
+            max_url_length,
+            max_form_keys,
+        )
+
+        for params in batches:
+            self.api.json_request("updatePlaylist", params, request_method)
+
+        removed = set(indexes_to_remove)
+        playlist.songs = [
+            song for index, song in enumerate(songs) if index not in removed
+        ] + [Song(self.subsonic, song_id) for song_id in song_ids_to_add]
+        playlist.song_count = len(playlist.songs)
+
+        return playlist
+
     def delete_playlist(self, playlist_id: str) -> "Subsonic":
         """Delete a playlist.
 
@@ -146,3 +266,34 @@ class Playlists:
         self.api.json_request("deletePlaylist", {"id": playlist_id})
 
         return self.subsonic
+
+
+def _diff_songs(
+    current_song_ids: list[str], song_ids: list[str]
+) -> tuple[list[int], list[str]]:
+    """Calculate the smallest edit that turns the current songs of a playlist
+    into the desired ones.
+
+    As the server can only remove songs and append new ones at the end, the
+    best edit keeps the longest prefix of the desired songs that appears in
+    order in the current ones, which is found by matching them greedily.
+
+    Args:
+        current_song_ids: The IDs of the songs the playlist has.
+        song_ids: The IDs of the songs the playlist should have.
+
+    Returns:
+        The ascending indexes of the songs to remove and the IDs of the
+            songs to append.
+    """
+
+    kept = 0
+    indexes_to_remove = []
+
+    for index, song_id in enumerate(current_song_ids):
+        if kept < len(song_ids) and song_id == song_ids[kept]:
+            kept += 1
+        else:
+            indexes_to_remove.append(index)
+
+    return indexes_to_remove, song_ids[kept:]
@@ -0,0 +1,416 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from ._concurrency import ContextThreadPoolExecutor
+from .models._podcast import Channel, Episode
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+# Statuses of the episodes that are still changing in the server
+PENDING_STATUSES = frozenset({"new", "downloading"})
+
+# Statuses of the episodes whose download has ended in the server
+FINISHED_STATUSES = frozenset({"completed", "deleted"})
+
+
+class PodcastSyncResult(NamedTuple):
+    """What has changed in the podcasts of the server during a sync.
+
+    Attributes:
+        new_channels: The channels not known before the sync.
+        removed_channels: The IDs of the known channels that no longer
+            exist in the server.
+        new_episodes: The episodes not known before the sync.
+        downloads: The IDs of the episodes whose download has been
+            requested to the server.
+        failed_downloads: The error raised by every download request
+            that has failed, by episode ID.
+        fetched_channels: The number of channels whose episodes have
+            been requested.
+        abandoned_downloads: The IDs of the accepted episodes that are
+            no longer requested as all their download attempts have
+            failed.
+    """
+
+    new_channels: list[Channel]
+    removed_channels: list[str]
+    new_episodes: list[Episode]
+    downloads: list[str]
+    failed_downloads: dict[str, Exception]
+    fetched_channels: int
+    abandoned_downloads: list[str]
+
+
+class PodcastSync:
+    """Object that keeps a local copy of the episodes of every podcast
+    channel, only requesting the episodes of the channels that
+    have changed, and downloads the new episodes to the server.
+
+    The channels are listed without their episodes and the newest
+    episodes of the server are used to find the channels that have
+    new episodes, so a sync of many channels only needs a few requests.
+    The episodes refused by `should_download` are remembered, so their
+    channels are not fetched again while they stay as new, and the
+    accepted episodes whose download has failed are requested again in
+    the next syncs, until they have been requested `max_download_attempts`
+    times.
+
+    Attributes:
+        state_file: The file where the known episodes are saved between
+            runs, if any.
+        max_workers: The maximum number of requests made at the same time.
+        newest_episodes: The number of newest episodes requested to find
+            the channels that have changed.
+        max_download_attempts: The number of times the download of an
+            episode is requested before giving up, `None` to never give up.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        state_file: Path | None = None,
+        max_workers: int = 8,
+        newest_episodes: int = 50,
+        should_download: Callable[[Episode], bool] | None = None,
+        max_download_attempts: int | None = 3,
+    ) -> None:
+        """Create a new sync, loading the known episodes from the state
+        file if it exists.
+
+        Args:
+            subsonic: The object used to make the requests.
+            state_file: The file where the known episodes should be saved
+                between runs, they are only kept in memory if it is `None`.
+            max_workers: The maximum number of requests to make at the
+                same time.
+            newest_episodes: The number of newest episodes to request to
+                find the channels that have changed.
+            should_download: Function that decides if a new episode
+                should be downloaded to the server, by default all the
+                ones not downloaded yet are.
+            max_download_attempts: The number of times the download of an
+                episode should be requested before giving up, `None` to
+                keep requesting it while it is not downloaded.
+        """
+
+        self.subsonic = subsonic
+        self.state_file = state_file
+        self.max_workers = max_workers
+        self.newest_episodes = newest_episodes
+        self.should_download = should_download or _not_downloaded
+        self.max_download_attempts = max_download_attempts
+
+        # The status of every known episode by channel ID and episode ID
+        self._channels: dict[str, dict[str, str | None]] = {}
+
+        # The IDs of the episodes refused by should_download or given up,
+        # and of the accepted ones not downloaded yet
+        self._declined: set[str] = set()
+        self._accepted: set[str] = set()
+
+        # The number of download requests of every accepted episode
+        self._attempts: dict[str, int] = {}
+
+        self._lock = threading.Lock()
+
+        if self.state_file is not None and self.state_file.exists():
+            state = json.loads(self.state_file.read_text())
+
+            self._channels = state["channels"]
+            self._declined = set(state.get("declined", []))
+            self._accepted = set(state.get("accepted", []))
+            self._attempts = state.get("attempts", {})
+
+    def status(self, episode_id: str) -> str | None:
+        """Get the last known status of an episode.
+
+        Args:
+            episode_id: The ID of the episode.
+
+        Returns:
+            The status of the episode, `None` if it is not known.
+        """
+
+        with self._lock:
+            for episodes in self._channels.values():
+                if episode_id in episodes:
+                    return episodes[episode_id]
+
+        return None
+
+    def pending(self) -> list[str]:
+        """Get the episodes that are still being downloaded by the server.
+
+        Returns:
+            The IDs of the episodes with a pending status, except the ones
+                refused by `should_download`.
+        """
+
+        with self._lock:
+            return [
+                episode_id
+                for episodes in self._channels.values()
+                for episode_id, status in episodes.items()
+                if status in PENDING_STATUSES and episode_id not in self._declined
+            ]
+
+    def sync(self, refresh: bool = False) -> PodcastSyncResult:
+        """Update the known episodes with the ones in the server and
+        request the download of the new ones.
+
+        Args:
+            refresh: If the server should search for new episodes
+                before the sync.
+
+        Returns:
+            What has changed since the last sync.
+        """
+
+        if refresh:
+            self.subsonic.podcast.refresh_podcasts()
+
+        channels = self.subsonic.podcast.get_podcast_channels(with_episodes=False)
+        current_ids = {channel.id for channel in channels}
+
+        with self._lock:
+            known = {
+                channel_id: dict(episodes)
+                for channel_id, episodes in self._channels.items()
+            }
+            declined = set(self._declined)
+            accepted = set(self._accepted)
+            attempts = dict(self._attempts)
+
+        new_channels = [channel for channel in channels if channel.id not in known]
+        removed_channels = [
+            channel_id for channel_id in known if channel_id not in current_ids
+        ]
+
+        to_fetch = self._changed_channels(known, current_ids, declined, accepted)
+        to_fetch.update(channel.id for channel in new_channels)
+
+        with ContextThreadPoolExecutor(self.max_workers) as executor:
+            fetched = list(
+                executor.map(
+                    lambda channel_id: self.subsonic.podcast.get_podcast_channel(
+                        channel_id, with_episodes=True
+                    ),
+                    sorted(to_fetch),
+                )
+            )
+
+        new_episodes: list[Episode] = []
+        retries: list[Episode] = []
+        updated: dict[str, dict[str, str | None]] = {}
+
+        for channel in fetched:
+            episodes = channel.episodes or []
+            known_episodes = known.get(channel.id, {})
+
+            new_episodes.extend(
+                episode for episode in episodes if episode.id not in known_episodes
+            )
+            retries.extend(
+                episode
+                for episode in episodes
+                if episode.id in accepted
+                and episode.status not in FINISHED_STATUSES | {"downloading"}
+            )
+            updated[channel.id] = {episode.id: episode.status for episode in episodes}
+
+        abandoned_downloads = [
+            episode.id
+            for episode in retries
+            if self.max_download_attempts is not None
+            and attempts.get(episode.id, 0) >= self.max_download_attempts
+        ]
+        retries = [
+            episode for episode in retries if episode.id not in abandoned_downloads
+        ]
+
+        accepted.difference_update(abandoned_downloads)
+        declined.update(abandoned_downloads)
+
+        to_download = []
+        for episode in new_episodes:
+            if self.should_download(episode):
+                to_download.append(episode)
+                accepted.add(episode.id)
+            else:
+                declined.add(episode.id)
+
+        downloads, failed_downloads = self._download(to_download + retries)
+
+        for episode in to_download + retries:
+            attempts[episode.id] = attempts.get(episode.id, 0) + 1
+
+        for channel_episodes in updated.values():
+            for episode_id in downloads:
+                if episode_id in channel_episodes:
+                    channel_episodes[episode_id] = "downloading"
+
+        with self._lock:
+            for channel_id in removed_channels:
+                self._channels.pop(channel_id, None)
+
+            self._channels.update(updated)
+
+            statuses = {
+                episode_id: status
+                for episodes in self._channels.values()
+                for episode_id, status in episodes.items()
+            }
+
+            # Forget the episodes that no longer exist or are downloaded
+            self._declined = declined & statuses.keys()
+            self._accepted = {
+                episode_id
+                for episode_id in accepted
+                if episode_id in statuses
+                and statuses[episode_id] not in FINISHED_STATUSES
+            }
+            self._attempts = {
+                episode_id: count
+                for episode_id, count in attempts.items()
+                if episode_id in self._accepted
+            }
+
+        self._save()
+
+        return PodcastSyncResult(
+            new_channels,
+            removed_channels,
+            new_episodes,
+            downloads,
+            failed_downloads,
+            len(fetched),
+            abandoned_downloads,
+        )
+
+    def _changed_channels(
+        self,
+        known: dict[str, dict[str, str | None]],
+        current_ids: set[str],
+        declined: set[str],
+        accepted: set[str],
+    ) -> set[str]:
+        """Find the known channels whose episodes may have changed.
+
+        Args:
+            known: The known episodes of every channel.
+            current_ids: The IDs of the channels in the server.
+            declined: The IDs of the episodes refused by `should_download`.
+            accepted: The IDs of the accepted episodes not downloaded yet.
+
+        Returns:
+            The IDs of the channels with unknown episodes between the
+                newest ones of the server, with episodes whose status has
+                changed or is still pending, or with accepted episodes
+                whose download should be requested again.
+        """
+
+        statuses = {
+            episode_id: status
+            for episodes in known.values()
+            for episode_id, status in episodes.items()
+        }
+
+        changed = {
+            channel_id
+            for channel_id, episodes in known.items()
+            if any(
+                (status in PENDING_STATUSES and episode_id not in declined)
+                or (status not in FINISHED_STATUSES and episode_id in accepted)
+                for episode_id, status in episodes.items()
+            )
+        }
+
+        newest = self.subsonic.podcast.get_newest_podcast_episodes(self.newest_episodes)
+        unknown = [episode for episode in newest if episode.id not in statuses]
+
+        # If every newest episode is unknown there may be more of them
+        # beyond the requested ones, so every channel is checked
+        if newest and len(unknown) == len(newest) == self.newest_episodes:
+            return set(known) & current_ids
+
+        for episode in newest:
+            if episode.channel is not None and (
+                episode.id not in statuses or statuses[episode.id] != episode.status
+            ):
+                changed.add(episode.channel.id)
+
+        return changed & current_ids
+
+    def _download(
+        self, episodes: list[Episode]
+    ) -> tuple[list[str], dict[str, Exception]]:
+        """Request the download of many episodes to the server concurrently.
+
+        Args:
+            episodes: The episodes to download.
+
+        Returns:
+            The IDs of the episodes whose download has been requested and
+                the errors of the requests that have failed.
+        """
+
+        def download(episode: Episode) -> Exception | None:
+            try:
+                self.subsonic.podcast.download_podcast_episode(episode.id)
+            except Exception as error:
+                return error
+
+            return None
+
+        with ContextThreadPoolExecutor(self.max_workers) as executor:
+            errors = list(executor.map(download, episodes))
+
+        downloads = [
+            episode.id for episode, error in zip(episodes, errors) if error is None
+        ]
+        failed_downloads = {
+            episode.id: error
+            for episode, error in zip(episodes, errors)
+            if error is not None
+        }
+
+        return downloads, failed_downloads
+
+    def _save(self) -> None:
+        """Write the known episodes to the state file, replacing it
+        atomically so a crash never leaves it half written.
+        """
+
+        if self.state_file is None:
+            return
+
+        with self._lock:
+            content = json.dumps(
+                {
+                    "channels": self._channels,
+                    "declined": sorted(self._declined),
+                    "accepted": sorted(self._accepted),
+                    "attempts": self._attempts,
+                }
+            )
+
+        temporary = self.state_file.with_name(self.state_file.name + ".tmp")
+        temporary.write_text(content)
+        os.replace(temporary, self.state_file)
+
+
+def _not_downloaded(episode: Episode) -> bool:
+    """Check if an episode has not been downloaded to the server.
+
+    Args:
+        episode: The episode to check.
+
+    Returns:
+        If the episode is not downloaded nor being downloaded.
+    """
+
+    return episode.status not in ("completed", "downloading", "deleted")
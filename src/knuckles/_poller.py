@@ -0,0 +1,410 @@
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Self
+
+from .models._chat_message import ChatMessage
+from .models._jukebox import Jukebox
+from .models._now_playing_entry import NowPlayingEntry
+from .models._scan_status import ScanStatus
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+
+class _Source:
+    """An endpoint polled by a poller and the state of its polling."""
+
+    def __init__(
+        self, check: Callable[[], Any | None], replay: bool, interval: float
+    ) -> None:
+        """Create a new polled endpoint.
+
+        Args:
+            check: Function that polls the endpoint, returning the value
+                to emit if it has changed or `None` otherwise.
+            replay: If the last emitted value should be sent to the new
+                subscribers right away.
+            interval: The initial seconds between polls.
+        """
+
+        self.check = check
+        self.replay = replay
+        self.interval = interval
+        self.due = 0.0
+        self.last_value: Any | None = None
+        self.subscribers: list[Callable[[Any], None]] = []
+
+
+class Poller:
+    """Object that polls the endpoints whose state has to be watched from a
+    single background thread, so many subscribers can share the same polls.
+
+    Each endpoint is only polled while it has subscribers, and its interval
+    adapts to how often it changes: it is reset to the minimum every time
+    a change is found and grows up to the maximum while nothing changes.
+    Subscribers are only called when the state has really changed.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        """Create a new poller, its thread is started with the
+        first subscription.
+
+        Args:
+            subsonic: The object used to poll the endpoints.
+            min_interval: The minimum seconds between two polls of
+                the same endpoint.
+            max_interval: The maximum seconds between two polls of
+                the same endpoint.
+            backoff: The factor the interval of an endpoint is multiplied
+                by every time a poll finds no changes.
+            on_error: Function called with the errors raised by the
+                polls and the subscribers, they are ignored by default.
+        """
+
+        self.subsonic = subsonic
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.on_error = on_error
+
+        self._sources = {
+            "now_playing": _Source(self._check_now_playing, True, min_interval),
+            "chat": _Source(self._check_chat, False, min_interval),
+            "scan_status": _Source(self._check_scan_status, True, min_interval),
+            "jukebox": _Source(self._check_jukebox, True, min_interval),
+        }
+        self._keys: dict[str, Hashable] = {}
+        self._last_message_time: int | None = None
+
+        self._lock = threading.Lock()
+        self._wake_up = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _check_now_playing(self) -> list[NowPlayingEntry] | None:
+        """Poll the songs being played by the users.
+
+        Returns:
+            All the songs being played if they have changed, else `None`.
+        """
+
+        entries = self.subsonic.lists.get_now_playing()
+
+        # The minutes ago are ignored as they change without a real change
+        key = tuple(
+            (entry.user.username, entry.player_id, entry.song.id) for entry in entries
+        )
+
+        return entries if self._changed("now_playing", key) else None
+
+    def _check_chat(self) -> list[ChatMessage] | None:
+        """Poll the chat messages sent since the last poll.
+
+        Returns:
+            The new messages if there are any, else `None`.
+        """
+
+        since = self._last_message_time
+
+        messages = [
+            message
+            for message in self.subsonic.chat.get_chat_messages(
+                _from_millis(since) if since is not None else None
+            )
+            if since is None or _to_millis(message) > since
+        ]
+
+        if not messages:
+            return None
+
+        self._last_message_time = max(_to_millis(message) for message in messages)
+
+        return messages
+
+    def _check_scan_status(self) -> ScanStatus | None:
+        """Poll the status of the scan of the library.
+
+        Returns:
+            The status if it has changed, else `None`.
+        """
+
+        status = self.subsonic.media_library_scanning.get_scan_status()
+
+        key = (status.scanning, status.count)
+
+        return status if self._changed("scan_status", key) else None
+
+    def _check_jukebox(self) -> Jukebox | None:
+        """Poll the status and the playlist of the jukebox.
+
+        Returns:
+            The status and playlist if they have changed, else `None`.
+        """
+
+        jukebox = self.subsonic.jukebox.get()
+
+        # The position is ignored as it changes constantly while playing
+        key = (
+            jukebox.current_index,
+            jukebox.playing,
+            jukebox.gain,
+            tuple(song.id for song in jukebox.playlist or []),
+        )
+
+        return jukebox if self._changed("jukebox", key) else None
+
+    def _changed(self, name: str, key: Hashable) -> bool:
+        """Save the key that identifies the state of an endpoint.
+
+        Args:
+            name: The name of the endpoint.
+            key: The new key of its state.
+
+        Returns:
+            If the key is different from the last saved one.
+        """
+
+        changed = name not in self._keys or self._keys[name] != key
+        self._keys[name] = key
+
+        return changed
+
+    def _subscribe(
+        self, name: str, callback: Callable[[Any], None]
+    ) -> Callable[[], None]:
+        """Register a function to be called with the changes of an endpoint
+        and start the background thread if needed.
+
+        Args:
+            name: The name of the endpoint.
+            callback: The function to call with the changes.
+
+        Returns:
+            A function that unregisters the callback when called.
+        """
+
+        source = self._sources[name]
+
+        with self._lock:
+            source.subscribers.append(callback)
+            last_value = source.last_value if source.replay else None
+
+            if self._thread is None and not self._closed.is_set():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        if last_value is not None:
+            self._call(callback, last_value)
+
+        # Wake up the thread in case the endpoint was not being polled
+        self._wake_up.set()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in source.subscribers:
+                    source.subscribers.remove(callback)
+
+        return unsubscribe
+
+    def on_now_playing(
+        self, callback: Callable[[list[NowPlayingEntry]], None]
+    ) -> Callable[[], None]:
+        """Call a function every time the songs being played by the
+        users change.
+
+        Args:
+            callback: The function to call with all the songs being played.
+
+        Returns:
+            A function that unregisters the callback when called.
+        """
+
+        return self._subscribe("now_playing", callback)
+
+    def on_chat_message(
+        self, callback: Callable[[list[ChatMessage]], None]
+    ) -> Callable[[], None]:
+        """Call a function every time new chat messages are sent, only the
+        new messages are requested using the `since` parameter.
+
+        Args:
+            callback: The function to call with the new messages.
+
+        Returns:
+            A function that unregisters the callback when called.
+        """
+
+        return self._subscribe("chat", callback)
+
+    def on_scan_status(
+        self, callback: Callable[[ScanStatus], None]
+    ) -> Callable[[], None]:
+        """Call a function every time the status of the scan of the
+        library changes.
+
+        Args:
+            callback: The function to call with the new status.
+
+        Returns:
+            A function that unregisters the callback when called.
+        """
+
+        return self._subscribe("scan_status", callback)
+
+    def on_jukebox(self, callback: Callable[[Jukebox], None]) -> Callable[[], None]:
+        """Call a function every time the status or the playlist of the
+        jukebox changes, ignoring the position of the playback.
+
+        Args:
+            callback: The function to call with the new status and playlist.
+
+        Returns:
+            A function that unregisters the callback when called.
+        """
+
+        return self._subscribe("jukebox", callback)
+
+    def refresh(self) -> None:
+        """Poll all the subscribed endpoints as soon as possible and reset
+        their intervals to the minimum, useful after making a change.
+        """
+
+        with self._lock:
+            for source in self._sources.values():
+                source.interval = self.min_interval
+                source.due = 0.0
+
+        self._wake_up.set()
+
+    def _call(self, callback: Callable[[Any], None], value: Any) -> None:
+        """Call a subscriber, reporting any error it raises.
+
+        Args:
+            callback: The subscriber to call.
+            value: The value to call it with.
+        """
+
+        try:
+            callback(value)
+        except Exception as error:
+            if self.on_error is not None:
+                self.on_error(error)
+
+    def _poll(self, source: _Source) -> None:
+        """Poll an endpoint, emit its changes and schedule its next poll.
+
+        Args:
+            source: The endpoint to poll.
+        """
+
+        try:
+            value = source.check()
+        except Exception as error:
+            value = None
+
+            if self.on_error is not None:
+                self.on_error(error)
+
+        with self._lock:
+            if value is not None:
+                source.interval = self.min_interval
+                source.last_value = value
+            else:
+                source.interval = min(source.interval * self.backoff, self.max_interval)
+
+            source.due = time.monotonic() + source.interval
+            subscribers = list(source.subscribers)
+
+        if value is not None:
+            for callback in subscribers:
+                self._call(callback, value)
+
+    def _run(self) -> None:
+        """Poll the endpoints with subscribers when they are due until the
+        poller is closed.
+        """
+
+        while not self._closed.is_set():
+            # Cleared before looking at the sources, so a subscription
+            # made from now on wakes up the next wait
+            self._wake_up.clear()
+
+            with self._lock:
+                now = time.monotonic()
+                due = [
+                    source
+                    for source in self._sources.values()
+                    if source.subscribers and source.due <= now
+                ]
+
+            for source in due:
+                self._poll(source)
+
+            # The subscriptions made while polling are also taken
+            # into account
+            with self._lock:
+                next_due = min(
+                    (
+                        source.due
+                        for source in self._sources.values()
+                        if source.subscribers
+                    ),
+                    default=None,
+                )
+
+            self._wake_up.wait(
+                max(next_due - time.monotonic(), 0) if next_due is not None else None
+            )
+
+    def close(self) -> None:
+        """Stop the background thread, no more polls are made."""
+
+        self._closed.set()
+        self._wake_up.set()
+
+        with self._lock:
+            thread = self._thread
+
+        if thread is not None:
+            thread.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def _to_millis(message: ChatMessage) -> int:
+    """Get the UNIX time in milliseconds a chat message was sent at.
+
+    Args:
+        message: The chat message.
+
+    Returns:
+        The time in milliseconds, as used by the API.
+    """
+
+    return round(message.time.timestamp() * 1000)
+
+
+def _from_millis(millis: int) -> datetime:
+    """Convert an UNIX time in milliseconds to a datetime, in the same way
+    the chat messages do.
+
+    Args:
+        millis: The time in milliseconds.
+
+    Returns:
+        The time as a datetime.
+    """
+
+    return datetime.fromtimestamp(millis / 1000)
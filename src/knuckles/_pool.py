@@ -0,0 +1,484 @@
+import itertools
+import threading
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, Self, Sequence
+
+from ._api import Api, RequestMethod
+from ._subsonic import Subsonic
+
+if TYPE_CHECKING:
+    from requests import Response
+
+# Endpoints that change the state of the server, so they are always sent
+# to the primary server to avoid the replicas from diverging
+PINNED_ENDPOINTS = frozenset(
+    {
+        "star",
+        "unstar",
+        "setRating",
+        "scrobble",
+        "createPlaylist",
+        "updatePlaylist",
+        "deletePlaylist",
+        "createShare",
+        "updateShare",
+        "deleteShare",
+        "refreshPodcasts",
+        "createPodcastChannel",
+        "deletePodcastChannel",
+        "downloadPodcastEpisode",
+        "deletePodcastEpisode",
+        "jukeboxControl",
+        "createInternetRadioStation",
+        "updateInternetRadioStation",
+        "deleteInternetRadioStation",
+        "addChatMessage",
+        "createUser",
+        "updateUser",
+        "deleteUser",
+        "changePassword",
+        "createBookmark",
+        "deleteBookmark",
+        "savePlayQueue",
+        "startScan",
+    }
+)
+
+
+class RoutingStrategy(Enum):
+    """How the read requests are spread between the servers of a pool."""
+
+    LEAST_LATENCY = "least_latency"
+    ROUND_ROBIN = "round_robin"
+
+
+class ServerHealth(NamedTuple):
+    """The last known health of a server of a pool.
+
+    Attributes:
+        url: The URL of the server.
+        healthy: If the last request made to the server succeeded.
+        latency: The moving average in seconds of the time the server
+            takes to answer, `None` if it has never answered.
+    """
+
+    url: str
+    healthy: bool
+    latency: float | None
+
+
+class _Server:
+    """Mutable state of a server of a pool."""
+
+    def __init__(self, subsonic: Subsonic) -> None:
+        self.subsonic = subsonic
+        self.latency: float | None = None
+        self.failed_at: float | None = None
+
+
+class PoolApi(Api):
+    """Class in charge of spreading the requests made to the REST API
+    between all the servers of a pool.
+    """
+
+    def __init__(
+        self,
+        servers: Sequence[Subsonic],
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_LATENCY,
+        retry_interval: float = 30.0,
+        pinned_endpoints: Iterable[str] = PINNED_ENDPOINTS,
+        latency_smoothing: float = 0.3,
+    ) -> None:
+        """Class in charge of spreading the requests made to the REST API
+        between all the servers of a pool.
+
+        Args:
+            servers: The servers of the pool, the first one being the
+                primary one.
+            strategy: How the read requests should be spread.
+            retry_interval: Seconds to wait before sending read requests
+                again to a server that has failed.
+            pinned_endpoints: Endpoints that should always be sent to
+                the primary server.
+            latency_smoothing: Weight between 0 and 1 given to the newest
+                latency measure in the moving average of each server.
+        """
+
+        if len(servers) == 0:
+            raise ValueError("A pool needs at least one server")
+
+        primary = servers[0].api
+
+        # The attributes of the primary server are exposed as they are
+        # used by some helper objects
+        super().__init__(
+            primary.url,
+            primary.username,
+            primary.password,
+            primary.client,
+            primary.url.startswith("https://"),
+            primary.use_token,
+            primary.request_method,
+        )
+
+        self.strategy = strategy
+        self.retry_interval = retry_interval
+        self.pinned_endpoints = frozenset(pinned_endpoints)
+        self.latency_smoothing = latency_smoothing
+
+        self._servers = [_Server(server) for server in servers]
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The lock and the round robin counter are created again
+        # when unpickled
+        state = super().__getstate__()
+        del state["_lock"], state["_round_robin"]
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+
+    def _record_success(self, server: _Server, latency: float) -> None:
+        """Mark a server as healthy and add a latency measure to
+        its average.
+
+        Args:
+            server: The server that has answered.
+            latency: The seconds the server has taken to answer.
+        """
+
+        with self._lock:
+            server.failed_at = None
+
+            if server.latency is None:
+                server.latency = latency
+            else:
+                server.latency += self.latency_smoothing * (latency - server.latency)
+
+    def _record_failure(self, server: _Server) -> None:
+        """Mark a server as unhealthy.
+
+        Args:
+            server: The server that has failed.
+        """
+
+        with self._lock:
+            server.failed_at = time.monotonic()
+
+    def _candidates(self, endpoint: str) -> list[_Server]:
+        """Get the servers a request should be tried against, in order.
+
+        Args:
+            endpoint: The endpoint of the request.
+
+        Returns:
+            The primary server alone for the pinned endpoints, else the
+                healthy servers sorted by the routing strategy followed
+                by the unhealthy ones as a last resort.
+        """
+
+        if endpoint in self.pinned_endpoints:
+            return [self._servers[0]]
+
+        now = time.monotonic()
+
+        with self._lock:
+            healthy = [
+                server
+                for server in self._servers
+                if server.failed_at is None
+                or now - server.failed_at >= self.retry_interval
+            ]
+            unhealthy = [server for server in self._servers if server not in healthy]
+
+            match self.strategy:
+                case RoutingStrategy.ROUND_ROBIN:
+                    if healthy:
+                        shift = next(self._round_robin) % len(healthy)
+                        healthy = healthy[shift:] + healthy[:shift]
+
+                case RoutingStrategy.LEAST_LATENCY | _:
+                    # Servers without measures go first so they get one
+                    healthy.sort(
+                        key=lambda server: (
+                            server.latency if server.latency is not None else 0.0
+                        )
+                    )
+
+        unhealthy.sort(key=lambda server: server.failed_at or 0.0)
+
+        return healthy + unhealthy
+
+    def generate_url(self, endpoint: str, extra_params: dict[str, Any]) -> str:
+        """Generate a valid URL for any endpoint pointing to the server
+        that would receive a request to it.
+
+        Args:
+            endpoint: The endpoint to be appended in the URL, **without** the
+                leading `/rest/`.
+            extra_params: The extra parameters to be added to the URL.
+
+        Returns:
+            A valid URL pointing to the desired endpoint and with the
+                requested parameters, including the ones needed
+                for authentication.
+        """
+
+        server = self._candidates(endpoint)[0]
+
+        return server.subsonic.api.generate_url(endpoint, extra_params)
+
+    def raw_request(
+        self,
+        endpoint: str,
+        extra_params: dict[str, Any] | None = None,
+        request_method: RequestMethod | None = None,
+    ) -> "Response":
+        """Makes a request to the best server of the pool, trying with the
+        next one if it fails to answer or answers with a server error.
+
+        Args:
+            endpoint: The endpoint to be appended in the URL, **without** the
+                leading `/rest/`.
+            extra_params: Extra parameters to the added to the request.
+            request_method: The verb to use only for this request, the one
+                of each server by default.
+
+        Raises:
+            requests.RequestException: Raised if no server was able
+                to answer.
+
+        Returns:
+            The
+                [`requests`](https://docs.python-requests.org/en/latest/index.html)
+                `response` object of the executed request.
+        """
+
+        # The first import of requests is slow, so it is timed too
+        start = time.perf_counter()
+
+        import requests
+
+        error: requests.RequestException | None = None
+        response: Response | None = None
+
+        try:
+            for server in self._candidates(endpoint):
+                try:
+                    response = server.subsonic.api.raw_request(
+                        endpoint, extra_params, request_method
+                    )
+                except requests.RequestException as exception:
+                    self._record_failure(server)
+                    error = exception
+                    continue
+
+                if response.status_code >= 500:
+                    self._record_failure(server)
+                    continue
+
+                self._record_success(server, response.elapsed.total_seconds())
+                return response
+        finally:
+            if self.profiler is not None:
+                self.profiler.add_network_time(time.perf_counter() - start)
+
+        # Return the last server error so it is handled as with a single server
+        if response is not None:
+            return response
+
+        assert error is not None
+        raise error
+
+    def health(self) -> list[ServerHealth]:
+        """Get the last known health of all the servers without making
+        any request.
+
+        Returns:
+            The health of every server, the primary one first.
+        """
+
+        with self._lock:
+            return [
+                ServerHealth(
+                    server.subsonic.api.url, server.failed_at is None, server.latency
+                )
+                for server in self._servers
+            ]
+
+    def health_check(self) -> list[ServerHealth]:
+        """Ping all the servers to update their health and latency.
+
+        Returns:
+            The updated health of every server, the primary one first.
+        """
+
+        for server in self._servers:
+            start = time.perf_counter()
+
+            # Any error, from a refused connection to an invalid response
+            # or an error code, means the server cannot be used
+            try:
+                server.subsonic.system.ping()
+            except Exception:
+                self._record_failure(server)
+                continue
+
+            self._record_success(server, time.perf_counter() - start)
+
+        return self.health()
+
+
+class SubsonicPool(Subsonic):
+    """Object that works as a `Subsonic` object but spreads its requests
+    between multiple servers holding the same library.
+
+    Read requests are routed by the latency of each server or in a round
+    robin, and retried in the next server if one fails. The requests that
+    change the state of the server are always sent to the primary one.
+
+    Attributes:
+        servers: The servers of the pool, the first one being the
+            primary one.
+        health_check_interval: The seconds between the background pings
+            to all the servers, `None` if they are disabled.
+    """
+
+    def __init__(
+        self,
+        servers: Sequence[Subsonic],
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_LATENCY,
+        retry_interval: float = 30.0,
+        pinned_endpoints: Iterable[str] = PINNED_ENDPOINTS,
+        health_check_interval: float | None = None,
+        profile: bool = False,
+        identity_map: bool = False,
+    ) -> None:
+        """Construction method of the object used to interact with the
+        OpenSubsonic REST API of multiple servers.
+
+        Args:
+            servers: The servers of the pool, each one with its own URL
+                and credentials. The first one is the primary server.
+            strategy: How the read requests should be spread.
+            retry_interval: Seconds to wait before sending read requests
+                again to a server that has failed.
+            pinned_endpoints: Endpoints that should always be sent to
+                the primary server, by default all the ones that change
+                the state of the server.
+            health_check_interval: If given, the seconds between the pings
+                made from a background thread to all the servers.
+            profile: If the time spent in the network, decoding the
+                responses and building the models should be recorded
+                for every call made to the helper objects.
+            identity_map: If the models with the same type and ID should
+                be the same object, merging the info of every response
+                where they are found.
+        """
+
+        self._setup(profile, identity_map)
+
+        self.servers = list(servers)
+        self.health_check_interval = health_check_interval
+
+        self.api: PoolApi = PoolApi(
+            self.servers, strategy, retry_interval, pinned_endpoints
+        )
+        self.api.profiler = self.profiler
+
+        self._start_health_checks()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the configuration of the pool, the health checks are
+        started again when unpickled.
+
+        Returns:
+            The state to pickle.
+        """
+
+        return {
+            **super().__getstate__(),
+            "servers": self.servers,
+            "health_check_interval": self.health_check_interval,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the pool from its pickled configuration.
+
+        Args:
+            state: The pickled state.
+        """
+
+        super().__setstate__(state)
+
+        self.servers = state["servers"]
+        self.health_check_interval = state["health_check_interval"]
+
+        self._start_health_checks()
+
+    def _start_health_checks(self) -> None:
+        """Start the background health checks, if an interval is set."""
+
+        self._stop_health_checks = threading.Event()
+        self._health_check_thread: threading.Thread | None = None
+
+        if self.health_check_interval is not None:
+            self._health_check_thread = threading.Thread(
+                target=self._run_health_checks,
+                args=(self.health_check_interval,),
+                daemon=True,
+            )
+            self._health_check_thread.start()
+
+    def _run_health_checks(self, interval: float) -> None:
+        """Ping all the servers periodically until the pool is closed.
+
+        Args:
+            interval: The seconds between each round of pings.
+        """
+
+        self.api.health_check()
+
+        while not self._stop_health_checks.wait(interval):
+            self.api.health_check()
+
+    def health(self) -> list[ServerHealth]:
+        """Get the last known health of all the servers without making
+        any request.
+
+        Returns:
+            The health of every server, the primary one first.
+        """
+
+        return self.api.health()
+
+    def health_check(self) -> list[ServerHealth]:
+        """Ping all the servers to update their health and latency.
+
+        Returns:
+            The updated health of every server, the primary one first.
+        """
+
+        return self.api.health_check()
+
+    def close(self) -> None:
+        """Stop the background health checks, if any."""
+
+        self._stop_health_checks.set()
+
+        if self._health_check_thread is not None:
+            self._health_check_thread.join()
+            self._health_check_thread = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,270 @@
+import functools
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, NamedTuple, ParamSpec, TextIO, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class ProfileRecord(NamedTuple):
+    """Timings in seconds of a single call to a method of a helper object.
+
+    Attributes:
+        method: The name of the called method, e.g. `Lists.get_starred`.
+        network: Time spent waiting for the server and receiving the body.
+        decode: Time spent decoding the JSON body of the responses.
+        model_build: Time spent inside the method itself, mainly building
+            the models from the decoded data.
+        total: The wall time of the whole call, the other timings can be
+            bigger when the method makes its requests from many threads.
+    """
+
+    method: str
+    network: float
+    decode: float
+    model_build: float
+    total: float
+
+
+class ProfileSummary(NamedTuple):
+    """Accumulated timings in seconds of all the calls made to a method
+    of a helper object.
+
+    Attributes:
+        method: The name of the called method, e.g. `Lists.get_starred`.
+        calls: The number of times the method has been called.
+        network: Time spent waiting for the server and receiving the body.
+        decode: Time spent decoding the JSON body of the responses.
+        model_build: Time spent inside the method itself, mainly building
+            the models from the decoded data.
+        total: The wall time of all the calls.
+    """
+
+    method: str
+    calls: int
+    network: float
+    decode: float
+    model_build: float
+    total: float
+
+
+class _Frame:
+    """Timings of a helper method call that is still running."""
+
+    def __init__(self, profiler: "Profiler") -> None:
+        self.profiler = profiler
+        self.network = 0.0
+        self.decode = 0.0
+        self.nested = 0.0
+
+
+# The running helper method calls, copied to the worker threads of the
+# pools of the library so their time is assigned to the call that made them
+_stack: ContextVar[tuple[_Frame, ...]] = ContextVar("_stack", default=())
+
+
+class Profiler:
+    """Class in charge of recording how much time the helper methods spend
+    in the network, decoding the JSON responses and building the models.
+
+    The network and decode time of a request is always assigned to the
+    innermost helper method running in the thread, or in the thread that
+    has submitted the work to a pool of workers, so when a helper method
+    calls another one (e.g. `Album.generate`) each record only holds its
+    own share of the time.
+    """
+
+    def __init__(self) -> None:
+        self.records: list[ProfileRecord] = []
+
+        self._lock = threading.Lock()
+
+    def _innermost(self) -> _Frame | None:
+        """Get the innermost running helper method call of this profiler.
+
+        Returns:
+            The innermost call, `None` if there is not any.
+        """
+
+        for frame in reversed(_stack.get()):
+            if frame.profiler is self:
+                return frame
+
+        return None
+
+    def add_network_time(self, seconds: float) -> None:
+        """Assign network time to the innermost running helper method call.
+
+        Args:
+            seconds: The time spent in the network.
+        """
+
+        frame = self._innermost()
+
+        if frame is not None:
+            with self._lock:
+                frame.network += seconds
+
+    def add_decode_time(self, seconds: float) -> None:
+        """Assign JSON decode time to the innermost running helper
+        method call.
+
+        Args:
+            seconds: The time spent decoding JSON.
+        """
+
+        frame = self._innermost()
+
+        if frame is not None:
+            with self._lock:
+                frame.decode += seconds
+
+    def wrap(self, method_name: str, method: Callable[P, R]) -> Callable[P, R]:
+        """Wrap a callable so a record is saved every time it is called.
+
+        Args:
+            method_name: The name to be used in the records.
+            method: The callable to wrap.
+
+        Returns:
+            A callable that behaves the same as the given one.
+        """
+
+        @functools.wraps(method)
+        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+            parent = self._innermost()
+            frame = _Frame(self)
+            token = _stack.set((*_stack.get(), frame))
+
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                total = time.perf_counter() - start
+                _stack.reset(token)
+
+                with self._lock:
+                    # The time of nested calls is already recorded by themselves
+                    if parent is not None:
+                        parent.nested += total
+
+                    model_build = total - frame.network - frame.decode - frame.nested
+
+                    self.records.append(
+                        ProfileRecord(
+                            method_name,
+                            frame.network,
+                            frame.decode,
+                            max(model_build, 0.0),
+                            total,
+                        )
+                    )
+
+        return inner
+
+    def instrument(self, helper: Any) -> None:
+        """Wrap all the public methods of a helper object, so every call to
+        them gets recorded.
+
+        Args:
+            helper: The helper object to instrument.
+        """
+
+        helper_name = type(helper).__name__
+
+        for name in dir(type(helper)):
+            if name.startswith("_"):
+                continue
+
+            attribute = getattr(helper, name)
+
+            if not callable(attribute):
+                continue
+
+            setattr(helper, name, self.wrap(f"{helper_name}.{name}", attribute))
+
+    def reset(self) -> None:
+        """Remove all the saved records."""
+
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> list[ProfileSummary]:
+        """Accumulate all the saved records by method.
+
+        Returns:
+            A list with the timings of each called method, sorted from
+                the one that has spent the most time to the least.
+        """
+
+        with self._lock:
+            records = list(self.records)
+
+        summaries: dict[str, ProfileSummary] = {}
+
+        for record in records:
+            previous = summaries.get(
+                record.method, ProfileSummary(record.method, 0, 0.0, 0.0, 0.0, 0.0)
+            )
+
+            summaries[record.method] = ProfileSummary(
+                record.method,
+                previous.calls + 1,
+                previous.network + record.network,
+                previous.decode + record.decode,
+                previous.model_build + record.model_build,
+                previous.total + record.total,
+            )
+
+        return sorted(summaries.values(), key=lambda summary: -summary.total)
+
+    def format_summary(self) -> str:
+        """Generate a plain text table with the summary of all the
+        saved records.
+
+        Returns:
+            The table with one row for each called method.
+        """
+
+        header = ("Method", "Calls", "Network", "Decode", "Model build", "Total")
+        rows = [
+            (
+                summary.method,
+                str(summary.calls),
+                f"{summary.network:.6f}",
+                f"{summary.decode:.6f}",
+                f"{summary.model_build:.6f}",
+                f"{summary.total:.6f}",
+            )
+            for summary in self.summary()
+        ]
+
+        widths = [
+            max(len(row[column]) for row in [header, *rows])
+            for column in range(len(header))
+        ]
+
+        lines = []
+        for row in [header, *rows]:
+            cells = [row[0].ljust(widths[0])] + [
+                cell.rjust(width) for cell, width in zip(row[1:], widths[1:])
+            ]
+            lines.append("  ".join(cells))
+
+        # Separate the header from the rows
+        lines.insert(1, "  ".join("-" * width for width in widths))
+
+        return "\n".join(lines)
+
+    def dump_summary(self, file: TextIO | None = None) -> None:
+        """Print the summary table of all the saved records.
+
+        Args:
+            file: Where the table should be written to, `sys.stdout`
+                by default.
+        """
+
+        print(self.format_summary(), file=file if file is not None else sys.stdout)
@@ -0,0 +1,219 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Self
+
+from ._stream_cache import StreamCache, StreamReader
+from .models._play_queue import PlayQueue
+
+if TYPE_CHECKING:
+    from .models._playlist import Playlist
+    from .models._song import Song
+
+
+class QueuePrefetcher:
+    """Object that downloads in the background the songs that follow the
+    current one in a play queue or playlist, so they are stored locally
+    before they have to be played and the transitions are gapless.
+
+    The songs are stored in a `StreamCache`, so they share its disk budget
+    and are fetched only once even if other readers are streaming them.
+
+    Attributes:
+        cache: The cache where the songs are stored.
+        lookahead: The number of songs after the current one to download.
+        max_bitrate_rate: The max bitrate the downloaded songs should have.
+        stream_format: The format the downloaded songs should be.
+    """
+
+    def __init__(
+        self,
+        cache: StreamCache,
+        lookahead: int = 2,
+        max_bitrate_rate: int | None = None,
+        stream_format: str | None = None,
+    ) -> None:
+        """Create a new prefetcher without any queue.
+
+        Args:
+            cache: The cache where the songs should be stored.
+            lookahead: The number of songs after the current one
+                to download.
+            max_bitrate_rate: The max bitrate the downloaded songs should
+                have, it should be the one used by the player so the
+                downloads can be reused.
+            stream_format: The format the downloaded songs should be.
+        """
+
+        self.cache = cache
+        self.lookahead = lookahead
+        self.max_bitrate_rate = max_bitrate_rate
+        self.stream_format = stream_format
+
+        self._song_ids: list[str] = []
+        self._current = 0
+        self._downloads: dict[str, Future[StreamReader]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max(lookahead, 1) + 1)
+
+    def set_queue(
+        self, queue: "PlayQueue | Playlist", current_id: str | None = None
+    ) -> None:
+        """Replace the songs to prefetch with the ones of a play queue
+        or a playlist.
+
+        Args:
+            queue: The play queue or playlist to follow.
+            current_id: The ID of the song being played, by default the
+                current song of the play queue or the first one.
+        """
+
+        songs: list[Song] = queue.songs or []
+
+        if current_id is None and isinstance(queue, PlayQueue) and queue.current:
+            current_id = queue.current.id
+
+        with self._lock:
+            self._song_ids = [song.id for song in songs]
+            self._current = 0
+
+        self.set_current(current_id)
+
+    def set_current(self, song_id: str | None) -> None:
+        """Change the song being played and start downloading the
+        ones that follow it.
+
+        Args:
+            song_id: The ID of the song being played, the first one of
+                the queue if it is `None` or it is not in the queue. If
+                the song is repeated in the queue its next occurrence
+                from the current position is used.
+        """
+
+        with self._lock:
+            index = 0
+
+            if song_id in self._song_ids:
+                following = self._song_ids[self._current :]
+                index = (
+                    self._current + following.index(song_id)
+                    if song_id in following
+                    else self._song_ids.index(song_id)
+                )
+
+            self._move(index)
+
+    def advance(self) -> str | None:
+        """Move to the next song of the queue.
+
+        Returns:
+            The ID of the new current song, `None` if the queue has ended.
+        """
+
+        with self._lock:
+            index = self._current + 1
+
+            if index >= len(self._song_ids):
+                return None
+
+            self._move(index)
+
+            return self._song_ids[index]
+
+    def _move(self, index: int) -> None:
+        """Change the position of the song being played and start
+        downloading the ones that follow it, the lock must be held.
+
+        Args:
+            index: The position in the queue of the song being played.
+        """
+
+        self._current = index
+        window = self._song_ids[index : index + self.lookahead + 1]
+
+        # Forget the downloads outside the window, the ones not
+        # started yet are cancelled
+        for old_id in list(self._downloads):
+            if old_id not in window:
+                self._downloads.pop(old_id).cancel()
+
+        for window_id in window:
+            if window_id not in self._downloads:
+                self._downloads[window_id] = self._executor.submit(
+                    self._download, window_id
+                )
+
+    def _download(self, song_id: str) -> StreamReader:
+        """Download all the segments of a song.
+
+        Args:
+            song_id: The ID of the song to download.
+
+        Returns:
+            A reader of the downloaded song.
+        """
+
+        reader = self.cache.open_stream(
+            song_id, self.max_bitrate_rate, self.stream_format
+        )
+
+        for future in wait(self.cache.fetch(reader.segments)).done:
+            future.result()
+
+        return reader
+
+    def is_ready(self, song_id: str) -> bool:
+        """Check if a song has been completely downloaded.
+
+        Args:
+            song_id: The ID of the song to check.
+
+        Returns:
+            If the song can be played without waiting for the network.
+        """
+
+        with self._lock:
+            download = self._downloads.get(song_id)
+
+        return (
+            download is not None
+            and download.done()
+            and not download.cancelled()
+            and download.exception() is None
+        )
+
+    def open(self, song_id: str) -> StreamReader:
+        """Get a local handle to play a song, waiting for its download
+        to end. Songs outside the queue are streamed through the cache.
+
+        Args:
+            song_id: The ID of the song to open.
+
+        Returns:
+            A reader positioned at the start of the song.
+        """
+
+        with self._lock:
+            download = self._downloads.get(song_id)
+
+        if download is None or download.cancelled():
+            return self.cache.open_stream(
+                song_id, self.max_bitrate_rate, self.stream_format
+            )
+
+        # Every caller gets its own position in the song
+        return StreamReader(self.cache, download.result().segments)
+
+    def close(self) -> None:
+        """Cancel the pending downloads and wait for the running ones."""
+
+        with self._lock:
+            for download in self._downloads.values():
+                download.cancel()
+
+        self._executor.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,282 @@
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, NamedTuple, Self
+
+from .exceptions import ErrorCode70
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+
+class Scrobble(NamedTuple):
+    """A play of a song waiting to be submitted to the server.
+
+    Attributes:
+        song_id: The ID of the played song.
+        time: When the song was played.
+    """
+
+    song_id: str
+    time: datetime
+
+
+class ScrobbleBuffer:
+    """Object that accumulates plays of songs and submits them in batches
+    to the server, instead of making a request for every play.
+
+    The batches are sent from a background thread when enough plays have
+    been accumulated or the flush interval has passed. If a journal file
+    is given every pending play is also written to it, so they are
+    submitted in order the next time the server is reachable, even if the
+    program has been restarted.
+
+    Attributes:
+        rejected: The plays that the server has refused to register
+            because their song does not exist.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        journal: str | Path | None = None,
+        max_batch_size: int = 50,
+        flush_interval: float | None = 30.0,
+    ) -> None:
+        """Create a new buffer of plays, loading the pending ones from
+        the journal if it exists.
+
+        Args:
+            subsonic: The object used to submit the plays.
+            journal: Path to the file where the pending plays should
+                be persisted.
+            max_batch_size: The maximum number of plays to submit in a single
+                request, when this number of plays is accumulated they are
+                submitted right away.
+            flush_interval: The maximum seconds a play can wait before being
+                submitted, also used as the interval to retry the submission
+                when the server is unreachable. If it is `None` no background
+                thread is started and `flush()` should be called manually.
+        """
+
+        self.subsonic = subsonic
+        self.journal = Path(journal) if journal is not None else None
+        self.max_batch_size = max_batch_size
+        self.rejected: list[Scrobble] = []
+
+        self._pending: deque[Scrobble] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._journal_file: IO[str] | None = None
+
+        if self.journal is not None:
+            if self.journal.exists():
+                self._pending.extend(_load_journal(self.journal))
+
+            # Rewrite the journal to drop any line left half written
+            self._journal_file = self.journal.open("a", encoding="utf-8")
+            self._rewrite_journal()
+
+        self._wake_up = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._run, args=(flush_interval,), daemon=True
+            )
+            self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, song_id: str, time: datetime | None = None) -> Self:
+        """Register that a song has been played.
+
+        Args:
+            song_id: The ID of the played song.
+            time: When the song was played, now by default.
+
+        Returns:
+            The object itself.
+        """
+
+        scrobble = Scrobble(
+            song_id, time if time is not None else datetime.now(timezone.utc)
+        )
+
+        with self._lock:
+            self._pending.append(scrobble)
+
+            if self._journal_file is not None:
+                self._journal_file.write(_encode(scrobble))
+                self._journal_file.flush()
+
+            full = len(self._pending) >= self.max_batch_size
+
+        if full:
+            self._wake_up.set()
+
+        return self
+
+    def flush(self) -> int:
+        """Submit all the pending plays in order, stopping at the first
+        batch that cannot be submitted.
+
+        A batch with a song the server cannot find is split in halves
+        until only the plays of the missing songs are rejected, any other
+        error, like a server error or invalid credentials, keeps the plays
+        pending so they are submitted in a later flush.
+
+        Returns:
+            The number of plays submitted to the server.
+        """
+
+        submitted = 0
+        batch_size = self.max_batch_size
+
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = list(self._pending)[:batch_size]
+
+                if not batch:
+                    break
+
+                try:
+                    self.subsonic.media_annotation.scrobble(
+                        [scrobble.song_id for scrobble in batch],
+                        [scrobble.time for scrobble in batch],
+                    )
+                except ErrorCode70:
+                    # Find the missing song in the halves of the batch
+                    if len(batch) > 1:
+                        batch_size = (len(batch) + 1) // 2
+                        continue
+
+                    # The song does not exist, retrying is useless
+                    self.rejected.extend(batch)
+                    batch_size = self.max_batch_size
+                except Exception:
+                    # The error can be transient, keep the plays for later
+                    break
+                else:
+                    submitted += len(batch)
+
+                with self._lock:
+                    for _ in batch:
+                        self._pending.popleft()
+
+                    self._rewrite_journal()
+
+        return submitted
+
+    def _rewrite_journal(self) -> None:
+        """Replace the content of the journal with the pending plays,
+        must be called holding the lock.
+        """
+
+        if self.journal is None or self._journal_file is None:
+            return
+
+        self._journal_file.close()
+
+        # Write to a temporary file first so the journal is never left
+        # half written if the program is killed
+        temporary = self.journal.with_name(self.journal.name + ".tmp")
+        with temporary.open("w", encoding="utf-8") as file:
+            file.writelines(_encode(scrobble) for scrobble in self._pending)
+
+        os.replace(temporary, self.journal)
+
+        self._journal_file = self.journal.open("a", encoding="utf-8")
+
+    def _run(self, flush_interval: float) -> None:
+        """Submit the pending plays when the buffer is full or the flush
+        interval has passed, until the buffer is closed.
+
+        Args:
+            flush_interval: The maximum seconds between flushes.
+        """
+
+        while not self._closed.is_set():
+            self._wake_up.wait(flush_interval)
+            self._wake_up.clear()
+
+            if self._closed.is_set():
+                break
+
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background thread and try to submit the pending plays
+        for the last time, the ones that could not be submitted remain in
+        the journal.
+        """
+
+        self._closed.set()
+        self._wake_up.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+        with self._lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def _encode(scrobble: Scrobble) -> str:
+    """Encode a play as a line of the journal.
+
+    Args:
+        scrobble: The play to encode.
+
+    Returns:
+        The JSON representation of the play followed by a new line.
+    """
+
+    return (
+        json.dumps({"id": scrobble.song_id, "time": scrobble.time.timestamp()}) + "\n"
+    )
+
+
+def _load_journal(journal: Path) -> list[Scrobble]:
+    """Read the pending plays stored in a journal.
+
+    Args:
+        journal: The path to the journal.
+
+    Returns:
+        The stored plays in order, ignoring a last line that could have
+            been left half written.
+    """
+
+    scrobbles = []
+
+    with journal.open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            scrobbles.append(
+                Scrobble(
+                    entry["id"], datetime.fromtimestamp(entry["time"], timezone.utc)
+                )
+            )
+
+    return scrobbles
@@ -0,0 +1,270 @@
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as error:
+    raise ImportError(
+        "NumPy is needed to use smart playlists, install it with 'knuckles[numpy]'"
+    ) from error
+
+from ._song_table import CATEGORICAL_COLUMNS, TIMESTAMP_COLUMNS, SongTable
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+    from .models._playlist import Playlist
+
+# Seconds in a day, used by the rules relative to the current time
+_DAY = 24 * 60 * 60
+
+
+class Operator(Enum):
+    """How the value of a column is compared in a rule."""
+
+    EQUAL = "equal"
+    NOT_EQUAL = "not_equal"
+    GREATER = "greater"
+    GREATER_OR_EQUAL = "greater_or_equal"
+    LESS = "less"
+    LESS_OR_EQUAL = "less_or_equal"
+    BETWEEN = "between"
+    IN = "in"
+    NOT_IN = "not_in"
+    IN_THE_LAST_DAYS = "in_the_last_days"
+    NOT_IN_THE_LAST_DAYS = "not_in_the_last_days"
+
+
+class Rule(NamedTuple):
+    """A condition the songs of a smart playlist must match.
+
+    Songs without a value in the column never match a rule, except the
+    ones with a negated operator, e.g. the songs never played are not
+    played in the last days.
+
+    Attributes:
+        column: The name of a column of a song table, e.g. `"year"`.
+        operator: How the value of the column is compared.
+        value: The value to compare with, a pair of inclusive limits for
+            `BETWEEN`, a list of values for `IN` and `NOT_IN` and a number
+            of days for the operators relative to the current time.
+    """
+
+    column: str
+    operator: Operator
+    value: Any
+
+
+class SmartPlaylist(NamedTuple):
+    """The definition of a playlist whose songs are chosen by rules.
+
+    Attributes:
+        name: The name of the playlist in the server.
+        rules: The conditions the songs must match.
+        match_all: If the songs must match all the rules or only one.
+        sort: The column the songs are sorted by, in the order of
+            the catalog if `None`.
+        descending: If the songs are sorted from the biggest value.
+        limit: The maximum number of songs of the playlist.
+    """
+
+    name: str
+    rules: list[Rule]
+    match_all: bool = True
+    sort: str | None = None
+    descending: bool = False
+    limit: int | None = None
+
+
+class SmartPlaylistEngine:
+    """Object that evaluates smart playlists against a local copy of the
+    catalog and pushes the resulting songs to the server.
+
+    The catalog is requested once and stored as a `SongTable`, so every
+    rule is evaluated as a single vectorized comparison over all the songs
+    without making any request.
+
+    Attributes:
+        page_size: The number of songs requested in every page when
+            the catalog is loaded.
+        music_folder_id: The ID of the music folder of the catalog, if any.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        catalog: SongTable | None = None,
+        page_size: int = 500,
+        music_folder_id: str | None = None,
+    ) -> None:
+        """Create a new engine.
+
+        Args:
+            subsonic: The object used to make the requests.
+            catalog: The songs to evaluate the playlists against, by
+                default the whole library is loaded when first needed.
+            page_size: The number of songs to request in every page when
+                the catalog is loaded.
+            music_folder_id: If given, the ID of the music folder whose
+                songs should be loaded.
+        """
+
+        self.subsonic = subsonic
+        self.page_size = page_size
+        self.music_folder_id = music_folder_id
+
+        self._catalog = catalog
+
+    @property
+    def catalog(self) -> SongTable:
+        """The songs the playlists are evaluated against."""
+
+        if self._catalog is None:
+            self._catalog = self._load()
+
+        return self._catalog
+
+    def refresh(self) -> None:
+        """Load the catalog again from the server, so the playlists
+        follow the changes of the library.
+        """
+
+        self._catalog = self._load()
+
+    def _load(self) -> SongTable:
+        """Request all the songs of the catalog.
+
+        Returns:
+            A table with all the songs.
+        """
+
+        return SongTable.from_library(
+            self.subsonic, self.page_size, self.music_folder_id
+        )
+
+    def evaluate(self, playlist: SmartPlaylist, now: float | None = None) -> list[str]:
+        """Find the songs of the catalog that match a smart playlist.
+
+        Args:
+            playlist: The smart playlist to evaluate.
+            now: The UNIX time the rules relative to the current time
+                are evaluated at, by default the current one.
+
+        Returns:
+            The IDs of the matching songs, sorted and limited as defined
+                in the playlist.
+        """
+
+        table = self.catalog
+        now = time.time() if now is None else now
+
+        masks = [_compile(table, rule, now) for rule in playlist.rules]
+
+        if masks:
+            reduce = np.logical_and if playlist.match_all else np.logical_or
+            table = table.filter(reduce.reduce(masks))
+
+        if playlist.sort is not None:
+            table = table.sort(playlist.sort, playlist.descending)
+
+        ids = table.ids()
+
+        return ids[: playlist.limit] if playlist.limit is not None else ids
+
+    def push(
+        self,
+        playlist: SmartPlaylist,
+        playlist_id: str | None = None,
+        now: float | None = None,
+    ) -> "Playlist":
+        """Evaluate a smart playlist and save its songs in the server.
+
+        Args:
+            playlist: The smart playlist to evaluate.
+            playlist_id: The ID of the playlist to update with the songs,
+                a new one is created if it is `None`.
+            now: The UNIX time the rules relative to the current time
+                are evaluated at, by default the current one.
+
+        Returns:
+            An object that holds all the info about the updated or
+                created playlist.
+        """
+
+        song_ids = self.evaluate(playlist, now)
+
+        if playlist_id is None:
+            return self.subsonic.playlists.create_playlist(
+                playlist.name, song_ids=song_ids
+            )
+
+        # Only the songs that differ are sent
+        return self.subsonic.playlists.sync_playlist(playlist_id, song_ids)
+
+
+def _compile(table: SongTable, rule: Rule, now: float) -> npt.NDArray[np.bool_]:
+    """Evaluate a rule against all the songs of a table at once.
+
+    Args:
+        table: The songs to evaluate.
+        rule: The rule to evaluate.
+        now: The UNIX time of the rules relative to the current time.
+
+    Returns:
+        If every song matches the rule.
+
+    Raises:
+        ValueError: If the operator can not be used with the column.
+    """
+
+    operator = rule.operator
+
+    if rule.column in CATEGORICAL_COLUMNS:
+        match operator:
+            case Operator.EQUAL:
+                return table.is_in(rule.column, [rule.value])
+            case Operator.NOT_EQUAL:
+                return ~table.is_in(rule.column, [rule.value])
+            case Operator.IN:
+                return table.is_in(rule.column, rule.value)
+            case Operator.NOT_IN:
+                return ~table.is_in(rule.column, rule.value)
+
+        raise ValueError(f"'{operator.value}' can not be used with '{rule.column}'")
+
+    values = table[rule.column]
+    mask: npt.NDArray[np.bool_]
+
+    match operator:
+        case Operator.EQUAL:
+            mask = values == rule.value
+        case Operator.NOT_EQUAL:
+            mask = values != rule.value
+        case Operator.GREATER:
+            mask = values > rule.value
+        case Operator.GREATER_OR_EQUAL:
+            mask = values >= rule.value
+        case Operator.LESS:
+            mask = values < rule.value
+        case Operator.LESS_OR_EQUAL:
+            mask = values <= rule.value
+        case Operator.BETWEEN:
+            low, high = rule.value
+            mask = (values >= low) & (values <= high)
+        case Operator.IN:
+            mask = np.isin(values, list(rule.value))
+        case Operator.NOT_IN:
+            mask = ~np.isin(values, list(rule.value))
+        case _:
+            if rule.column not in TIMESTAMP_COLUMNS:
+                raise ValueError(
+                    f"'{operator.value}' can not be used with '{rule.column}'"
+                )
+
+            mask = values >= now - rule.value * _DAY
+
+            if operator == Operator.NOT_IN_THE_LAST_DAYS:
+                mask = ~mask
+
+    return mask
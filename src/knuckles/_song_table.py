@@ -0,0 +1,621 @@
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Self
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as error:
+    raise ImportError(
+        "NumPy is needed to use song tables, install it with 'knuckles[numpy]'"
+    ) from error
+
+from dateutil import parser
+
+from .models._song import Song
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+# The numeric columns of a table and the key of their values in the API
+NUMERIC_COLUMNS = {
+    "duration": "duration",
+    "size": "size",
+    "bit_rate": "bitRate",
+    "year": "year",
+    "play_count": "playCount",
+    "user_rating": "userRating",
+    "track": "track",
+    "disc_number": "discNumber",
+}
+
+# The columns of a table with dates, stored as UNIX timestamps
+TIMESTAMP_COLUMNS = {
+    "created": "created",
+    "starred": "starred",
+    "played": "played",
+}
+
+# The columns of a table with repeated strings, stored as codes
+CATEGORICAL_COLUMNS = {
+    "genre": "genre",
+    "artist_id": "artistId",
+    "album_id": "albumId",
+}
+
+Aggregation = Literal["sum", "count", "mean"]
+
+
+class SongTable:
+    """Object that holds many songs as columns, to filter, sort and
+    aggregate them without creating a `Song` object for each one.
+
+    Numeric columns are float arrays with `NaN` where the server has not
+    sent a value, dates are stored in the same way as UNIX timestamps.
+    Columns with repeated strings, like the genre or the IDs of the artist
+    and album, are stored as integer codes into a list of categories, with
+    `-1` where the value is missing. The songs are only created when they
+    are requested.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        entries: list[dict[str, Any]],
+        rows: npt.NDArray[np.intp],
+        numeric: dict[str, npt.NDArray[np.float64]],
+        codes: dict[str, npt.NDArray[np.int32]],
+        categories: dict[str, list[str]],
+    ) -> None:
+        """Create a new table from its columns, `from_entries` should
+        be used instead.
+
+        Args:
+            subsonic: The object used to create the songs.
+            entries: The songs as sent by the server, shared between
+                the tables derived from the same one.
+            rows: The index in the entries of every song of the table.
+            numeric: The values of every numeric column.
+            codes: The codes of every categorical column.
+            categories: The values the codes of every categorical
+                column point to.
+        """
+
+        self.subsonic = subsonic
+        self._entries = entries
+        self._rows = rows
+        self._numeric = numeric
+        self._codes = codes
+        self._categories = categories
+
+    @classmethod
+    def from_entries(cls, subsonic: "Subsonic", entries: list[dict[str, Any]]) -> Self:
+        """Create a table from the songs as sent by the server.
+
+        Args:
+            subsonic: The object used to create the songs.
+            entries: The songs of a response of the API.
+
+        Returns:
+            A table with all the given songs.
+        """
+
+        numeric = {
+            column: np.array([entry.get(key) for entry in entries], dtype=np.float64)
+            for column, key in NUMERIC_COLUMNS.items()
+        }
+
+        for column, key in TIMESTAMP_COLUMNS.items():
+            numeric[column] = np.array(
+                [
+                    parser.parse(entry[key]).timestamp()
+                    if entry.get(key) is not None
+                    else None
+                    for entry in entries
+                ],
+                dtype=np.float64,
+            )
+
+        codes: dict[str, npt.NDArray[np.int32]] = {}
+        categories: dict[str, list[str]] = {}
+
+        for column, key in CATEGORICAL_COLUMNS.items():
+            lookup: dict[str, int] = {}
+            codes[column] = np.array(
+                [
+                    lookup.setdefault(entry[key], len(lookup))
+                    if entry.get(key) is not None
+                    else -1
+                    for entry in entries
+                ],
+                dtype=np.int32,
+            )
+            categories[column] = list(lookup)
+
+        return cls(
+            subsonic,
+            entries,
+            np.arange(len(entries), dtype=np.intp),
+            numeric,
+            codes,
+            categories,
+        )
+
+    @classmethod
+    def concat(cls, subsonic: "Subsonic", tables: Iterable["SongTable"]) -> Self:
+        """Join many tables in a single one, e.g. the pages of a list.
+
+        Args:
+            subsonic: The object used to create the songs.
+            tables: The tables to join.
+
+        Returns:
+            A table with the songs of all the tables, in the same order.
+        """
+
+        tables = list(tables)
+
+        if not tables:
+            return cls.from_entries(subsonic, [])
+
+        # The columns are joined as they are, so the dates are not parsed
+        # again and only the codes of the categories are translated
+        entries = [entry for table in tables for entry in table._selected_entries()]
+        numeric = {
+            column: np.concatenate([table._numeric[column] for table in tables])
+            for column in [*NUMERIC_COLUMNS, *TIMESTAMP_COLUMNS]
+        }
+
+        codes: dict[str, npt.NDArray[np.int32]] = {}
+        categories: dict[str, list[str]] = {}
+
+        for column in CATEGORICAL_COLUMNS:
+            lookup: dict[str, int] = {}
+            translated = []
+
+            for table in tables:
+                # The code of the missing values points to the last item
+                mapping = np.array(
+                    [
+                        *(
+                            lookup.setdefault(value, len(lookup))
+                            for value in table._categories[column]
+                        ),
+                        -1,
+                    ],
+                    dtype=np.int32,
+                )
+                translated.append(mapping[table._codes[column]])
+
+            codes[column] = np.concatenate(translated)
+            categories[column] = list(lookup)
+
+        return cls(
+            subsonic,
+            entries,
+            np.arange(len(entries), dtype=np.intp),
+            numeric,
+            codes,
+            categories,
+        )
+
+    @classmethod
+    def from_library(
+        cls,
+        subsonic: "Subsonic",
+        page_size: int = 500,
+        music_folder_id: str | None = None,
+    ) -> Self:
+        """Create a table with all the songs of the library, requesting
+        them page by page with an empty search.
+
+        Args:
+            subsonic: The object used to make the requests.
+            page_size: The number of songs to request in every page.
+            music_folder_id: An ID of a music folder to limit where the
+                songs should come from.
+
+        Returns:
+            A table with all the songs of the library.
+        """
+
+        pages: list[SongTable] = []
+
+        while True:
+            page = cls.from_search(
+                subsonic, "", page_size, page_size * len(pages), music_folder_id
+            )
+            pages.append(page)
+
+            if len(page) < page_size:
+                return cls.concat(subsonic, pages)
+
+    @classmethod
+    def from_random_songs(
+        cls,
+        subsonic: "Subsonic",
+        num_of_songs: int | None = None,
+        genre_name: str | None = None,
+        from_year: int | None = None,
+        to_year: int | None = None,
+        music_folder_id: str | None = None,
+    ) -> Self:
+        """Create a table from random songs registered in the server.
+
+        Args:
+            subsonic: The object used to make the request.
+            num_of_songs: The number of songs to return.
+            genre_name: The genre that the songs must have it tagged
+                on them.
+            from_year: The minimum year where the songs were released.
+            to_year: The maximum year where the songs were released.
+            music_folder_id: An ID of a music folder to limit where the
+                songs should be from.
+
+        Returns:
+            A table with the songs randomly selected by the server.
+        """
+
+        response = subsonic.api.json_request(
+            "getRandomSongs",
+            {
+                "size": num_of_songs,
+                "genre": genre_name,
+                "fromYear": from_year,
+                "toYear": to_year,
+                "musicFolderId": music_folder_id,
+            },
+        )["randomSongs"]
+
+        return cls.from_entries(subsonic, response.get("song", []))
+
+    @classmethod
+    def from_songs_by_genre(
+        cls,
+        subsonic: "Subsonic",
+        genre_name: str,
+        num_of_songs: int | None = None,
+        song_list_offset: int | None = None,
+        music_folder_id: str | None = None,
+    ) -> Self:
+        """Create a table from the songs tagged with the given genre.
+
+        Args:
+            subsonic: The object used to make the request.
+            genre_name: The name of the genre that all the songs must
+                be tagged with.
+            num_of_songs: The number of songs that the table should have.
+            song_list_offset: the number of songs to offset in the list,
+                useful for pagination.
+            music_folder_id: An ID of a music folder where all the songs
+                should be from.
+
+        Returns:
+            A table with the songs tagged with the given genre.
+        """
+
+        response = subsonic.api.json_request(
+            "getSongsByGenre",
+            {
+                "genre": genre_name,
+                "count": num_of_songs,
+                "offset": song_list_offset,
+                "musicFolderId": music_folder_id,
+            },
+        )["songsByGenre"]
+
+        return cls.from_entries(subsonic, response.get("song", []))
+
+    @classmethod
+    def from_search(
+        cls,
+        subsonic: "Subsonic",
+        query: str = "",
+        song_count: int | None = None,
+        song_offset: int | None = None,
+        music_folder_id: str | None = None,
+    ) -> Self:
+        """Create a table from the songs whose title match the given
+        query, organized according ID3 tags.
+
+        Args:
+            subsonic: The object used to make the request.
+            query: The query string to be send to the server, an empty
+                one matches all the songs in most servers.
+            song_count: The numbers of songs that the server should return.
+            song_offset: The number of songs to offset in the list,
+                useful for pagination.
+            music_folder_id: An ID of a music folder to limit where the
+                songs should come from.
+
+        Returns:
+            A table with the found songs.
+        """
+
+        response = subsonic.api.json_request(
+            "search3",
+            {
+                "query": query,
+                "songCount": song_count,
+                "songOffset": song_offset,
+                "albumCount": 0,
+                "artistCount": 0,
+                "musicFolderId": music_folder_id,
+            },
+        )["searchResult3"]
+
+        return cls.from_entries(subsonic, response.get("song", []))
+
+    @classmethod
+    def from_album(cls, subsonic: "Subsonic", album_id: str) -> Self:
+        """Create a table from the songs of an album.
+
+        Args:
+            subsonic: The object used to make the request.
+            album_id: The ID of the album.
+
+        Returns:
+            A table with the songs of the album.
+        """
+
+        response = subsonic.api.json_request("getAlbum", {"id": album_id})["album"]
+
+        return cls.from_entries(subsonic, response.get("song", []))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, column: str) -> npt.NDArray[Any]:
+        """Get the values of a column.
+
+        Args:
+            column: The name of the column.
+
+        Returns:
+            The values of the column, the strings of a categorical
+                column are decoded to an array of objects.
+        """
+
+        if column in self._numeric:
+            return self._numeric[column]
+
+        if column not in self._codes:
+            raise KeyError(f"'{column}' is not a column")
+
+        return self._decode(column, self.codes(column))
+
+    def codes(self, column: str) -> npt.NDArray[np.int32]:
+        """Get the codes of a categorical column, faster to compare than
+        its decoded values.
+
+        Args:
+            column: The name of the categorical column.
+
+        Returns:
+            The index in the categories of the value of every song,
+                `-1` if it is missing.
+        """
+
+        if column not in self._codes:
+            raise KeyError(f"'{column}' is not a categorical column")
+
+        return self._codes[column]
+
+    def categories(self, column: str) -> list[str]:
+        """Get the values the codes of a categorical column point to.
+
+        Args:
+            column: The name of the categorical column.
+
+        Returns:
+            The different values of the column, some of them may not be
+                used anymore by the songs of a filtered table.
+        """
+
+        self.codes(column)
+
+        return self._categories[column]
+
+    def is_in(self, column: str, values: Iterable[str]) -> npt.NDArray[np.bool_]:
+        """Check which songs have one of the given values in a
+        categorical column, to be used with `filter`.
+
+        Args:
+            column: The name of the categorical column.
+            values: The values to look for.
+
+        Returns:
+            If the value of every song is one of the given ones.
+        """
+
+        lookup = {value: code for code, value in enumerate(self.categories(column))}
+        wanted = [lookup[value] for value in values if value in lookup]
+
+        return np.isin(self.codes(column), wanted)
+
+    def filter(self, mask: npt.NDArray[np.bool_]) -> "SongTable":
+        """Get the songs that match a condition.
+
+        Args:
+            mask: If every song should be kept, e.g.
+                `table["year"] >= 2000`.
+
+        Returns:
+            A new table with only the matching songs.
+        """
+
+        return self._take(np.flatnonzero(mask))
+
+    def sort(self, column: str, descending: bool = False) -> "SongTable":
+        """Sort the songs by a column, keeping the order of the songs
+        with the same value. Missing values are always the last ones.
+
+        Args:
+            column: The name of the column to sort by, categorical
+                columns are sorted by their values.
+            descending: If the biggest values should be first.
+
+        Returns:
+            A new table with the sorted songs.
+        """
+
+        if column in self._numeric:
+            keys = self._numeric[column]
+            missing = np.isnan(keys)
+        else:
+            categories = self.categories(column)
+
+            # Sort by the rank of the value instead of its code, the
+            # extra rank is the one of the missing values
+            ranks = np.zeros(len(categories) + 1)
+            ranks[np.argsort(np.array(categories, dtype=str), kind="stable")] = (
+                np.arange(len(categories))
+            )
+
+            codes = self.codes(column)
+            keys = ranks[codes]
+            missing = codes == -1
+
+        keys = np.where(missing, 0, -keys if descending else keys)
+
+        return self._take(np.lexsort((keys, missing)))
+
+    def sum(self, column: str) -> float:
+        """Add all the values of a numeric column, ignoring the
+        missing ones.
+
+        Args:
+            column: The name of the numeric column.
+
+        Returns:
+            The sum of all the values.
+        """
+
+        return float(np.nansum(self._numeric[column]))
+
+    def group_by(
+        self,
+        key: str,
+        column: str | None = None,
+        aggregation: Aggregation = "sum",
+    ) -> dict[str, float]:
+        """Aggregate a numeric column for every value of a categorical one.
+
+        Args:
+            key: The name of the categorical column to group by.
+            column: The name of the numeric column to aggregate, only
+                needed if the aggregation is not a count.
+            aggregation: How the values of every group are aggregated,
+                missing values are ignored.
+
+        Returns:
+            The aggregated value of every group, the songs without a
+                value in the key column are ignored.
+        """
+
+        codes = self.codes(key)
+        categories = self.categories(key)
+        present = codes != -1
+        size = len(categories)
+
+        if aggregation == "count" and column is None:
+            totals = np.bincount(codes[present], minlength=size).astype(np.float64)
+            used = totals > 0
+        else:
+            if column is None:
+                raise ValueError(
+                    f"A column is needed to aggregate with '{aggregation}'"
+                )
+
+            values = self._numeric[column]
+            valid = present & ~np.isnan(values)
+            counts = np.bincount(codes[valid], minlength=size)
+            totals = (
+                np.bincount(codes[valid], weights=values[valid], minlength=size)
+                if aggregation != "count"
+                else counts.astype(np.float64)
+            )
+
+            if aggregation == "mean":
+                totals = totals / np.maximum(counts, 1)
+
+            used = np.bincount(codes[present], minlength=size) > 0
+
+        return {categories[code]: float(totals[code]) for code in np.flatnonzero(used)}
+
+    def ids(self) -> list[str]:
+        """Get the IDs of all the songs of the table.
+
+        Returns:
+            The IDs in the order of the table.
+        """
+
+        return [entry["id"] for entry in self._selected_entries()]
+
+    def song(self, index: int) -> Song:
+        """Create the song object of a row of the table.
+
+        Args:
+            index: The position of the song in the table.
+
+        Returns:
+            The song at the given position.
+        """
+
+        return Song(subsonic=self.subsonic, **self._entries[self._rows[index]])
+
+    def to_songs(self) -> list[Song]:
+        """Create the song objects of all the songs of the table.
+
+        Returns:
+            All the songs in the order of the table.
+        """
+
+        return [
+            Song(subsonic=self.subsonic, **entry) for entry in self._selected_entries()
+        ]
+
+    def _selected_entries(self) -> list[dict[str, Any]]:
+        """Get the songs of the table as sent by the server.
+
+        Returns:
+            The entries of the songs in the order of the table.
+        """
+
+        return [self._entries[row] for row in self._rows]
+
+    def _take(self, indices: npt.NDArray[np.intp]) -> "SongTable":
+        """Create a new table with some of the songs of this one.
+
+        Args:
+            indices: The positions of the songs to keep, in the order
+                they should have.
+
+        Returns:
+            A new table sharing the entries and categories of this one.
+        """
+
+        return SongTable(
+            self.subsonic,
+            self._entries,
+            self._rows[indices],
+            {column: values[indices] for column, values in self._numeric.items()},
+            {column: codes[indices] for column, codes in self._codes.items()},
+            self._categories,
+        )
+
+    def _decode(
+        self, column: str, codes: npt.NDArray[np.int32]
+    ) -> npt.NDArray[np.object_]:
+        """Convert the codes of a categorical column to their values.
+
+        Args:
+            column: The name of the categorical column.
+            codes: The codes to convert.
+
+        Returns:
+            The values of the codes, `None` for the missing ones.
+        """
+
+        # The code of the missing values points to the last item
+        lookup = np.array([*self._categories[column], None], dtype=object)
+
+        return lookup[codes]
@@ -0,0 +1,202 @@
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, TypeVar
+
+from ._concurrency import ContextThreadPoolExecutor
+from .models._album import Album
+from .models._artist import Artist
+from .models._song import Song
+from .models._starred_content import StarredContent
+
+if TYPE_CHECKING:
+    from ._subsonic import Subsonic
+
+Entry = TypeVar("Entry")
+
+
+class StarredChanges(NamedTuple):
+    """The changes in the starred content of a user between two polls.
+
+    Attributes:
+        username: The name of the user that owns the starred content.
+        added_songs: The songs starred since the last poll.
+        removed_songs: The songs unstarred since the last poll, as they
+            were in the last poll.
+        added_albums: The albums starred since the last poll.
+        removed_albums: The albums unstarred since the last poll, as they
+            were in the last poll.
+        added_artists: The artists starred since the last poll.
+        removed_artists: The artists unstarred since the last poll, as they
+            were in the last poll.
+    """
+
+    username: str
+    added_songs: list[Song]
+    removed_songs: list[Song]
+    added_albums: list[Album]
+    removed_albums: list[Album]
+    added_artists: list[Artist]
+    removed_artists: list[Artist]
+
+    @property
+    def has_changes(self) -> bool:
+        """If anything has been starred or unstarred since the last poll."""
+
+        return any(self[1:])
+
+
+class _Snapshot(NamedTuple):
+    """The starred content of a user indexed by ID."""
+
+    songs: dict[str, Song]
+    albums: dict[str, Album]
+    artists: dict[str, Artist]
+
+
+class StarredTracker:
+    """Object that keeps the last known starred content of every user and
+    reports what has been starred and unstarred since then, so only the
+    changes need to be processed.
+
+    The first poll of each user reports all their starred content
+    as added.
+
+    Attributes:
+        music_folder_id: The ID of the music folder the starred content
+            should be from, all of them if it is `None`.
+    """
+
+    def __init__(self, music_folder_id: str | None = None) -> None:
+        """Create a new tracker without any known starred content.
+
+        Args:
+            music_folder_id: The ID of the music folder the starred content
+                should be from, all of them if it is `None`.
+        """
+
+        self.music_folder_id = music_folder_id
+
+        self._snapshots: dict[str, _Snapshot] = {}
+        self._subscribers: list[Callable[[StarredChanges], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self, callback: Callable[[StarredChanges], None]
+    ) -> Callable[[], None]:
+        """Register a function to be called every time a poll finds changes
+        in the starred content of a user.
+
+        Args:
+            callback: The function to call with the found changes.
+
+        Returns:
+            A function that unregisters the callback when called.
+        """
+
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def poll(self, subsonic: "Subsonic") -> StarredChanges:
+        """Get the starred content of the user authenticated in the given
+        object and compare it with the last known one.
+
+        Args:
+            subsonic: The object used to get the starred content, the
+                snapshot is stored under the name of its user.
+
+        Returns:
+            The changes since the last poll of the same user.
+        """
+
+        username = subsonic.api.username
+        starred = subsonic.lists.get_starred(self.music_folder_id)
+
+        snapshot = _index(starred)
+
+        with self._lock:
+            previous = self._snapshots.get(username, _Snapshot({}, {}, {}))
+            self._snapshots[username] = snapshot
+            subscribers = list(self._subscribers)
+
+        changes = StarredChanges(
+            username,
+            *_diff(previous.songs, snapshot.songs),
+            *_diff(previous.albums, snapshot.albums),
+            *_diff(previous.artists, snapshot.artists),
+        )
+
+        if changes.has_changes:
+            for callback in subscribers:
+                callback(changes)
+
+        return changes
+
+    def poll_all(
+        self, clients: Iterable["Subsonic"], max_workers: int = 8
+    ) -> list[StarredChanges]:
+        """Poll the starred content of many users concurrently.
+
+        Args:
+            clients: An object authenticated as each user to poll.
+            max_workers: The maximum number of users polled at the
+                same time.
+
+        Returns:
+            The changes of every user, in the same order as the clients.
+        """
+
+        with ContextThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(self.poll, clients))
+
+    def forget(self, username: str) -> None:
+        """Remove the last known starred content of a user, so their next
+        poll reports everything as added.
+
+        Args:
+            username: The name of the user to forget.
+        """
+
+        with self._lock:
+            self._snapshots.pop(username, None)
+
+
+def _index(starred: StarredContent) -> _Snapshot:
+    """Index the starred content by ID.
+
+    Args:
+        starred: The starred content to index.
+
+    Returns:
+        The songs, albums and artists indexed by their IDs.
+    """
+
+    return _Snapshot(
+        {song.id: song for song in starred.songs or []},
+        {album.id: album for album in starred.albums or []},
+        {artist.id: artist for artist in starred.artists or []},
+    )
+
+
+def _diff(
+    previous: dict[str, Entry], current: dict[str, Entry]
+) -> tuple[list[Entry], list[Entry]]:
+    """Compare two indexed collections of starred entries.
+
+    Args:
+        previous: The entries of the last poll.
+        current: The entries of the current poll.
+
+    Returns:
+        The entries added and the entries removed.
+    """
+
+    added = [entry for id_, entry in current.items() if id_ not in previous]
+    removed = [entry for id_, entry in previous.items() if id_ not in current]
+
+    return added, removed
@@ -0,0 +1,626 @@
+import hashlib
+import io
+import os
+import threading
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+    from ._subsonic import Subsonic
+
+# Parameters that change in every generated URL without changing the
+# requested content, so they are not part of the keys of the cache
+_AUTH_PARAMS = frozenset({"u", "p", "t", "s", "c", "v", "f"})
+
+
+class Segment(NamedTuple):
+    """A part of a streamed song or video that is fetched on its own.
+
+    Attributes:
+        url: The URL the segment is fetched from.
+        duration: The seconds of media in the segment, `None` if unknown.
+        byte_range: The offset and length of the segment inside the file
+            pointed by its URL, `None` if it is the whole file.
+    """
+
+    url: str
+    duration: float | None = None
+    byte_range: tuple[int, int] | None = None
+
+    @property
+    def size(self) -> int | None:
+        """The length in bytes of the segment, `None` if unknown."""
+
+        return self.byte_range[1] if self.byte_range is not None else None
+
+
+class StreamCache:
+    """Object that fetches the segments of streams ahead of the reader and
+    keeps them in a directory, so the listeners of the same song share
+    a single upstream fetch of every segment and seeks are instant.
+
+    The least recently used segments are deleted when the size of the
+    directory exceeds the budget.
+
+    Attributes:
+        directory: The directory where the segments are stored.
+        max_size: The maximum bytes stored in the directory.
+        prefetch: The number of segments fetched ahead of the one
+            being read.
+        segment_size: The bytes of each segment of the non HLS streams.
+        hits: The number of segments read from the directory.
+        misses: The number of segments fetched from the server.
+    """
+
+    def __init__(
+        self,
+        subsonic: "Subsonic",
+        directory: Path,
+        max_size: int = 512 * 1024 * 1024,
+        prefetch: int = 3,
+        max_workers: int = 4,
+        segment_size: int = 256 * 1024,
+    ) -> None:
+        """Create a new cache, the segments already stored in the directory
+        by a previous one are reused.
+
+        Args:
+            subsonic: The object used to generate the URLs of the streams.
+            directory: The directory where the segments should be stored,
+                it is created if it does not exist.
+            max_size: The maximum bytes to store in the directory.
+            prefetch: The number of segments to fetch ahead of the one
+                being read.
+            max_workers: The maximum number of segments fetched at the
+                same time.
+            segment_size: The bytes of each segment of the non HLS streams,
+                that are fetched with HTTP range requests.
+        """
+
+        self.subsonic = subsonic
+        self.directory = directory
+        self.max_size = max_size
+        self.prefetch = prefetch
+        self.segment_size = segment_size
+        self.hits = 0
+        self.misses = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._in_flight: dict[str, Future[bytes]] = {}
+        self._stream_sizes: dict[str, int | None] = {}
+
+        # Stored segments by filename, from the least to the most recently used
+        self._stored: OrderedDict[str, int] = OrderedDict()
+        self._stored_size = 0
+
+        for path in sorted(
+            (path for path in self.directory.iterdir() if path.suffix == ".segment"),
+            key=lambda path: path.stat().st_mtime,
+        ):
+            self._stored[path.name] = path.stat().st_size
+            self._stored_size += path.stat().st_size
+
+    def open_hls(
+        self,
+        song_or_video_id: str,
+        custom_bitrates: list[str] | None = None,
+        audio_track_id: str | None = None,
+    ) -> "StreamReader":
+        """Open the HLS stream of a song or video, following the first
+        variant if the server returns a variant playlist.
+
+        Args:
+            song_or_video_id: The ID of the song or video to stream.
+            custom_bitrates: The bitrate that the server should try to
+                limit the stream to.
+            audio_track_id: The ID of an audio track to be added to the
+                stream if video is being streamed.
+
+        Returns:
+            A reader of the segments of the stream.
+        """
+
+        import requests
+
+        url = self.subsonic.media_retrieval.hls(
+            song_or_video_id, custom_bitrates, audio_track_id
+        )
+
+        response = requests.get(url)
+        response.raise_for_status()
+        segments, variants = _parse_m3u8(response.text, url)
+
+        if not segments and variants:
+            response = requests.get(variants[0])
+            response.raise_for_status()
+            segments, _ = _parse_m3u8(response.text, variants[0])
+
+        return StreamReader(self, segments)
+
+    def open_stream(
+        self,
+        song_or_video_id: str,
+        max_bitrate_rate: int | None = None,
+        stream_format: str | None = None,
+    ) -> "StreamReader":
+        """Open the stream of a song or video, fetching it in segments
+        of `segment_size` bytes with HTTP range requests.
+
+        Args:
+            song_or_video_id: The ID of the song or video to stream.
+            max_bitrate_rate: The max bitrate the stream should have.
+            stream_format: The format the song or video should be.
+
+        Returns:
+            A reader of the segments of the stream.
+        """
+
+        url = self.subsonic.media_retrieval.stream(
+            song_or_video_id, max_bitrate_rate, stream_format
+        )
+        key = _cache_key(url)
+
+        with self._lock:
+            known = key in self._stream_sizes
+            size = self._stream_sizes.get(key)
+
+        if not known:
+            # The first segment is fetched to learn the size of the stream
+            first = Segment(url, byte_range=(0, self.segment_size))
+            size = self._fetch_size(first)
+
+            with self._lock:
+                self._stream_sizes[key] = size
+
+        if size is None:
+            return StreamReader(self, [Segment(url)])
+
+        return StreamReader(
+            self,
+            [
+                Segment(url, byte_range=(start, min(self.segment_size, size - start)))
+                for start in range(0, size, self.segment_size)
+            ],
+        )
+
+    def _fetch_size(self, segment: Segment) -> int | None:
+        """Fetch and store a segment of a stream, returning the
+        total size of the stream.
+
+        Args:
+            segment: The segment to fetch.
+
+        Returns:
+            The size of the whole stream, `None` if the server
+                does not support range requests.
+        """
+
+        import requests
+
+        assert segment.byte_range is not None
+        start, length = segment.byte_range
+
+        with self._lock:
+            self.misses += 1
+
+        response = requests.get(
+            segment.url, headers={"Range": f"bytes={start}-{start + length - 1}"}
+        )
+        response.raise_for_status()
+
+        if response.status_code != 206:
+            self._store(_filename(Segment(segment.url)), response.content)
+            return None
+
+        size = int(response.headers["Content-Range"].rpartition("/")[2])
+        self._store(
+            _filename(segment._replace(byte_range=(start, min(length, size)))),
+            response.content,
+        )
+
+        return size
+
+    def get(self, segments: list[Segment], index: int) -> bytes:
+        """Get the content of a segment, fetching it if needed, and start
+        fetching the next ones in the background.
+
+        Args:
+            segments: All the segments of the stream.
+            index: The index of the segment to get.
+
+        Returns:
+            The content of the segment.
+        """
+
+        segment = segments[index]
+        filename = _filename(segment)
+
+        for next_segment in segments[index + 1 : index + 1 + self.prefetch]:
+            self._request(next_segment, _filename(next_segment))
+
+        with self._lock:
+            stored = filename in self._stored
+
+            if stored:
+                self._stored.move_to_end(filename)
+
+        if stored:
+            try:
+                content = (self.directory / filename).read_bytes()
+            except FileNotFoundError:
+                # Deleted from outside the cache, so fetch it again
+                with self._lock:
+                    self._stored_size -= self._stored.pop(filename, 0)
+            else:
+                with self._lock:
+                    self.hits += 1
+
+                return content
+
+        future = self._request(segment, filename)
+        assert future is not None
+
+        return future.result()
+
+    def fetch(self, segments: list[Segment]) -> list["Future[bytes]"]:
+        """Start fetching in the background all the given segments that
+        are not stored yet.
+
+        Args:
+            segments: The segments to fetch.
+
+        Returns:
+            A future for every segment being fetched.
+        """
+
+        futures = [self._request(segment, _filename(segment)) for segment in segments]
+
+        return [future for future in futures if future is not None]
+
+    def _request(self, segment: Segment, filename: str) -> "Future[bytes] | None":
+        """Start fetching a segment if it is not stored, reusing the fetch
+        already in flight for it if any.
+
+        Args:
+            segment: The segment to fetch.
+            filename: The name of the file where it should be stored.
+
+        Returns:
+            A future that resolves to the content of the segment, `None` if
+                it is already stored.
+        """
+
+        with self._lock:
+            if filename in self._in_flight:
+                return self._in_flight[filename]
+
+            if filename in self._stored:
+                return None
+
+            self.misses += 1
+            future = self._executor.submit(self._fetch, segment, filename)
+            self._in_flight[filename] = future
+
+        return future
+
+    def _fetch(self, segment: Segment, filename: str) -> bytes:
+        """Fetch a segment from the server and store it.
+
+        Args:
+            segment: The segment to fetch.
+            filename: The name of the file where it should be stored.
+
+        Returns:
+            The content of the segment.
+        """
+
+        import requests
+
+        try:
+            headers = {}
+            if segment.byte_range is not None:
+                start, length = segment.byte_range
+                headers["Range"] = f"bytes={start}-{start + length - 1}"
+
+            response = requests.get(segment.url, headers=headers)
+            response.raise_for_status()
+
+            content = response.content
+
+            # The server has ignored the range and sent the whole file
+            if segment.byte_range is not None and response.status_code != 206:
+                content = content[start : start + length]
+
+            self._store(filename, content)
+
+            return content
+        finally:
+            with self._lock:
+                self._in_flight.pop(filename, None)
+
+    def _store(self, filename: str, content: bytes) -> None:
+        """Save a segment in the directory and delete the least recently
+        used ones if the budget is exceeded.
+
+        Args:
+            filename: The name of the file of the segment.
+            content: The content of the segment.
+        """
+
+        path = self.directory / filename
+        temporal_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+
+        temporal_path.write_bytes(content)
+        os.replace(temporal_path, path)
+
+        with self._lock:
+            self._stored_size += len(content) - self._stored.pop(filename, 0)
+            self._stored[filename] = len(content)
+
+            evicted = []
+            while self._stored_size > self.max_size and self._stored:
+                evicted_filename, size = self._stored.popitem(last=False)
+                self._stored_size -= size
+                evicted.append(evicted_filename)
+
+        for evicted_filename in evicted:
+            (self.directory / evicted_filename).unlink(missing_ok=True)
+
+    @property
+    def size(self) -> int:
+        """The bytes currently stored in the directory."""
+
+        with self._lock:
+            return self._stored_size
+
+    def close(self) -> None:
+        """Wait for the fetches in flight and stop the workers."""
+
+        self._executor.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class StreamReader(io.RawIOBase):
+    """Binary file-like object that reads a stream segment by segment
+    from a `StreamCache`.
+
+    Attributes:
+        segments: The segments of the stream, in order.
+    """
+
+    def __init__(self, cache: StreamCache, segments: list[Segment]) -> None:
+        """Create a new reader positioned at the start of the stream.
+
+        Args:
+            cache: The cache used to get the segments.
+            segments: The segments of the stream, in order.
+        """
+
+        super().__init__()
+
+        self.segments = segments
+
+        self._cache = cache
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+
+        # The content of the segment being read, to not get it in every read
+        self._content: tuple[int, bytes] | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return all(segment.size is not None for segment in self.segments)
+
+    def readinto(self, buffer: "WriteableBuffer") -> int:
+        view = memoryview(buffer).cast("B")
+
+        while self._index < len(self.segments):
+            if self._content is None or self._content[0] != self._index:
+                self._content = (
+                    self._index,
+                    self._cache.get(self.segments, self._index),
+                )
+
+            content = self._content[1]
+
+            if self._offset < len(content):
+                read = min(len(view), len(content) - self._offset)
+                view[:read] = content[self._offset : self._offset + read]
+
+                self._offset += read
+                self._position += read
+
+                return read
+
+            self._index += 1
+            self._offset = 0
+
+        return 0
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position of the stream, only the segments from there
+        are fetched.
+
+        Args:
+            offset: The offset of the position.
+            whence: What the offset is relative to.
+
+        Raises:
+            io.UnsupportedOperation: Raised if the size of the segments
+                is not known.
+
+        Returns:
+            The new absolute position.
+        """
+
+        if not self.seekable():
+            raise io.UnsupportedOperation("The size of the segments is not known")
+
+        sizes = [segment.size or 0 for segment in self.segments]
+
+        match whence:
+            case io.SEEK_CUR:
+                position = self._position + offset
+            case io.SEEK_END:
+                position = sum(sizes) + offset
+            case io.SEEK_SET | _:
+                position = offset
+
+        self._position = max(position, 0)
+        self._index, self._offset = len(sizes), 0
+
+        start = 0
+        for index, size in enumerate(sizes):
+            if self._position < start + size:
+                self._index, self._offset = index, self._position - start
+                break
+
+            start += size
+
+        return self._position
+
+    def seek_time(self, seconds: float) -> int:
+        """Move to the segment that contains a given time of the stream.
+
+        Args:
+            seconds: The time to move to.
+
+        Raises:
+            io.UnsupportedOperation: Raised if the duration of the segments
+                is not known.
+
+        Returns:
+            The index of the segment moved to.
+        """
+
+        if any(segment.duration is None for segment in self.segments):
+            raise io.UnsupportedOperation("The duration of the segments is not known")
+
+        start = 0.0
+        self._index = len(self.segments)
+
+        for index, segment in enumerate(self.segments):
+            if seconds < start + (segment.duration or 0):
+                self._index = index
+                break
+
+            start += segment.duration or 0
+
+        self._offset = 0
+        self._position = sum(
+            segment.size or 0 for segment in self.segments[: self._index]
+        )
+
+        return self._index
+
+
+def _parse_m3u8(text: str, base_url: str) -> tuple[list[Segment], list[str]]:
+    """Parse an HLS playlist.
+
+    Args:
+        text: The content of the playlist.
+        base_url: The URL the playlist was fetched from, used to resolve
+            the relative URLs.
+
+    Returns:
+        The segments of a media playlist and the URLs of the variants
+            of a variant playlist.
+    """
+
+    segments: list[Segment] = []
+    variants: list[str] = []
+
+    duration: float | None = None
+    byte_range: tuple[int, int] | None = None
+    is_variant = False
+    ends: dict[str, int] = {}
+
+    for line in text.splitlines():
+        line = line.strip()
+
+        if not line:
+            continue
+
+        if line.startswith("#EXTINF:"):
+            duration = float(line.removeprefix("#EXTINF:").partition(",")[0])
+
+        elif line.startswith("#EXT-X-BYTERANGE:"):
+            length, _, offset = line.removeprefix("#EXT-X-BYTERANGE:").partition("@")
+            byte_range = (int(offset) if offset else -1, int(length))
+
+        elif line.startswith("#EXT-X-STREAM-INF"):
+            is_variant = True
+
+        elif not line.startswith("#"):
+            url = urllib.parse.urljoin(base_url, line)
+
+            if is_variant:
+                variants.append(url)
+                is_variant = False
+                continue
+
+            # Without an offset the range starts where the last one ended
+            if byte_range is not None and byte_range[0] == -1:
+                byte_range = (ends.get(url, 0), byte_range[1])
+
+            if byte_range is not None:
+                ends[url] = byte_range[0] + byte_range[1]
+
+            segments.append(Segment(url, duration, byte_range))
+            duration, byte_range = None, None
+
+    return segments, variants
+
+
+def _cache_key(url: str) -> str:
+    """Get the part of an URL that identifies the requested content.
+
+    Args:
+        url: The URL to identify.
+
+    Returns:
+        The URL without the authentication parameters.
+    """
+
+    parsed = urllib.parse.urlparse(url)
+    query = sorted(
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parsed.query)
+        if key not in _AUTH_PARAMS
+    )
+
+    return parsed._replace(query=urllib.parse.urlencode(query)).geturl()
+
+
+def _filename(segment: Segment) -> str:
+    """Get the name of the file where a segment is stored.
+
+    Args:
+        segment: The segment to name.
+
+    Returns:
+        A name unique to the content of the segment.
+    """
+
+    key = f"{_cache_key(segment.url)}#{segment.byte_range}"
+
+    return hashlib.sha256(key.encode("utf-8")).hexdigest() + ".segment"
@@ -1,19 +1,28 @@
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
 from ._api import Api, RequestMethod
-from ._bookmarks import Bookmarks
-from ._browsing import Browsing
-from ._chat import Chat
-from ._internet_radio import InternetRadio
-from ._jukebox import JukeboxControl
-from ._lists import Lists
-from ._media_annotation import MediaAnnotation
-from ._media_library_scanning import MediaLibraryScanning
-from ._media_retrieval import MediaRetrieval
-from ._playlists import Playlists
-from ._podcast import Podcast
-from ._searching import Searching
-from ._sharing import Sharing
-from ._system import System
-from ._user_management import UserManagement
+from ._identity_map import IdentityMap
+from ._profiler import Profiler
+
+if TYPE_CHECKING:
+    from ._bookmarks import Bookmarks
+    from ._browsing import Browsing
+    from ._chat import Chat
+    from ._internet_radio import InternetRadio
+    from ._jukebox import JukeboxControl
+    from ._lists import Lists
+    from ._media_annotation import MediaAnnotation
+    from ._media_library_scanning import MediaLibraryScanning
+    from ._media_retrieval import MediaRetrieval
+    from ._playlists import Playlists
+    from ._podcast import Podcast
+    from ._searching import Searching
+    from ._sharing import Sharing
+    from ._system import System
+    from ._user_management import UserManagement
+
+Helper = TypeVar("Helper")
 
 
 class Subsonic:
@@ -25,6 +34,10 @@ class Subsonic:
     [categories listed in the OpenSubsonic REST API Spec](https://opensubsonic.
     netlify.app/categories/).
 
+    The helper objects are only created, and their modules imported, the
+    first time they are accessed, so the startup cost is only paid for the
+    endpoints really in use.
+
     Attributes:
         api: Helper object used to directly access the REST API of the given
             server.
@@ -50,6 +63,10 @@ class Subsonic:
             endpoints.
         media_library_scanning: Helper object used to access all media
             library scanning related endpoints.
+        profiler: Object that holds the timings of all the calls made to
+            the helper objects, only available if profiling is enabled.
+        identity_map: Object that keeps a single instance of every model
+            with the same type and ID, only available if enabled.
     """
 
     def __init__(
@@ -61,6 +78,8 @@ class Subsonic:
         use_https: bool = True,
         use_token: bool = True,
         request_method: RequestMethod = RequestMethod.GET,
+        profile: bool = False,
+        identity_map: bool = False,
     ) -> None:
         """Construction method of the Subsonic object used to
         interact with the OpenSubsonic REST API.
@@ -76,23 +95,173 @@ class Subsonic:
                 using a salted token or in plain text.
             request_method: If the requests should be made
                 using a GET verb or a POST verb.
+            profile: If the time spent in the network, decoding the
+                responses and building the models should be recorded
+                for every call made to the helper objects.
+            identity_map: If the models with the same type and ID should
+                be the same object, merging the info of every response
+                where they are found.
         """
 
-        self.api = Api(
-            url, user, password, client, use_https, use_token, request_method
+        self._setup(profile, identity_map)
+
+        self.api: Api = Api(
+            url,
+            user,
+            password,
+            client,
+            use_https,
+            use_token,
+            request_method,
+            self.profiler,
         )
-        self.system = System(self.api, self)
-        self.browsing = Browsing(self.api, self)
-        self.lists = Lists(self.api, self)
-        self.searching = Searching(self.api, self)
-        self.playlists = Playlists(self.api, self)
-        self.media_retrieval = MediaRetrieval(self.api, self)
-        self.media_annotation = MediaAnnotation(self.api, self)
-        self.sharing = Sharing(self.api, self)
-        self.podcast = Podcast(self.api, self)
-        self.jukebox = JukeboxControl(self.api, self)
-        self.internet_radio = InternetRadio(self.api, self)
-        self.chat = Chat(self.api, self)
-        self.user_management = UserManagement(self.api, self)
-        self.bookmarks = Bookmarks(self.api, self)
-        self.media_library_scanning = MediaLibraryScanning(self.api, self)
+
+    def _setup(self, profile: bool, identity_map: bool) -> None:
+        """Create the objects shared by all the helper objects, used by
+        every way the object can be built.
+
+        Args:
+            profile: If the calls made to the helper objects should
+                be recorded.
+            identity_map: If the models with the same type and ID should
+                be the same object.
+        """
+
+        self.profiler = Profiler() if profile else None
+        self.identity_map = IdentityMap() if identity_map else None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the configuration of the object, the helper objects, the
+        profiler and the identity map are created again when unpickled.
+
+        Returns:
+            The state to pickle.
+        """
+
+        return {
+            "api": self.api,
+            "profile": self.profiler is not None,
+            "identity_map": self.identity_map is not None,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the object from its pickled configuration.
+
+        Args:
+            state: The pickled state.
+        """
+
+        self._setup(state["profile"], state["identity_map"])
+
+        self.api = state["api"]
+        self.api.profiler = self.profiler
+
+    def _create_helper(
+        self, helper_class: Callable[[Api, "Subsonic"], Helper]
+    ) -> Helper:
+        """Create a new helper object bound to this object, instrumenting it
+        if profiling is enabled.
+
+        Args:
+            helper_class: The class of the helper object to create.
+
+        Returns:
+            The created helper object.
+        """
+
+        helper = helper_class(self.api, self)
+
+        if self.profiler is not None:
+            self.profiler.instrument(helper)
+
+        return helper
+
+    @cached_property
+    def system(self) -> "System":
+        from ._system import System
+
+        return self._create_helper(System)
+
+    @cached_property
+    def browsing(self) -> "Browsing":
+        from ._browsing import Browsing
+
+        return self._create_helper(Browsing)
+
+    @cached_property
+    def lists(self) -> "Lists":
+        from ._lists import Lists
+
+        return self._create_helper(Lists)
+
+    @cached_property
+    def searching(self) -> "Searching":
+        from ._searching import Searching
+
+        return self._create_helper(Searching)
+
+    @cached_property
+    def playlists(self) -> "Playlists":
+        from ._playlists import Playlists
+
+        return self._create_helper(Playlists)
+
+    @cached_property
+    def media_retrieval(self) -> "MediaRetrieval":
+        from ._media_retrieval import MediaRetrieval
+
+        return self._create_helper(MediaRetrieval)
+
+    @cached_property
+    def media_annotation(self) -> "MediaAnnotation":
+        from ._media_annotation import MediaAnnotation
+
+        return self._create_helper(MediaAnnotation)
+
+    @cached_property
+    def sharing(self) -> "Sharing":
+        from ._sharing import Sharing
+
+        return self._create_helper(Sharing)
+
+    @cached_property
+    def podcast(self) -> "Podcast":
+        from ._podcast import Podcast
+
+        return self._create_helper(Podcast)
+
+    @cached_property
+    def jukebox(self) -> "JukeboxControl":
+        from ._jukebox import JukeboxControl
+
+        return self._create_helper(JukeboxControl)
+
+    @cached_property
+    def internet_radio(self) -> "InternetRadio":
+        from ._internet_radio import InternetRadio
+
+        return self._create_helper(InternetRadio)
+
+    @cached_property
+    def chat(self) -> "Chat":
+        from ._chat import Chat
+
+        return self._create_helper(Chat)
+
+    @cached_property
+    def user_management(self) -> "UserManagement":
+        from ._user_management import UserManagement
+
+        return self._create_helper(UserManagement)
+
+    @cached_property
+    def bookmarks(self) -> "Bookmarks":
+        from ._bookmarks import Bookmarks
+
+        return self._create_helper(Bookmarks)
+
+    @cached_property
+    def media_library_scanning(self) -> "MediaLibraryScanning":
+        from ._media_library_scanning import MediaLibraryScanning
+
+        return self._create_helper(MediaLibraryScanning)
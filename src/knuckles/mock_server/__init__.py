@@ -0,0 +1,4 @@
+from ._library import SyntheticLibrary
+from ._server import MockServer, MockServerError
+
+__all__ = ["MockServer", "MockServerError", "SyntheticLibrary"]
@@ -0,0 +1,57 @@
+import argparse
+
+from ._library import SyntheticLibrary
+from ._server import MockServer
+
+
+def main() -> None:
+    """Run a mock server until interrupted, configured
+    with command line arguments.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python3 -m knuckles.mock_server",
+        description="Serve a synthetic library with the OpenSubsonic REST API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4533)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--artists", type=int, default=50)
+    parser.add_argument("--albums-per-artist", type=int, default=10)
+    parser.add_argument("--songs-per-album", type=int, default=10)
+    parser.add_argument("--song-size", type=int, default=256 * 1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to delay every response."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Max random seconds added."
+    )
+    arguments = parser.parse_args()
+
+    library = SyntheticLibrary(
+        arguments.artists,
+        arguments.albums_per_artist,
+        arguments.songs_per_album,
+        arguments.song_size,
+        arguments.seed,
+    )
+    server = MockServer(
+        library,
+        arguments.username,
+        arguments.password,
+        arguments.latency,
+        arguments.jitter,
+        arguments.host,
+        arguments.port,
+    )
+
+    print(
+        f"Serving {len(library.songs)} songs at http://{arguments.host}:{arguments.port}"
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+GENRES = [
+    "Jazz",
+    "Rock",
+    "Pop",
+    "Hip-Hop",
+    "Electronic",
+    "Classical",
+    "Blues",
+    "Folk",
+    "Metal",
+    "Soul",
+    "Reggae",
+    "Country",
+    "Funk",
+    "Ambient",
+    "Punk",
+    "Latin",
+]
+
+MOODS = ["slow", "cool", "happy", "sad", "energetic", "calm", "dark", "bright"]
+
+
+class SyntheticLibrary:
+    """Deterministic fake music library with the same shape as the data
+    returned by an OpenSubsonic server.
+
+    All the entries are stored as the JSON dictionaries the server would
+    return, with the artists, albums and songs indexed by their IDs.
+
+    Attributes:
+        artists (dict[str, dict[str, Any]]): All the artists of the library.
+        albums (dict[str, dict[str, Any]]): All the albums of the library,
+            without their songs.
+        songs (dict[str, dict[str, Any]]): All the songs of the library.
+        album_songs (dict[str, list[str]]): The IDs of the songs of each
+            album, in track order.
+        artist_albums (dict[str, list[str]]): The IDs of the albums of each
+            artist.
+        song_size (int): The size in bytes of the file of every song.
+    """
+
+    def __init__(
+        self,
+        num_of_artists: int = 50,
+        albums_per_artist: int = 10,
+        songs_per_album: int = 10,
+        song_size: int = 256 * 1024,
+        seed: int = 0,
+    ) -> None:
+        """Generate a new fake library.
+
+        Args:
+            num_of_artists: The number of artists to generate.
+            albums_per_artist: The number of albums each artist has.
+            songs_per_album: The number of songs each album has.
+            song_size: The size in bytes of the file of every song.
+            seed: The seed used to generate the library, the same seed
+                always generates the same library.
+        """
+
+        self.song_size = song_size
+
+        self.artists: dict[str, dict[str, Any]] = {}
+        self.albums: dict[str, dict[str, Any]] = {}
+        self.songs: dict[str, dict[str, Any]] = {}
+        self.album_songs: dict[str, list[str]] = {}
+        self.artist_albums: dict[str, list[str]] = {}
+
+        generator = random.Random(seed)
+        epoch = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        for artist_index in range(num_of_artists):
+            artist_id = f"ar-{artist_index}"
+            artist_name = f"Artist {artist_index}"
+
+            self.artists[artist_id] = {
+                "id": artist_id,
+                "name": artist_name,
+                "coverArt": artist_id,
+                "albumCount": albums_per_artist,
+                "sortName": artist_name.lower(),
+                "musicBrainzId": _fake_uuid(artist_id),
+                "roles": ["artist", "albumartist"],
+            }
+            self.artist_albums[artist_id] = []
+
+            for album_number in range(albums_per_artist):
+                album_index = artist_index * albums_per_artist + album_number
+                album_id = f"al-{album_index}"
+                album_name = f"Album {album_index}"
+                genre = generator.choice(GENRES)
+                year = generator.randint(1950, 2024)
+                moods = generator.sample(MOODS, 2)
+                created = epoch + timedelta(minutes=album_index)
+
+                self.artist_albums[artist_id].append(album_id)
+                self.album_songs[album_id] = []
+
+                album_duration = 0
+
+                for track in range(1, songs_per_album + 1):
+                    song_index = album_index * songs_per_album + track - 1
+                    song_id = f"so-{song_index}"
+                    duration = generator.randint(60, 600)
+                    album_duration += duration
+
+                    self.album_songs[album_id].append(song_id)
+                    self.songs[song_id] = {
+                        "id": song_id,
+                        "parent": album_id,
+                        "isDir": False,
+                        "title": f"Song {song_index}",
+                        "album": album_name,
+                        "artist": artist_name,
+                        "track": track,
+                        "year": year,
+                        "genre": genre,
+                        "coverArt": album_id,
+                        "size": song_size,
+                        "contentType": "audio/flac",
+                        "suffix": "flac",
+                        "duration": duration,
+                        "bitRate": generator.choice([128, 192, 256, 320, 880]),
+                        "path": f"{artist_name}/{album_name}/{track:02} Song.flac",
+                        "discNumber": 1,
+                        "created": created.isoformat(),
+                        "albumId": album_id,
+                        "artistId": artist_id,
+                        "type": "music",
+                        "isVideo": False,
+                        "averageRating": round(generator.uniform(1, 5), 1),
+                        "bpm": generator.randint(60, 180),
+                        "comment": "",
+                        "sortName": f"song {song_index}",
+                        "musicBrainzId": _fake_uuid(song_id),
+                        "genres": [{"name": genre}],
+                        "artists": [{"id": artist_id, "name": artist_name}],
+                        "displayArtist": artist_name,
+                        "albumArtists": [{"id": artist_id, "name": artist_name}],
+                        "displayAlbumArtist": artist_name,
+                        "contributors": [
+                            {
+                                "role": "composer",
+                                "artist": {"id": artist_id, "name": artist_name},
+                            }
+                        ],
+                        "displayComposer": artist_name,
+                        "moods": moods,
+                        "replayGain": {
+                            "trackGain": round(generator.uniform(-10, 2), 2),
+                            "albumGain": -6.5,
+                            "trackPeak": 0.98,
+                            "albumPeak": 1,
+                            "baseGain": 0,
+                        },
+                    }
+
+                self.albums[album_id] = {
+                    "id": album_id,
+                    "parent": artist_id,
+                    "isDir": True,
+                    "title": album_name,
+                    "name": album_name,
+                    "album": album_name,
+                    "artist": artist_name,
+                    "artistId": artist_id,
+                    "coverArt": album_id,
+                    "songCount": songs_per_album,
+                    "duration": album_duration,
+                    "created": created.isoformat(),
+                    "year": year,
+                    "genre": genre,
+                    "recordLabels": [{"name": "Synthetic Records"}],
+                    "musicBrainzId": _fake_uuid(album_id),
+                    "genres": [{"name": genre}],
+                    "artists": [{"id": artist_id, "name": artist_name}],
+                    "displayArtist": artist_name,
+                    "releaseTypes": ["Album"],
+                    "moods": moods,
+                    "sortName": album_name.lower(),
+                    "originalReleaseDate": {"year": year, "month": 1, "day": 1},
+                    "releaseDate": {"year": year, "month": 1, "day": 1},
+                    "isCompilation": False,
+                    "discTitles": [{"disc": 1, "title": ""}],
+                }
+
+    def genre_names(self) -> list[str]:
+        """Get the names of all the genres used in the library.
+
+        Returns:
+            The sorted names of the genres.
+        """
+
+        return sorted({album["genre"] for album in self.albums.values()})
+
+    def song_content(self, song_id: str) -> bytes:
+        """Generate the fake file of a song, always the same for
+        the same song.
+
+        Args:
+            song_id: The ID of the song.
+
+        Returns:
+            The content of the file of the song.
+        """
+
+        pattern = hashlib.sha256(song_id.encode("utf-8")).digest()
+
+        return (pattern * (self.song_size // len(pattern) + 1))[: self.song_size]
+
+
+def _fake_uuid(seed: str) -> str:
+    """Generate a fake UUID that is always the same for the same seed.
+
+    Args:
+        seed: The string used to generate the UUID.
+
+    Returns:
+        A string with the format of an UUID.
+    """
+
+    digest = hashlib.md5(seed.encode("utf-8")).hexdigest()
+
+    return (
+        f"{digest[:8]}-{digest[8:12]}-{digest[12:16]}-{digest[16:20]}-{digest[20:32]}"
+    )
@@ -0,0 +1,1455 @@
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import PurePosixPath
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, Self
+
+from ._library import SyntheticLibrary
+
+if TYPE_CHECKING:
+    from .._subsonic import Subsonic
+
+Params = dict[str, list[str]]
+
+# Seconds of audio in each segment of the HLS playlists
+HLS_SEGMENT_DURATION = 10
+
+# Parameters copied from the playlist request to the URLs of its segments
+_AUTH_PARAMS = ("u", "p", "t", "s", "c", "v", "f")
+
+
+class MockServerError(Exception):
+    """Raised inside an endpoint handler to return a Subsonic error
+    response to the client.
+    """
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+
+        self.code = code
+        self.message = message
+
+
+class MockServer:
+    """In-process HTTP server compatible with the OpenSubsonic REST API
+    that serves a synthetic library, useful for testing, benchmarking and
+    load testing without a real server.
+
+    Attributes:
+        library (SyntheticLibrary): The library served.
+        username (str): The name of the only user of the server.
+        password (str): The password of the only user of the server.
+        latency (float): Seconds to wait before answering every request.
+        jitter (float): Maximum random seconds added to the latency.
+        scan_rate (float): Songs scanned per second by the simulated
+            library scans.
+        request_log (list[tuple[str, dict[str, list[str]]]]): The endpoint
+            and parameters of every request received, in order.
+        peak_in_flight (int): The maximum number of requests that have
+            been handled at the same time.
+    """
+
+    def __init__(
+        self,
+        library: SyntheticLibrary | None = None,
+        username: str = "admin",
+        password: str = "admin",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        scan_rate: float = 1000.0,
+    ) -> None:
+        """Create a new mock server, it does not listen to requests
+        until started.
+
+        Args:
+            library: The library to serve, a default sized one is
+                generated if not given.
+            username: The name of the only user of the server.
+            password: The password of the only user of the server.
+            latency: Seconds to wait before answering every request.
+            jitter: Maximum random seconds added to the latency.
+            host: The address to listen at.
+            port: The port to listen at, a free one is chosen if it is 0.
+            scan_rate: Songs scanned per second by the simulated
+                library scans.
+        """
+
+        self.library = library if library is not None else SyntheticLibrary()
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.scan_rate = scan_rate
+        self.request_log: list[tuple[str, Params]] = []
+        self.peak_in_flight = 0
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._starred: dict[str, str] = {}
+        self._ratings: dict[str, int] = {}
+        self._play_counts: dict[str, int] = {}
+        self._played: dict[str, str] = {}
+        self._now_playing: dict[str, tuple[str, float]] = {}
+        self._playlists: dict[str, dict[str, Any]] = {}
+        self._playlist_ids = itertools.count()
+        self._play_queue: dict[str, Any] | None = None
+        self._chat_messages: list[dict[str, Any]] = []
+        self._scan_started: float | None = None
+        self._podcasts: dict[str, dict[str, Any]] = {}
+        self._podcast_ids = itertools.count()
+        self._episode_ids = itertools.count()
+        self._jukebox: dict[str, Any] = {
+            "currentIndex": 0,
+            "playing": False,
+            "gain": 0.5,
+            "position": 0,
+            "ids": [],
+        }
+
+        self._albums_by_name = sorted(
+            self.library.albums, key=lambda id_: self.library.albums[id_]["name"]
+        )
+        self._albums_by_artist = sorted(
+            self.library.albums,
+            key=lambda id_: (
+                self.library.albums[id_]["artist"],
+                self.library.albums[id_]["name"],
+            ),
+        )
+        self._albums_by_newest = sorted(
+            self.library.albums,
+            key=lambda id_: self.library.albums[id_]["created"],
+            reverse=True,
+        )
+
+        self.endpoints: dict[str, Callable[[Params], dict[str, Any]]] = {
+            "ping": lambda params: {},
+            "getLicense": lambda params: {"license": {"valid": True}},
+            "getMusicFolders": self._get_music_folders,
+            "getIndexes": self._get_indexes,
+            "getMusicDirectory": self._get_music_directory,
+            "getGenres": self._get_genres,
+            "getArtists": self._get_artists,
+            "getArtist": self._get_artist,
+            "getAlbum": self._get_album,
+            "getArtistInfo2": self._get_artist_info2,
+            "getAlbumInfo2": self._get_album_info2,
+            "getSong": self._get_song,
+            "getAlbumList": self._get_album_list,
+            "getAlbumList2": self._get_album_list2,
+            "getRandomSongs": self._get_random_songs,
+            "getSongsByGenre": self._get_songs_by_genre,
+            "getNowPlaying": self._get_now_playing,
+            "getStarred": self._get_starred,
+            "getStarred2": self._get_starred2,
+            "search2": self._search2,
+            "search3": self._search3,
+            "star": self._star,
+            "unstar": self._unstar,
+            "setRating": self._set_rating,
+            "scrobble": self._scrobble,
+            "getPlaylists": self._get_playlists,
+            "getPlaylist": self._get_playlist,
+            "createPlaylist": self._create_playlist,
+            "updatePlaylist": self._update_playlist,
+            "deletePlaylist": self._delete_playlist,
+            "getPlayQueue": self._get_play_queue,
+            "savePlayQueue": self._save_play_queue,
+            "getChatMessages": self._get_chat_messages,
+            "addChatMessage": self._add_chat_message,
+            "getScanStatus": self._get_scan_status,
+            "startScan": self._start_scan,
+            "jukeboxControl": self._jukebox_control,
+            "getPodcasts": self._get_podcasts,
+            "getNewestPodcasts": self._get_newest_podcasts,
+            "refreshPodcasts": lambda params: {},
+            "createPodcastChannel": self._create_podcast_channel,
+            "deletePodcastChannel": self._delete_podcast_channel,
+            "downloadPodcastEpisode": self._download_podcast_episode,
+            "deletePodcastEpisode": self._delete_podcast_episode,
+            "stream": self._get_file,
+            "hls.m3u8": self._get_file,
+            "download": self._get_file,
+        }
+
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._host = host
+        self._port = port
+
+    @property
+    def url(self) -> str:
+        """The URL where the server is listening, without the protocol."""
+
+        if self._server is None:
+            raise RuntimeError("The mock server is not running")
+
+        host, port = self._server.server_address[:2]
+
+        return f"{host!s}:{port}"
+
+    def start(self) -> Self:
+        """Start listening to requests in a background thread.
+
+        Returns:
+            The object itself.
+        """
+
+        self._server = _Server((self._host, self._port), _Handler)
+        self._server.daemon_threads = True
+
+        # Allow the handler to reach the mock server
+        setattr(self._server, "mock_server", self)
+
+        # Use a short poll interval so stopping the server is almost instant
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """Stop listening to requests."""
+
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def serve_forever(self) -> None:
+        """Start listening to requests and block the current thread
+        until interrupted.
+        """
+
+        self.start()
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stop()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def subsonic(self, **kwargs: Any) -> "Subsonic":
+        """Create a Subsonic object already configured to connect
+        to the server.
+
+        Args:
+            **kwargs: Extra arguments to pass to the Subsonic object.
+
+        Returns:
+            A Subsonic object that connects to the server.
+        """
+
+        from .._subsonic import Subsonic
+
+        return Subsonic(
+            **{
+                "url": self.url,
+                "user": self.username,
+                "password": self.password,
+                "client": "knuckles-mock-server",
+                "use_https": False,
+                **kwargs,
+            }
+        )
+
+    def count_requests(self, endpoint: str) -> int:
+        """Count how many requests have been made to an endpoint.
+
+        Args:
+            endpoint: The name of the endpoint.
+
+        Returns:
+            The number of received requests to the endpoint.
+        """
+
+        with self._lock:
+            return sum(1 for logged, _ in self.request_log if logged == endpoint)
+
+    def add_podcast_episode(
+        self, channel_id: str, title: str | None = None, status: str = "skipped"
+    ) -> str:
+        """Publish a new episode in a podcast channel, as if the server had
+        found it while refreshing the podcasts.
+
+        Args:
+            channel_id: The ID of the channel of the episode.
+            title: The title of the episode.
+            status: The download status of the episode.
+
+        Returns:
+            The ID of the new episode.
+        """
+
+        with self._lock:
+            if channel_id not in self._podcasts:
+                raise KeyError(channel_id)
+
+            episodes = self._podcasts[channel_id]["episode"]
+
+            episode_id = f"pe-{next(self._episode_ids)}"
+            published = datetime.now(timezone.utc)
+
+            # Keep the publish dates unique and increasing
+            if episodes:
+                latest = datetime.fromisoformat(episodes[-1]["publishDate"])
+                published = max(published, latest + timedelta(seconds=1))
+
+            episodes.append(
+                {
+                    "id": episode_id,
+                    "streamId": episode_id,
+                    "channelId": channel_id,
+                    "title": title or f"Episode {episode_id}",
+                    "publishDate": published.isoformat(),
+                    "status": status,
+                }
+            )
+
+        return episode_id
+
+    def handle_request(self, endpoint: str, params: Params) -> dict[str, Any]:
+        """Generate the content of the `subsonic-response` object
+        for a request.
+
+        Args:
+            endpoint: The name of the endpoint requested.
+            params: The parameters of the request.
+
+        Returns:
+            The data to send inside the `subsonic-response` object.
+        """
+
+        with self._lock:
+            self.request_log.append((endpoint, params))
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+        try:
+            return self._respond(endpoint, params)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _respond(self, endpoint: str, params: Params) -> dict[str, Any]:
+        """Wait for the latency of the server and answer a request.
+
+        Args:
+            endpoint: The name of the endpoint requested.
+            params: The parameters of the request.
+
+        Returns:
+            The data to send inside the `subsonic-response` object.
+        """
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        response: dict[str, Any] = {
+            "status": "ok",
+            "version": "1.16.1",
+            "type": "knuckles-mock-server",
+            "serverVersion": "1.0.0",
+            "openSubsonic": True,
+        }
+
+        try:
+            self.authenticate(params)
+
+            if endpoint not in self.endpoints:
+                raise MockServerError(0, f"Unknown endpoint: {endpoint}")
+
+            response.update(self.endpoints[endpoint](params))
+        except MockServerError as error:
+            response["status"] = "failed"
+            response["error"] = {"code": error.code, "message": error.message}
+
+        return response
+
+    def authenticate(self, params: Params) -> None:
+        """Check the credentials given in a request.
+
+        Args:
+            params: The parameters of the request.
+
+        Raises:
+            MockServerError: Raised if the credentials are not valid.
+        """
+
+        username = _get(params, "u")
+        password = _get(params, "p")
+        token = _get(params, "t")
+        salt = _get(params, "s")
+
+        if username is None or (password is None and (token is None or salt is None)):
+            raise MockServerError(10, "Required parameter is missing.")
+
+        if password is not None:
+            if password.startswith("enc:"):
+                password = bytes.fromhex(password[4:]).decode("utf-8")
+
+            valid = password == self.password
+        else:
+            expected_token = hashlib.md5(
+                (self.password + str(salt)).encode("utf-8")
+            ).hexdigest()
+
+            valid = token == expected_token
+
+        if username != self.username or not valid:
+            raise MockServerError(40, "Wrong username or password.")
+
+    def _with_state(self, entry: dict[str, Any]) -> dict[str, Any]:
+        """Add the annotations made by the user to an entry of the library.
+
+        Args:
+            entry: The entry of the library.
+
+        Returns:
+            A copy of the entry with the annotations.
+        """
+
+        entry_id = entry["id"]
+        state: dict[str, Any] = {}
+
+        with self._lock:
+            if entry_id in self._starred:
+                state["starred"] = self._starred[entry_id]
+
+            if entry_id in self._ratings:
+                state["userRating"] = self._ratings[entry_id]
+
+            if entry_id in self._play_counts:
+                state["playCount"] = self._play_counts[entry_id]
+
+            if entry_id in self._played:
+                state["played"] = self._played[entry_id]
+
+        return {**entry, **state} if state else entry
+
+    def _song(self, song_id: str) -> dict[str, Any]:
+        if song_id not in self.library.songs:
+            raise MockServerError(70, "Song not found")
+
+        return self._with_state(self.library.songs[song_id])
+
+    def _album(self, album_id: str, with_songs: bool = False) -> dict[str, Any]:
+        if album_id not in self.library.albums:
+            raise MockServerError(70, "Album not found")
+
+        album = self._with_state(self.library.albums[album_id])
+
+        if with_songs:
+            album = {
+                **album,
+                "song": [
+                    self._song(song_id)
+                    for song_id in self.library.album_songs[album_id]
+                ],
+            }
+
+        return album
+
+    def _artist(self, artist_id: str, with_albums: bool = False) -> dict[str, Any]:
+        if artist_id not in self.library.artists:
+            raise MockServerError(70, "Artist not found")
+
+        artist = self._with_state(self.library.artists[artist_id])
+
+        if with_albums:
+            artist = {
+                **artist,
+                "album": [
+                    self._album(album_id)
+                    for album_id in self.library.artist_albums[artist_id]
+                ],
+            }
+
+        return artist
+
+    def _podcast_episode(self, episode_id: str) -> dict[str, Any]:
+        for channel in self._podcasts.values():
+            episode: dict[str, Any]
+            for episode in channel["episode"]:
+                if episode["id"] == episode_id:
+                    return episode
+
+        raise MockServerError(70, "Podcast episode not found")
+
+    def _get_podcasts(self, params: Params) -> dict[str, Any]:
+        channel_id = _get(params, "id")
+        include_episodes = _get(params, "includeEpisodes", "true").lower() == "true"
+
+        with self._lock:
+            if channel_id is not None and channel_id not in self._podcasts:
+                raise MockServerError(70, "Podcast channel not found")
+
+            channels = [
+                {
+                    **channel,
+                    "episode": (
+                        [dict(episode) for episode in channel["episode"]]
+                        if include_episodes
+                        else []
+                    ),
+                }
+                for id_, channel in self._podcasts.items()
+                if channel_id is None or id_ == channel_id
+            ]
+
+        for channel in channels:
+            if not channel["episode"]:
+                del channel["episode"]
+
+        return {"podcasts": channels}
+
+    def _get_newest_podcasts(self, params: Params) -> dict[str, Any]:
+        count = int(_get(params, "count", "20"))
+
+        with self._lock:
+            episodes = [
+                dict(episode)
+                for channel in self._podcasts.values()
+                for episode in channel["episode"]
+                if episode["status"] != "deleted"
+            ]
+
+        episodes.sort(key=lambda episode: episode["publishDate"], reverse=True)
+
+        return {"newestPodcasts": {"episode": episodes[:count]}}
+
+    def _create_podcast_channel(self, params: Params) -> dict[str, Any]:
+        url = _require(params, "url")
+
+        with self._lock:
+            channel_id = f"pc-{next(self._podcast_ids)}"
+            self._podcasts[channel_id] = {
+                "id": channel_id,
+                "url": url,
+                "title": f"Podcast {channel_id}",
+                "status": "completed",
+                "episode": [],
+            }
+
+        return {}
+
+    def _delete_podcast_channel(self, params: Params) -> dict[str, Any]:
+        channel_id = _require(params, "id")
+
+        with self._lock:
+            if self._podcasts.pop(channel_id, None) is None:
+                raise MockServerError(70, "Podcast channel not found")
+
+        return {}
+
+    def _download_podcast_episode(self, params: Params) -> dict[str, Any]:
+        with self._lock:
+            self._podcast_episode(_require(params, "id"))["status"] = "completed"
+
+        return {}
+
+    def _delete_podcast_episode(self, params: Params) -> dict[str, Any]:
+        with self._lock:
+            self._podcast_episode(_require(params, "id"))["status"] = "deleted"
+
+        return {}
+
+    def _get_file(self, params: Params) -> dict[str, Any]:
+        # Only validate the request, the file itself is sent by the handler
+        self._song(_require(params, "id"))
+
+        return {}
+
+    def _get_music_folders(self, params: Params) -> dict[str, Any]:
+        return {"musicFolders": {"musicFolder": [{"id": "1", "name": "Music"}]}}
+
+    def _artist_index(self) -> list[dict[str, Any]]:
+        index: dict[str, list[dict[str, Any]]] = {}
+
+        for artist in self.library.artists.values():
+            letter = artist["name"][0].upper()
+            index.setdefault(letter, []).append(self._artist(artist["id"]))
+
+        return [
+            {"name": letter, "artist": artists}
+            for letter, artists in sorted(index.items())
+        ]
+
+    def _get_indexes(self, params: Params) -> dict[str, Any]:
+        return {
+            "indexes": {
+                "ignoredArticles": "The El La Los Las Le Les",
+                "lastModified": 0,
+                "index": self._artist_index(),
+            }
+        }
+
+    def _get_music_directory(self, params: Params) -> dict[str, Any]:
+        directory_id = _require(params, "id")
+
+        if directory_id in self.library.artists:
+            artist = self._artist(directory_id)
+
+            return {
+                "directory": {
+                    "id": directory_id,
+                    "parent": "1",
+                    "name": artist["name"],
+                    "child": [
+                        self._album(album_id)
+                        for album_id in self.library.artist_albums[directory_id]
+                    ],
+                }
+            }
+
+        album = self._album(directory_id, with_songs=True)
+
+        return {
+            "directory": {
+                "id": directory_id,
+                "parent": album["parent"],
+                "name": album["name"],
+                "child": album["song"],
+            }
+        }
+
+    def _get_genres(self, params: Params) -> dict[str, Any]:
+        counts: dict[str, list[int]] = {}
+
+        for album_id, album in self.library.albums.items():
+            # The albums without a genre are not listed in any genre
+            if album["genre"] is None:
+                continue
+
+            count = counts.setdefault(album["genre"], [0, 0])
+            count[0] += len(self.library.album_songs[album_id])
+            count[1] += 1
+
+        return {
+            "genres": {
+                "genre": [
+                    {"value": genre, "songCount": songs, "albumCount": albums}
+                    for genre, (songs, albums) in sorted(counts.items())
+                ]
+            }
+        }
+
+    def _get_artists(self, params: Params) -> dict[str, Any]:
+        return {
+            "artists": {
+                "ignoredArticles": "The El La Los Las Le Les",
+                "index": self._artist_index(),
+            }
+        }
+
+    def _get_artist(self, params: Params) -> dict[str, Any]:
+        return {"artist": self._artist(_require(params, "id"), with_albums=True)}
+
+    def _get_album(self, params: Params) -> dict[str, Any]:
+        return {"album": self._album(_require(params, "id"), with_songs=True)}
+
+    def _get_artist_info2(self, params: Params) -> dict[str, Any]:
+        artist = self._artist(_require(params, "id"))
+        count = int(_get(params, "count", "20"))
+
+        similar = [
+            self._artist(artist_id)
+            for artist_id in self.library.artists
+            if artist_id != artist["id"]
+        ][:count]
+
+        return {
+            "artistInfo2": {
+                "biography": f"Biography of {artist['name']}",
+                "musicBrainzId": None,
+                "lastFmUrl": None,
+                "smallImageUrl": None,
+                "mediumImageUrl": None,
+                "largeImageUrl": None,
+                "similarArtist": similar,
+            }
+        }
+
+    def _get_album_info2(self, params: Params) -> dict[str, Any]:
+        album = self._album(_require(params, "id"))
+
+        return {"albumInfo": {"notes": f"Notes of {album['name']}"}}
+
+    def _get_song(self, params: Params) -> dict[str, Any]:
+        return {"song": self._song(_require(params, "id"))}
+
+    def _list_album_ids(self, params: Params) -> list[str]:
+        list_type = _require(params, "type")
+
+        with self._lock:
+            starred = dict(self._starred)
+            ratings = dict(self._ratings)
+            play_counts = dict(self._play_counts)
+            played = dict(self._played)
+
+        match list_type:
+            case "random":
+                return random.sample(
+                    list(self.library.albums), len(self.library.albums)
+                )
+            case "newest":
+                return self._albums_by_newest
+            case "alphabeticalByName":
+                return self._albums_by_name
+            case "alphabeticalByArtist":
+                return self._albums_by_artist
+            case "starred":
+                return [id_ for id_ in self._albums_by_name if id_ in starred]
+            case "highest":
+                return sorted(
+                    (id_ for id_ in self.library.albums if id_ in ratings),
+                    key=lambda id_: ratings[id_],
+                    reverse=True,
+                )
+            case "frequent":
+                return sorted(
+                    (id_ for id_ in self.library.albums if id_ in play_counts),
+                    key=lambda id_: play_counts[id_],
+                    reverse=True,
+                )
+            case "recent":
+                return sorted(
+                    (id_ for id_ in self.library.albums if id_ in played),
+                    key=lambda id_: played[id_],
+                    reverse=True,
+                )
+            case "byYear":
+                from_year = int(_require(params, "fromYear"))
+                to_year = int(_require(params, "toYear"))
+                low, high = sorted((from_year, to_year))
+
+                return sorted(
+                    (
+                        id_
+                        for id_ in self._albums_by_name
+                        # The albums without a year are not in any range
+                        if self.library.albums[id_]["year"] is not None
+                        and low <= self.library.albums[id_]["year"] <= high
+                    ),
+                    key=lambda id_: self.library.albums[id_]["year"],
+                    reverse=from_year > to_year,
+                )
+            case "byGenre":
+                genre = _require(params, "genre")
+
+                return [
+                    id_
+                    for id_ in self._albums_by_name
+                    if self.library.albums[id_]["genre"] == genre
+                ]
+            case _:
+                raise MockServerError(0, f"Unknown album list type: {list_type}")
+
+    def _paged_album_list(self, params: Params) -> list[dict[str, Any]]:
+        size = min(int(_get(params, "size", "10")), 500)
+        offset = int(_get(params, "offset", "0"))
+
+        return [
+            self._album(album_id)
+            for album_id in self._list_album_ids(params)[offset : offset + size]
+        ]
+
+    def _get_album_list(self, params: Params) -> dict[str, Any]:
+        return {"albumList": {"album": self._paged_album_list(params)}}
+
+    def _get_album_list2(self, params: Params) -> dict[str, Any]:
+        return {"albumList2": {"album": self._paged_album_list(params)}}
+
+    def _get_random_songs(self, params: Params) -> dict[str, Any]:
+        size = min(int(_get(params, "size", "10")), 500)
+        genre = _get(params, "genre")
+        from_year = int(_get(params, "fromYear", "0"))
+        to_year = int(_get(params, "toYear", "9999"))
+
+        candidates = [
+            song_id
+            for song_id, song in self.library.songs.items()
+            if (genre is None or song["genre"] == genre)
+            and from_year <= song["year"] <= to_year
+        ]
+
+        return {
+            "randomSongs": {
+                "song": [
+                    self._song(song_id)
+                    for song_id in random.sample(candidates, min(size, len(candidates)))
+                ]
+            }
+        }
+
+    def _get_songs_by_genre(self, params: Params) -> dict[str, Any]:
+        genre = _require(params, "genre")
+        count = min(int(_get(params, "count", "10")), 500)
+        offset = int(_get(params, "offset", "0"))
+
+        song_ids = [
+            song_id
+            for song_id, song in self.library.songs.items()
+            if song["genre"] == genre
+        ]
+
+        return {
+            "songsByGenre": {
+                "song": [
+                    self._song(song_id) for song_id in song_ids[offset : offset + count]
+                ]
+            }
+        }
+
+    def _get_now_playing(self, params: Params) -> dict[str, Any]:
+        with self._lock:
+            now_playing = dict(self._now_playing)
+
+        return {
+            "nowPlaying": {
+                "entry": [
+                    {
+                        **self._song(song_id),
+                        "username": username,
+                        "minutesAgo": int((time.time() - started) // 60),
+                        "playerId": 1,
+                    }
+                    for username, (song_id, started) in now_playing.items()
+                ]
+            }
+        }
+
+    def _starred_content(self) -> dict[str, Any]:
+        with self._lock:
+            starred = set(self._starred)
+
+        return {
+            "artist": [
+                self._artist(id_) for id_ in self.library.artists if id_ in starred
+            ],
+            "album": [
+                self._album(id_) for id_ in self.library.albums if id_ in starred
+            ],
+            "song": [self._song(id_) for id_ in self.library.songs if id_ in starred],
+        }
+
+    def _get_starred(self, params: Params) -> dict[str, Any]:
+        return {"starred": self._starred_content()}
+
+    def _get_starred2(self, params: Params) -> dict[str, Any]:
+        return {"starred2": self._starred_content()}
+
+    def _search(self, params: Params) -> dict[str, Any]:
+        query = _get(params, "query", "").strip('"').lower()
+
+        def paginate(ids: list[str], prefix: str) -> list[str]:
+            count = int(_get(params, f"{prefix}Count", "20"))
+            offset = int(_get(params, f"{prefix}Offset", "0"))
+
+            return ids[offset : offset + count]
+
+        artist_ids = [
+            id_
+            for id_, artist in self.library.artists.items()
+            if query in artist["name"].lower()
+        ]
+        album_ids = [
+            id_
+            for id_, album in self.library.albums.items()
+            if query in album["name"].lower()
+        ]
+        song_ids = [
+            id_
+            for id_, song in self.library.songs.items()
+            if query in song["title"].lower()
+        ]
+
+        return {
+            "artist": [self._artist(id_) for id_ in paginate(artist_ids, "artist")],
+            "album": [self._album(id_) for id_ in paginate(album_ids, "album")],
+            "song": [self._song(id_) for id_ in paginate(song_ids, "song")],
+        }
+
+    def _search2(self, params: Params) -> dict[str, Any]:
+        return {"searchResult2": self._search(params)}
+
+    def _search3(self, params: Params) -> dict[str, Any]:
+        return {"searchResult3": self._search(params)}
+
+    def _annotated_ids(self, params: Params) -> list[str]:
+        ids = params.get("id", []) + params.get("albumId", [])
+        ids += params.get("artistId", [])
+
+        for id_ in ids:
+            if (
+                id_ not in self.library.songs
+                and id_ not in self.library.albums
+                and id_ not in self.library.artists
+            ):
+                raise MockServerError(70, f"Item not found: {id_}")
+
+        return ids
+
+    def _star(self, params: Params) -> dict[str, Any]:
+        ids = self._annotated_ids(params)
+        now = datetime.now(timezone.utc).isoformat()
+
+        with self._lock:
+            for id_ in ids:
+                self._starred.setdefault(id_, now)
+
+        return {}
+
+    def _unstar(self, params: Params) -> dict[str, Any]:
+        ids = self._annotated_ids(params)
+
+        with self._lock:
+            for id_ in ids:
+                self._starred.pop(id_, None)
+
+        return {}
+
+    def _set_rating(self, params: Params) -> dict[str, Any]:
+        id_ = _require(params, "id")
+        rating = int(_require(params, "rating"))
+
+        self._annotated_ids({"id": [id_]})
+
+        with self._lock:
+            if rating == 0:
+                self._ratings.pop(id_, None)
+            else:
+                self._ratings[id_] = rating
+
+        return {}
+
+    def _scrobble(self, params: Params) -> dict[str, Any]:
+        song_ids = params.get("id", [])
+        times = params.get("time", [])
+        submission = _get(params, "submission", "true").lower() == "true"
+
+        if not song_ids:
+            raise MockServerError(10, "Required parameter is missing.")
+
+        for song_id in song_ids:
+            self._song(song_id)
+
+        with self._lock:
+            for index, song_id in enumerate(song_ids):
+                if not submission:
+                    self._now_playing[self.username] = (song_id, time.time())
+                    continue
+
+                timestamp = (
+                    int(times[index]) / 1000 if index < len(times) else time.time()
+                )
+                played = datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+                album_id = self.library.songs[song_id]["albumId"]
+                for id_ in (song_id, album_id):
+                    self._play_counts[id_] = self._play_counts.get(id_, 0) + 1
+                    self._played[id_] = max(self._played.get(id_, ""), played)
+
+        return {}
+
+    def _playlist(self, playlist_id: str, with_songs: bool = False) -> dict[str, Any]:
+        with self._lock:
+            if playlist_id not in self._playlists:
+                raise MockServerError(70, "Playlist not found")
+
+            playlist = dict(self._playlists[playlist_id])
+
+        song_ids = playlist.pop("songIds")
+        songs = [self._song(song_id) for song_id in song_ids]
+
+        playlist["songCount"] = len(songs)
+        playlist["duration"] = sum(song["duration"] for song in songs)
+
+        if with_songs and songs:
+            playlist["entry"] = songs
+
+        return playlist
+
+    def _get_playlists(self, params: Params) -> dict[str, Any]:
+        with self._lock:
+            playlist_ids = list(self._playlists)
+
+        return {
+            "playlists": {
+                "playlist": [
+                    self._playlist(playlist_id) for playlist_id in playlist_ids
+                ]
+            }
+        }
+
+    def _get_playlist(self, params: Params) -> dict[str, Any]:
+        return {"playlist": self._playlist(_require(params, "id"), with_songs=True)}
+
+    def _create_playlist(self, params: Params) -> dict[str, Any]:
+        playlist_id = _get(params, "playlistId")
+        song_ids = params.get("songId", [])
+
+        for song_id in song_ids:
+            self._song(song_id)
+
+        now = datetime.now(timezone.utc).isoformat()
+
+        # Passing the ID of an existing playlist overwrites its songs
+        if playlist_id is not None:
+            with self._lock:
+                if playlist_id not in self._playlists:
+                    raise MockServerError(70, "Playlist not found")
+
+                self._playlists[playlist_id]["songIds"] = list(song_ids)
+                self._playlists[playlist_id]["changed"] = now
+
+            return {"playlist": self._playlist(playlist_id, with_songs=True)}
+
+        name = _require(params, "name")
+
+        with self._lock:
+            playlist_id = f"pl-{next(self._playlist_ids)}"
+            self._playlists[playlist_id] = {
+                "id": playlist_id,
+                "name": name,
+                "owner": self.username,
+                "public": False,
+                "created": now,
+                "changed": now,
+                "songIds": list(song_ids),
+            }
+
+        return {"playlist": self._playlist(playlist_id, with_songs=True)}
+
+    def _update_playlist(self, params: Params) -> dict[str, Any]:
+        playlist_id = _require(params, "playlistId")
+        song_ids_to_add = params.get("songIdToAdd", [])
+        indexes_to_remove = {
+            int(index) for index in params.get("songIndexToRemove", [])
+        }
+
+        for song_id in song_ids_to_add:
+            self._song(song_id)
+
+        with self._lock:
+            if playlist_id not in self._playlists:
+                raise MockServerError(70, "Playlist not found")
+
+            playlist = self._playlists[playlist_id]
+
+            # The indexes refer to the songs before the update
+            playlist["songIds"] = [
+                song_id
+                for index, song_id in enumerate(playlist["songIds"])
+                if index not in indexes_to_remove
+            ] + song_ids_to_add
+
+            for field in ("name", "comment"):
+                if field in params:
+                    playlist[field] = _get(params, field)
+
+            if "public" in params:
+                playlist["public"] = _get(params, "public").lower() == "true"
+
+            playlist["changed"] = datetime.now(timezone.utc).isoformat()
+
+        return {}
+
+    def _delete_playlist(self, params: Params) -> dict[str, Any]:
+        playlist_id = _require(params, "id")
+
+        with self._lock:
+            if self._playlists.pop(playlist_id, None) is None:
+                raise MockServerError(70, "Playlist not found")
+
+        return {}
+
+    def _get_play_queue(self, params: Params) -> dict[str, Any]:
+        with self._lock:
+            play_queue = self._play_queue
+
+        if play_queue is None:
+            return {}
+
+        return {
+            "playQueue": {
+                **{key: value for key, value in play_queue.items() if key != "ids"},
+                "entry": [self._song(song_id) for song_id in play_queue["ids"]],
+            }
+        }
+
+    def _save_play_queue(self, params: Params) -> dict[str, Any]:
+        song_ids = params.get("id", [])
+
+        for song_id in song_ids:
+            self._song(song_id)
+
+        play_queue: dict[str, Any] = {
+            "ids": song_ids,
+            "username": self.username,
+            "changed": datetime.now(timezone.utc).isoformat(),
+            "changedBy": _get(params, "c"),
+        }
+
+        if "current" in params:
+            play_queue["current"] = _get(params, "current")
+
+        if "position" in params:
+            play_queue["position"] = int(_get(params, "position"))
+
+        with self._lock:
+            self._play_queue = play_queue
+
+        return {}
+
+    def _get_chat_messages(self, params: Params) -> dict[str, Any]:
+        since = int(_get(params, "since", 0))
+
+        with self._lock:
+            messages = [
+                message for message in self._chat_messages if message["time"] > since
+            ]
+
+        return {"chatMessages": {"chatMessage": messages}}
+
+    def _add_chat_message(self, params: Params) -> dict[str, Any]:
+        message = _require(params, "message")
+
+        with self._lock:
+            # Keep the times unique and increasing even for quick messages
+            now = int(time.time() * 1000)
+            if self._chat_messages:
+                now = max(now, self._chat_messages[-1]["time"] + 1)
+
+            self._chat_messages.append(
+                {"username": self.username, "time": now, "message": message}
+            )
+
+        return {}
+
+    def _scan_status(self) -> dict[str, Any]:
+        with self._lock:
+            started = self._scan_started
+
+        total = len(self.library.songs)
+
+        if started is None:
+            return {"scanStatus": {"scanning": False, "count": total}}
+
+        count = min(int((time.monotonic() - started) * self.scan_rate), total)
+
+        if count >= total:
+            with self._lock:
+                self._scan_started = None
+
+        return {"scanStatus": {"scanning": count < total, "count": count}}
+
+    def _get_scan_status(self, params: Params) -> dict[str, Any]:
+        return self._scan_status()
+
+    def _start_scan(self, params: Params) -> dict[str, Any]:
+        with self._lock:
+            if self._scan_started is None:
+                self._scan_started = time.monotonic()
+
+        return self._scan_status()
+
+    def _jukebox_control(self, params: Params) -> dict[str, Any]:
+        action = _require(params, "action")
+        song_ids = params.get("id", [])
+
+        for song_id in song_ids:
+            self._song(song_id)
+
+        with self._lock:
+            jukebox = self._jukebox
+
+            match action:
+                case "get" | "status":
+                    pass
+                case "set":
+                    jukebox.update(ids=list(song_ids), currentIndex=0, position=0)
+                case "start":
+                    jukebox["playing"] = True
+                case "stop":
+                    jukebox["playing"] = False
+                case "skip":
+                    jukebox["currentIndex"] = int(_require(params, "index"))
+                    jukebox["position"] = int(float(_get(params, "offset", 0)))
+                case "add":
+                    jukebox["ids"] = jukebox["ids"] + song_ids
+                case "clear":
+                    jukebox.update(ids=[], currentIndex=0, position=0)
+                case "remove":
+                    index = int(_require(params, "index"))
+                    jukebox["ids"] = [
+                        id_ for i, id_ in enumerate(jukebox["ids"]) if i != index
+                    ]
+                case "shuffle":
+                    jukebox["ids"] = random.sample(jukebox["ids"], len(jukebox["ids"]))
+                case "setGain":
+                    jukebox["gain"] = float(_require(params, "gain"))
+                case _:
+                    raise MockServerError(0, f"Unknown jukebox action: {action}")
+
+            status = {key: value for key, value in jukebox.items() if key != "ids"}
+            song_ids = list(jukebox["ids"])
+
+        if action == "get":
+            return {
+                "jukeboxPlaylist": {
+                    **status,
+                    "entry": [self._song(song_id) for song_id in song_ids],
+                }
+            }
+
+        return {"jukeboxStatus": status}
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server that accepts many concurrent connections."""
+
+    # The default backlog of 5 connections makes concurrent clients
+    # wait for the retransmission of their connection requests
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Translate the HTTP requests received to calls to the mock server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    @property
+    def mock_server(self) -> MockServer:
+        mock_server: MockServer = getattr(self.server, "mock_server")
+
+        return mock_server
+
+    def do_GET(self) -> None:
+        self._handle(urllib.parse.urlparse(self.path).query)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+
+        self._handle(self.rfile.read(length).decode("utf-8"))
+
+    def _handle(self, query: str) -> None:
+        path = PurePosixPath(urllib.parse.urlparse(self.path).path)
+        endpoint = path.name.removesuffix(".view")
+        params = urllib.parse.parse_qs(query)
+
+        if path.parent.name != "rest":
+            self._send(404, "text/plain", b"Not found")
+            return
+
+        if endpoint in ("stream", "download"):
+            self._handle_file(endpoint, params)
+            return
+
+        if endpoint == "hls.m3u8":
+            self._handle_hls(params)
+            return
+
+        response = self.mock_server.handle_request(endpoint, params)
+        body = json.dumps({"subsonic-response": response}).encode("utf-8")
+
+        self._send(200, "application/json", body)
+
+    def _handle_file(self, endpoint: str, params: Params) -> None:
+        """Send the file of a song, honoring the `Range` header."""
+
+        response = self.mock_server.handle_request(endpoint, params)
+
+        if response["status"] == "failed":
+            body = json.dumps({"subsonic-response": response}).encode("utf-8")
+            self._send(200, "application/json", body)
+            return
+
+        song_id: str = _get(params, "id")
+        library = self.mock_server.library
+        content = library.song_content(song_id)
+        filename = PurePosixPath(library.songs[song_id]["path"]).name
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        }
+
+        range_header = self.headers.get("Range")
+        if range_header is None:
+            self._send(200, "audio/flac", content, headers)
+            return
+
+        byte_range = _parse_range(range_header, len(content))
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{len(content)}"
+            self._send(416, "text/plain", b"", headers)
+            return
+
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        self._send(206, "audio/flac", content[start : end + 1], headers)
+
+    def _handle_hls(self, params: Params) -> None:
+        """Send an HLS playlist of a song, with a segment for every
+        `HLS_SEGMENT_DURATION` seconds pointing to a byte range of its file.
+        """
+
+        response = self.mock_server.handle_request("hls.m3u8", params)
+
+        if response["status"] == "failed":
+            body = json.dumps({"subsonic-response": response}).encode("utf-8")
+            self._send(200, "application/json", body)
+            return
+
+        song_id: str = _get(params, "id")
+        library = self.mock_server.library
+        size = len(library.song_content(song_id))
+        duration = library.songs[song_id]["duration"]
+
+        count = max(-(-duration // HLS_SEGMENT_DURATION), 1)
+        segment_size = -(-size // count)
+        count = -(-size // segment_size)
+        query = urllib.parse.urlencode(
+            [(key, params[key][0]) for key in _AUTH_PARAMS if key in params]
+            + [("id", song_id)]
+        )
+
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:4",
+            f"#EXT-X-TARGETDURATION:{HLS_SEGMENT_DURATION}",
+        ]
+
+        for index in range(count):
+            start = index * segment_size
+            length = min(segment_size, size - start)
+            seconds = min(HLS_SEGMENT_DURATION, duration - index * HLS_SEGMENT_DURATION)
+
+            lines += [
+                f"#EXTINF:{max(seconds, 0)},",
+                f"#EXT-X-BYTERANGE:{length}@{start}",
+                f"stream?{query}",
+            ]
+
+        lines.append("#EXT-X-ENDLIST")
+
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        self._send(200, "application/vnd.apple.mpegurl", body)
+
+    def _send(
+        self,
+        status: int,
+        content_type: str,
+        body: bytes,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _get(params: Params, name: str, default: Any = None) -> Any:
+    """Get the first value of a parameter of a request.
+
+    Args:
+        params: The parameters of the request.
+        name: The name of the parameter.
+        default: The value to return if the parameter is missing.
+
+    Returns:
+        The first value of the parameter or the default value.
+    """
+
+    values = params.get(name)
+
+    return values[0] if values else default
+
+
+def _require(params: Params, name: str) -> str:
+    """Get the first value of a mandatory parameter of a request.
+
+    Args:
+        params: The parameters of the request.
+        name: The name of the parameter.
+
+    Raises:
+        MockServerError: Raised if the parameter is missing.
+
+    Returns:
+        The first value of the parameter.
+    """
+
+    value: str | None = _get(params, name)
+
+    if value is None:
+        raise MockServerError(10, f"Required parameter is missing: {name}")
+
+    return value
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single range `Range` HTTP header.
+
+    Args:
+        header: The value of the header.
+        size: The size of the requested file.
+
+    Returns:
+        The first and last byte (inclusive) requested, or None if the range
+            can not be satisfied.
+    """
+
+    unit, _, byte_range = header.partition("=")
+
+    if unit.strip() != "bytes" or "," in byte_range:
+        return None
+
+    first, _, last = byte_range.strip().partition("-")
+
+    try:
+        if first == "":
+            start = max(size - int(last), 0)
+            end = size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+
+    if start > end or start >= size:
+        return None
+
+    return start, end
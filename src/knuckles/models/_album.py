@@ -5,6 +5,7 @@ from dateutil import parser
 # Avoid circular import error
 import knuckles.models._song as song_model_module
 
+from .._concurrency import run_in_parallel
 from ._artist import Artist
 from ._cover_art import CoverArt
 from ._genre import ItemGenre
@@ -165,6 +166,8 @@ class Album(Model):
         discs (list[Disc] | None):
     """
 
+    _local_attributes = frozenset({"info"})
+
     def __init__(
         self,
         subsonic: "Subsonic",
@@ -273,8 +276,12 @@ class Album(Model):
             A new object with all the updated info.
         """
 
-        new_album = self._subsonic.browsing.get_album(self.id)
-        new_album.get_album_info()
+        # Both requests are independent, so they are made at the same time
+        new_album, info = run_in_parallel(
+            lambda: self._subsonic.browsing.get_album(self.id),
+            lambda: self._subsonic.browsing.get_album_info(self.id),
+        )
+        new_album.info = info
 
         return new_album
 
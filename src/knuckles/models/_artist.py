@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Any
 # Avoid circular import error
 import knuckles.models._album as album_model_module
 
+from .._concurrency import run_in_parallel
 from ._cover_art import CoverArt
 from ._model import Model
 
@@ -98,6 +99,8 @@ class Artist(Model):
             in.
     """
 
+    _local_attributes = frozenset({"info"})
+
     def __init__(
         self,
         subsonic: "Subsonic",
@@ -148,8 +151,12 @@ class Artist(Model):
             A new object with the updated model.
         """
 
-        new_artist = self._subsonic.browsing.get_artist(self.id)
-        new_artist.get_artist_info()
+        # Both requests are independent, so they are made at the same time
+        new_artist, info = run_in_parallel(
+            lambda: self._subsonic.browsing.get_artist(self.id),
+            lambda: self._subsonic.browsing.get_artist_info(self.id),
+        )
+        new_artist.info = info
 
         return new_artist
 
@@ -12,6 +12,8 @@ class ArtistIndex(Model):
 
     Attributes:
         ignored_articles (list[str]): Ignored articles in the index.
+        last_modified (int | None): The time in milliseconds when the
+            index was last modified.
         index (dict[str, list[Artist]] | None): Dictionary that holds
             the index, where the key is the index letter and the value
             a list of objects that holds all the info related with the
@@ -23,10 +25,13 @@ class ArtistIndex(Model):
         subsonic: "Subsonic",
         ignoredArticles: str,
         index: list[dict[str, Any]] | None = None,
+        lastModified: int | None = None,
+        **kwargs: Any,
     ) -> None:
         super().__init__(subsonic)
 
         self.ignored_articles = ignoredArticles
+        self.last_modified = lastModified
 
         self.index: dict[str, list[Artist]] | None
 
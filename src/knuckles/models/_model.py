@@ -1,14 +1,83 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Self
 
 if TYPE_CHECKING:
     from .._subsonic import Subsonic
 
+# Every model class by its name, used to decode the serialized models
+MODELS: dict[str, type["Model"]] = {}
 
-class Model:
+
+class _Canonical(type):
+    """Metaclass of the models that registers every model class and
+    replaces every new model with its known instance if the identity map
+    of its Subsonic object is enabled.
+    """
+
+    def __init__(cls, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        MODELS[cls.__name__] = cls  # type: ignore[assignment]
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        model = super().__call__(*args, **kwargs)
+
+        identity_map = getattr(model._subsonic, "identity_map", None)
+
+        if identity_map is None:
+            return model
+
+        return identity_map.canonical(model)
+
+
+class Model(metaclass=_Canonical):
     """Generic parent class for all the models.
     Have an internal attribute to hold a Subsonic object to
     access the OpenSubsonic REST API.
     """
 
+    # The attributes filled by the client instead of the server
+    _local_attributes: frozenset[str] = frozenset()
+
     def __init__(self, subsonic: "Subsonic") -> None:
         self._subsonic = subsonic
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the model to a dictionary that can be encoded to JSON,
+        without the Subsonic object it is bound to.
+
+        Returns:
+            The public attributes of the model with its type, the nested
+                models are converted too.
+        """
+
+        from ._serialization import encode
+
+        data: dict[str, Any] = encode(self)
+
+        return data
+
+    @classmethod
+    def from_dict(cls, subsonic: "Subsonic", data: dict[str, Any]) -> Self:
+        """Create a model from a dictionary made by `to_dict`.
+
+        Args:
+            subsonic: The object the model should use to make requests.
+            data: The converted model.
+
+        Returns:
+            The model bound to the given Subsonic object.
+
+        Raises:
+            TypeError: If the dictionary is not of a model of this class.
+        """
+
+        from ._serialization import decode
+
+        model = decode(subsonic, data)
+
+        if not isinstance(model, cls):
+            raise TypeError(
+                f"The data is of a '{data['_type']}' not a '{cls.__name__}'"
+            )
+
+        return model
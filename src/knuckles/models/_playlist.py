@@ -174,12 +174,32 @@ class Playlist(Model):
         if not self.songs:
             self.songs = []
 
-        for index in songs_indexes:
+        # Delete from the end so the indexes of the next songs do not shift
+        for index in sorted(set(songs_indexes), reverse=True):
             del self.songs[index]
 
         if not self.song_count:
             self.song_count = 0
 
-        self.song_count -= len(songs_indexes)
+        self.song_count -= len(set(songs_indexes))
+
+        return self
+
+    def sync(self, song_ids: list[str]) -> Self:
+        """Change the songs of the playlist to the given ones, only removing
+        and appending the songs that differ.
+
+        Args:
+            song_ids: The IDs of all the songs the playlist should have,
+                in order.
+
+        Returns:
+            The object itself.
+        """
+
+        synced = self._subsonic.playlists.sync_playlist(self.id, song_ids)
+
+        self.songs = synced.songs
+        self.song_count = synced.song_count
 
         return self
@@ -0,0 +1,228 @@
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterable
+
+from ._model import MODELS, Model
+
+if TYPE_CHECKING:
+    from .._subsonic import Subsonic
+
+
+def encode(
+    value: Any,
+    active: set[int] | None = None,
+    encoded: dict[tuple[str, Any], int] | None = None,
+) -> Any:
+    """Convert a model, or any value of its attributes, to plain values
+    that can be encoded to JSON or msgpack.
+
+    Every model is converted to a dictionary of its public attributes with
+    its type in the `_type` key. Datetimes and dictionaries are wrapped in
+    a single key dictionary, so they are never mistaken for models. A model
+    with ID found again in the same payload, as the ones shared through an
+    identity map, is only referenced by its ID in the `_ref` key.
+
+    Args:
+        value: The value to convert.
+        active: The models being converted, used to find the cycles
+            of the models that can not be referenced.
+        encoded: The object already converted for every type and ID of
+            the payload.
+
+    Returns:
+        The converted value.
+
+    Raises:
+        TypeError: Raised if a value can not be encoded.
+        ValueError: Raised if a model that can not be referenced
+            contains itself.
+    """
+
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+
+    if isinstance(value, list):
+        return [encode(item, active, encoded) for item in value]
+
+    if isinstance(value, datetime):
+        return {"_datetime": value.isoformat()}
+
+    if isinstance(value, dict):
+        return {
+            "_dict": {key: encode(item, active, encoded) for key, item in value.items()}
+        }
+
+    if isinstance(value, Model):
+        active = active if active is not None else set()
+        encoded = encoded if encoded is not None else {}
+
+        name = type(value).__name__
+        model_id = getattr(value, "id", None)
+
+        if model_id is not None and encoded.get((name, model_id)) == id(value):
+            return {"_type": name, "_ref": model_id}
+
+        # Only the first object with a type and ID can be referenced, so
+        # another one that contains itself can not be encoded
+        if id(value) in active:
+            raise ValueError(
+                f"The model '{name}' contains itself but can not be referenced"
+            )
+
+        active.add(id(value))
+
+        if model_id is not None:
+            encoded.setdefault((name, model_id), id(value))
+
+        data = {"_type": name}
+        data.update(
+            (key, encode(item, active, encoded))
+            for key, item in vars(value).items()
+            if not key.startswith("_")
+        )
+
+        active.discard(id(value))
+
+        return data
+
+    raise TypeError(f"Values of type '{type(value).__name__}' can not be encoded")
+
+
+def decode(
+    subsonic: "Subsonic",
+    value: Any,
+    known: dict[tuple[str, Any], Model] | None = None,
+) -> Any:
+    """Convert the values created by `encode` back to the models, bound
+    to the given Subsonic object.
+
+    Args:
+        subsonic: The object the models should use to make requests.
+        value: The value to convert.
+        known: The first model converted for every type and ID, used to
+            resolve the references.
+
+    Returns:
+        The converted value.
+    """
+
+    if isinstance(value, list):
+        return [decode(subsonic, item, known) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if "_datetime" in value:
+        return datetime.fromisoformat(value["_datetime"])
+
+    if "_dict" in value:
+        return {
+            key: decode(subsonic, item, known) for key, item in value["_dict"].items()
+        }
+
+    known = known if known is not None else {}
+    model_type = _model_type(value["_type"])
+
+    if "_ref" in value:
+        return known[(value["_type"], value["_ref"])]
+
+    # The constructors expect the format of the API, so they are skipped
+    model = model_type.__new__(model_type)
+    model._subsonic = subsonic
+
+    if "id" in value:
+        model.id = value["id"]  # type: ignore[attr-defined]
+
+        # The canonical instance is known before decoding the attributes,
+        # so the references of the cycles point to it
+        identity_map = getattr(subsonic, "identity_map", None)
+        if identity_map is not None:
+            model = identity_map.canonical(model)
+
+        known.setdefault((value["_type"], value["id"]), model)
+
+    for name, item in value.items():
+        if name == "_type":
+            continue
+
+        decoded = decode(subsonic, item, known)
+
+        # As with the identity map the missing values never erase the
+        # known ones of a canonical instance
+        if decoded is not None or not hasattr(model, name):
+            setattr(model, name, decoded)
+
+    return model
+
+
+def _model_type(name: str) -> type[Model]:
+    """Get a model class by its name.
+
+    Args:
+        name: The name of the class.
+
+    Returns:
+        The model class.
+    """
+
+    # The classes are only registered when their modules are imported
+    if name not in MODELS:
+        package = importlib.import_module("knuckles.models")
+
+        for module in pkgutil.iter_modules(package.__path__):
+            importlib.import_module(f"{package.__name__}.{module.name}")
+
+    return MODELS[name]
+
+
+def to_msgpack(models: Iterable[Model]) -> bytes:
+    """Encode many models to a compact binary payload.
+
+    Args:
+        models: The models to encode.
+
+    Returns:
+        The models encoded with msgpack.
+    """
+
+    try:
+        import msgpack
+    except ImportError as error:
+        raise ImportError(
+            "msgpack is needed to encode models, install it with 'knuckles[msgpack]'"
+        ) from error
+
+    # The models shared between them are only encoded once
+    active: set[int] = set()
+    encoded: dict[tuple[str, Any], int] = {}
+
+    payload: bytes = msgpack.packb([encode(model, active, encoded) for model in models])
+
+    return payload
+
+
+def from_msgpack(subsonic: "Subsonic", payload: bytes) -> list[Any]:
+    """Decode the models encoded by `to_msgpack`.
+
+    Args:
+        subsonic: The object the models should use to make requests.
+        payload: The encoded models.
+
+    Returns:
+        The decoded models, in the same order as they were encoded.
+    """
+
+    try:
+        import msgpack
+    except ImportError as error:
+        raise ImportError(
+            "msgpack is needed to decode models, install it with 'knuckles[msgpack]'"
+        ) from error
+
+    known: dict[tuple[str, Any], Model] = {}
+
+    return [
+        decode(subsonic, data, known)
+        for data in msgpack.unpackb(payload, strict_map_key=False)
+    ]
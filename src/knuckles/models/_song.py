@@ -25,6 +25,8 @@ class Song(Model):
         id (str): The ID of the song.
         title (str | None): The title of the song.
         parent (str | None): The ID of the parent of the song.
+        is_dir (bool | None): If the entry is a directory instead of a
+            song, only in the contents of a music directory.
         track (int | None): The track
         year (int | None): The year when the song was released.
         genre (Genre | None): All the info related with the genre
@@ -145,6 +147,7 @@ class Song(Model):
         self.id: str = id
         self.title: str | None = title
         self.parent: str | None = parent
+        self.is_dir: bool | None = isDir
         self.track: int | None = track
         self.year: int | None = year
         self.genre = Genre(self._subsonic, genre) if genre else None
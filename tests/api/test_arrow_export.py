@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from knuckles.mock_server import MockServer
+
+pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq  # noqa: E402
+from knuckles import ArrowExporter  # noqa: E402
+from knuckles._arrow_export import SCHEMAS, ExportKind  # noqa: E402
+
+
+def test_batches(mock_server: MockServer) -> None:
+    exporter = ArrowExporter(mock_server.subsonic(), page_size=25)
+    batches = list(exporter.batches("song"))
+
+    assert [batch.num_rows for batch in batches] == [25, 25, 10]
+    assert all(batch.schema == SCHEMAS["song"] for batch in batches)
+
+    row = batches[0].to_pylist()[0]
+    song = mock_server.library.songs[row["id"]]
+
+    assert row["bit_rate"] == song["bitRate"]
+    assert row["genres"] == [song["genre"]]
+    assert row["artists"] == [{"id": song["artistId"], "name": song["artist"]}]
+    assert row["moods"] == song["moods"]
+    assert row["created"] == datetime.fromisoformat(song["created"]).astimezone(
+        timezone.utc
+    )
+    assert row["user_rating"] is None
+
+
+def test_write_parquet(mock_server: MockServer, tmp_path: Path) -> None:
+    exporter = ArrowExporter(mock_server.subsonic(), page_size=4)
+    path = tmp_path / "albums.parquet"
+
+    assert exporter.write_parquet("album", path) == 15
+
+    parquet = pq.ParquetFile(path)
+
+    # Every page is written as its own row group
+    assert parquet.metadata.num_row_groups == 4
+    assert parquet.schema_arrow == SCHEMAS["album"]
+    assert sorted(parquet.read().column("id").to_pylist()) == sorted(
+        mock_server.library.albums
+    )
+    assert not (tmp_path / "albums.parquet.tmp").exists()
+
+
+def test_write_artists(mock_server: MockServer, tmp_path: Path) -> None:
+    exporter = ArrowExporter(mock_server.subsonic(), page_size=2)
+    path = tmp_path / "artists.parquet"
+
+    assert exporter.write_parquet("artist", path) == 5
+    assert pq.ParquetFile(path).metadata.num_row_groups == 3
+
+
+def test_append_changes(mock_server: MockServer, tmp_path: Path) -> None:
+    subsonic = mock_server.subsonic()
+    state_file = tmp_path / "state.json"
+    dataset = tmp_path / "songs"
+
+    first = ArrowExporter(subsonic, page_size=25, state_file=state_file)
+    result = first.append_changes("song", dataset)
+
+    assert result.path == dataset / "song-00000.parquet"
+    assert result.written_rows == 60
+    assert result.removed_ids == []
+
+    # The fingerprints are kept between runs
+    second = ArrowExporter(subsonic, page_size=25, state_file=state_file)
+
+    assert second.append_changes("song", dataset) == (None, 0, [])
+
+    subsonic.media_annotation.set_rating("so-42", 5)
+    result = second.append_changes("song", dataset)
+
+    assert result.path == dataset / "song-00001.parquet"
+    assert result.written_rows == 1
+
+    table = pq.read_table(result.path)
+
+    assert table.column("id").to_pylist() == ["so-42"]
+    assert table.column("user_rating").to_pylist() == [5]
+    assert sorted(path.name for path in dataset.iterdir()) == [
+        "song-00000.parquet",
+        "song-00001.parquet",
+    ]
+
+
+@pytest.mark.parametrize("append", [False, True])
+def test_failed_export_is_cleaned(
+    mock_server: MockServer,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    append: bool,
+) -> None:
+    exporter = ArrowExporter(mock_server.subsonic(), page_size=4)
+    pages = exporter._pages
+
+    def failing_pages(kind: ExportKind) -> Iterator[list[dict[str, Any]]]:
+        yield next(pages(kind))
+        raise ConnectionError()
+
+    monkeypatch.setattr(exporter, "_pages", failing_pages)
+
+    with pytest.raises(ConnectionError):
+        if append:
+            exporter.append_changes("album", tmp_path)
+        else:
+            exporter.write_parquet("album", tmp_path / "album-00000.parquet")
+
+    assert list(tmp_path.iterdir()) == []
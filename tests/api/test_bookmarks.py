@@ -1,8 +1,11 @@
 from typing import Any
 
+import pytest
+import requests
 import responses
 from dateutil import parser
 from knuckles import Subsonic
+from knuckles.mock_server import MockServer
 from responses import Response
 
 from tests.conftest import AddResponses
@@ -127,3 +130,30 @@ def test_save_play_queue(
     )
 
     assert response.current.id == song["id"]
+
+
+def test_save_large_play_queue(
+    mock_server: MockServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    subsonic = mock_server.subsonic()
+    song_ids = list(mock_server.library.songs)
+
+    post_urls: list[str] = []
+    post = requests.post
+
+    def spy(url: str, **kwargs: Any) -> requests.Response:
+        post_urls.append(url)
+        return post(url, **kwargs)
+
+    monkeypatch.setattr(requests, "post", spy)
+
+    subsonic.bookmarks.save_play_queue(song_ids, song_ids[3], 1000, max_url_length=500)
+
+    assert len(post_urls) == 1
+
+    play_queue = subsonic.bookmarks.get_play_queue()
+    assert play_queue.songs is not None
+    assert [song.id for song in play_queue.songs] == song_ids
+    assert play_queue.current is not None
+    assert play_queue.current.id == song_ids[3]
+    assert play_queue.position == 1000
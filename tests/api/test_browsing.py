@@ -3,6 +3,7 @@ from typing import Any
 import responses
 from dateutil import parser
 from knuckles import CoverArt, Subsonic
+from knuckles.mock_server import MockServer, SyntheticLibrary
 from responses import Response
 
 from tests.conftest import AddResponses
@@ -444,3 +445,53 @@ def test_get_top_songs(
     response = subsonic.browsing.get_top_songs(artist["name"], songs_count)
 
     assert response[0].id == song["id"]
+
+
+def test_walk_music_folder(mock_server: MockServer) -> None:
+    walk = list(mock_server.subsonic().browsing.walk_music_folder("0"))
+
+    directories = {directory.id: (subdirs, songs) for directory, subdirs, songs in walk}
+
+    assert len(walk) == 20
+    assert set(directories) == {
+        *mock_server.library.artists,
+        *mock_server.library.albums,
+    }
+    assert [subdir.id for subdir in directories["ar-0"][0]] == ["al-0", "al-1", "al-2"]
+    assert directories["ar-0"][1] == []
+    assert sorted(song.id for _, _, songs in walk for song in songs) == sorted(
+        mock_server.library.songs
+    )
+
+
+def test_walk_music_folder_max_depth(mock_server: MockServer) -> None:
+    walk = list(mock_server.subsonic().browsing.walk_music_folder("0", max_depth=0))
+
+    assert sorted(directory.id for directory, _, _ in walk) == sorted(
+        mock_server.library.artists
+    )
+
+
+def test_walk_music_folder_pruning(mock_server: MockServer) -> None:
+    walk = mock_server.subsonic().browsing.walk_music_folder(
+        "0", prune=lambda subdir: subdir.id == "al-0"
+    )
+    visited = []
+
+    for directory, subdirs, _ in walk:
+        visited.append(directory.id)
+
+        # As in os.walk the subdirectories can be removed in place
+        if directory.id == "ar-1":
+            subdirs.clear()
+
+    assert len(visited) == 16
+    assert "al-0" not in visited
+    assert not set(mock_server.library.artist_albums["ar-1"]) & set(visited)
+
+
+def test_walk_music_folder_is_concurrent() -> None:
+    with MockServer(SyntheticLibrary(5, 3, 4), latency=0.02) as server:
+        list(server.subsonic().browsing.walk_music_folder("0", max_workers=8))
+
+    assert 1 < server.peak_in_flight <= 8
@@ -0,0 +1,134 @@
+import itertools
+import json
+from pathlib import Path
+
+from knuckles import Album, Artist, LibraryCrawler, Song
+from knuckles.mock_server import MockServer, SyntheticLibrary
+
+
+def ids_by_type(models: list[Artist | Album | Song]) -> dict[type, list[str]]:
+    result: dict[type, list[str]] = {Artist: [], Album: [], Song: []}
+
+    for model in models:
+        result[type(model)].append(model.id)
+
+    return result
+
+
+def test_whole_library(mock_server: MockServer) -> None:
+    models = list(LibraryCrawler(mock_server.subsonic()).crawl())
+    ids = ids_by_type(models)
+
+    assert sorted(ids[Artist]) == sorted(mock_server.library.artists)
+    assert sorted(ids[Album]) == sorted(mock_server.library.albums)
+    assert sorted(ids[Song]) == sorted(mock_server.library.songs)
+    assert len(models) == len(set(map(id, models)))
+
+    # Every node is only fetched once
+    assert mock_server.count_requests("getArtist") == 5
+    assert mock_server.count_requests("getAlbum") == 15
+
+
+def test_hydrated_models(mock_server: MockServer) -> None:
+    for model in LibraryCrawler(mock_server.subsonic()).crawl(["ar-0"]):
+        if isinstance(model, Artist):
+            assert model.albums is not None
+        elif isinstance(model, Album):
+            assert model.songs is not None
+        else:
+            assert model.title is not None
+
+
+def test_artist_root(mock_server: MockServer) -> None:
+    ids = ids_by_type(
+        list(LibraryCrawler(mock_server.subsonic()).crawl(["ar-1", "ar-1"]))
+    )
+
+    assert ids[Artist] == ["ar-1"]
+    assert sorted(ids[Album]) == sorted(mock_server.library.artist_albums["ar-1"])
+    assert len(ids[Song]) == 12
+
+
+def test_genre_root(mock_server: MockServer) -> None:
+    genre = mock_server.library.albums["al-0"]["genre"]
+    ids = ids_by_type(list(LibraryCrawler(mock_server.subsonic()).crawl(genre=genre)))
+
+    assert ids[Artist] == []
+    assert sorted(ids[Album]) == sorted(
+        album_id
+        for album_id, album in mock_server.library.albums.items()
+        if album["genre"] == genre
+    )
+
+
+def test_concurrent_crawl() -> None:
+    with MockServer(SyntheticLibrary(5, 3, 4), latency=0.02) as server:
+        list(LibraryCrawler(server.subsonic(), max_workers=8).crawl())
+
+    assert 1 < server.peak_in_flight <= 8
+
+
+def test_resume_from_checkpoint(mock_server: MockServer, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "crawl.json"
+    crawler = LibraryCrawler(
+        mock_server.subsonic(), max_workers=2, checkpoint=checkpoint
+    )
+
+    crawl = crawler.crawl()
+    first = list(itertools.islice(crawl, 30))
+    crawl.close()
+
+    assert checkpoint.exists()
+
+    second = list(crawler.crawl())
+    ids = ids_by_type(first + second)
+
+    assert sorted(ids[Artist]) == sorted(mock_server.library.artists)
+    assert sorted(ids[Album]) == sorted(mock_server.library.albums)
+    assert sorted(ids[Song]) == sorted(mock_server.library.songs)
+    assert not checkpoint.exists()
+
+    # The root is not requested again when resuming
+    assert mock_server.count_requests("getArtists") == 1
+
+
+def test_checkpoint_only_holds_pending_nodes(
+    mock_server: MockServer, tmp_path: Path
+) -> None:
+    checkpoint = tmp_path / "crawl.json"
+    crawler = LibraryCrawler(
+        mock_server.subsonic(), max_workers=2, checkpoint=checkpoint
+    )
+
+    crawl = crawler.crawl()
+    first = list(itertools.islice(crawl, 40))
+    crawl.close()
+
+    # The yielded models are appended to the log instead of the checkpoint
+    assert json.loads(checkpoint.read_text()).keys() == {"root", "pending"}
+    log = checkpoint.with_name("crawl.json.log")
+    assert len(log.read_text().splitlines()) >= len(first)
+
+    # Simulate a crash while an entry was being written
+    with log.open("a") as file:
+        file.write('["song", "so-')
+
+    second = list(crawler.crawl())
+    ids = ids_by_type(first + second)
+
+    assert sorted(ids[Album]) == sorted(mock_server.library.albums)
+    assert sorted(ids[Song]) == sorted(mock_server.library.songs)
+    assert not log.exists()
+
+
+def test_checkpoint_of_other_root(mock_server: MockServer, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "crawl.json"
+    crawler = LibraryCrawler(mock_server.subsonic(), checkpoint=checkpoint)
+
+    crawl = crawler.crawl(["ar-0"])
+    next(crawl)
+    crawl.close()
+
+    ids = ids_by_type(list(crawler.crawl(["ar-1"])))
+
+    assert ids[Artist] == ["ar-1"]
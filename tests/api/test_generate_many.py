@@ -0,0 +1,61 @@
+from knuckles import Album, Artist, Song, generate_many
+from knuckles.mock_server import MockServer, SyntheticLibrary
+
+
+def test_album_generate_is_concurrent() -> None:
+    with MockServer(SyntheticLibrary(2, 2, 2), latency=0.1) as server:
+        subsonic = server.subsonic()
+        album = Album(subsonic, "al-1")
+
+        new_album = album.generate()
+
+    assert new_album.name == "Album 1"
+    assert new_album.info is not None
+    assert new_album.info.notes == "Notes of Album 1"
+
+    # The album and its info are requested at the same time
+    assert server.peak_in_flight == 2
+
+
+def test_artist_generate_is_concurrent() -> None:
+    with MockServer(SyntheticLibrary(2, 2, 2), latency=0.1) as server:
+        artist = Artist(server.subsonic(), "ar-0")
+
+        new_artist = artist.generate()
+
+    assert new_artist.albums is not None
+    assert new_artist.info is not None
+    assert [similar.id for similar in new_artist.info.similar_artists or []] == ["ar-1"]
+    assert server.peak_in_flight == 2
+
+
+def test_generate_many(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    models = [
+        Song(subsonic, "so-0"),
+        Album(subsonic, "al-1"),
+        Artist(subsonic, "ar-2"),
+        Song(subsonic, "so-3"),
+    ]
+
+    generated = generate_many(models, max_workers=2)
+
+    assert [type(model) for model in generated] == [Song, Album, Artist, Song]
+    assert [model.id for model in generated] == ["so-0", "al-1", "ar-2", "so-3"]
+    assert isinstance(generated[0], Song) and generated[0].title is not None
+
+
+def test_generate_many_bounded() -> None:
+    with MockServer(SyntheticLibrary(2, 2, 2), latency=0.05) as server:
+        subsonic = server.subsonic()
+        songs = [Song(subsonic, f"so-{index}") for index in range(8)]
+
+        generate_many(songs, max_workers=2)
+        bounded = server.peak_in_flight
+
+        server.peak_in_flight = 0
+        generate_many(songs, max_workers=8)
+        parallel = server.peak_in_flight
+
+    assert bounded == 2
+    assert parallel > 2
@@ -0,0 +1,99 @@
+import gc
+
+from knuckles.mock_server import MockServer
+from knuckles.models._album import Album
+from knuckles.models._artist import Artist
+
+
+def test_disabled_by_default(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    album = subsonic.browsing.get_album("al-0")
+
+    assert subsonic.identity_map is None
+    assert album.songs[0].artist is not album.songs[1].artist
+
+
+def test_shared_instances(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    album = subsonic.browsing.get_album("al-0")
+    songs = album.songs
+
+    assert songs[0].artist is songs[1].artist
+    assert songs[0].artist is album.artist
+    assert songs[0].artists[0] is album.artist
+    assert songs[0].album_artists[0] is album.artist
+    assert songs[0].album is album
+
+    # The same models found in other responses are the same instances
+    assert subsonic.browsing.get_song("so-0") is songs[0]
+    assert subsonic.searching.search("Song 1", song_count=1).songs[0] is songs[1]
+
+
+def test_richer_data_is_merged(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    song = subsonic.browsing.get_song("so-0")
+    artist = song.artist
+
+    assert artist.albums is None
+
+    full_artist = subsonic.browsing.get_artist("ar-0")
+
+    assert full_artist is artist
+    assert [album.id for album in artist.albums] == ["al-0", "al-1", "al-2"]
+
+    # A response with less info does not erase the known one
+    subsonic.browsing.get_album("al-0")
+
+    assert artist.albums is not None
+    assert artist.album_count == 3
+
+
+def test_generate_is_visible_everywhere(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    song = subsonic.browsing.get_album("al-0").songs[0]
+
+    subsonic.media_annotation.set_rating("so-0", 4)
+
+    assert song.generate() is song
+    assert song.user_rating == 4
+
+
+def test_models_are_weakly_referenced(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    album = subsonic.browsing.get_album("al-0")
+
+    assert subsonic.identity_map.get(Album, "al-0") is album
+    assert subsonic.identity_map.get(Artist, "ar-0") is album.artist
+
+    del album
+    gc.collect()
+
+    assert subsonic.identity_map.get(Album, "al-0") is None
+    assert len(subsonic.identity_map) == 0
+
+
+def test_full_fetch_clears_values(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    song = subsonic.browsing.get_album("al-0").songs[0]
+
+    song.star()
+
+    assert song.generate().starred is not None
+
+    song.unstar()
+
+    # The server no longer sends the value, so it is erased
+    assert song.generate() is song
+    assert song.starred is None
+
+
+def test_full_fetch_keeps_local_values(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    album = subsonic.browsing.get_album("al-0").generate()
+
+    assert album.info is not None
+
+    subsonic.browsing.get_album("al-0")
+
+    # The info is never sent by the server with the album
+    assert album.info is not None
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import knuckles
+import pytest
+from knuckles import Subsonic
+from knuckles._system import System
+
+
+def test_import_is_lazy() -> None:
+    code = (
+        "import sys\n"
+        "import knuckles\n"
+        "knuckles.Subsonic('127.0.0.1', 'user', 'password', 'client')\n"
+        "print(' '.join(sys.modules))"
+    )
+
+    modules = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.split()
+
+    assert "knuckles._subsonic" in modules
+    assert "knuckles._browsing" not in modules
+    assert "knuckles.models._song" not in modules
+    assert "requests" not in modules
+    assert "dateutil" not in modules
+
+
+def test_public_names_are_importable() -> None:
+    for name in knuckles.__all__:
+        assert getattr(knuckles, name) is not None
+
+    assert set(knuckles.__all__) <= set(dir(knuckles))
+
+
+def test_unknown_name() -> None:
+    with pytest.raises(AttributeError):
+        knuckles.NonExistent
+
+
+def test_helpers_are_created_once(subsonic: Subsonic) -> None:
+    assert "system" not in vars(subsonic)
+
+    assert isinstance(subsonic.system, System)
+    assert subsonic.system is subsonic.system
+    assert subsonic.system.api is subsonic.api
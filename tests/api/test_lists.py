@@ -1,7 +1,9 @@
 from typing import Any
 
+import pytest
 import responses
-from knuckles import Subsonic
+from knuckles import CatalogSharding, Subsonic
+from knuckles.mock_server import MockServer, SyntheticLibrary
 from responses import Response
 
 from tests.conftest import AddResponses
@@ -497,3 +499,80 @@ def test_get_starred(
     assert response.albums[0].id == album["id"]
     assert isinstance(response.artists, list)
     assert response.artists[0].id == artist["id"]
+
+
+def test_get_all_albums(mock_server: MockServer) -> None:
+    albums = mock_server.subsonic().lists.get_all_albums(page_size=2)
+
+    assert sorted(album.id for album in albums) == sorted(mock_server.library.albums)
+
+    # The pages of every genre are known from its number of albums, a
+    # final empty page is only needed when the last one is full
+    counts = [
+        genre.album_count or 0 for genre in mock_server.subsonic().browsing.get_genres()
+    ]
+    assert mock_server.count_requests("getAlbumList2") == sum(
+        count // 2 + 1 for count in counts
+    )
+
+    # No album is missing, so the catalog is not swept
+    assert mock_server.count_requests("getArtists") == 1
+
+
+@pytest.mark.parametrize(
+    "sharding", [CatalogSharding.GENRE, CatalogSharding.GENRE_AND_YEAR]
+)
+def test_get_all_albums_without_genre(
+    mock_server: MockServer, sharding: CatalogSharding
+) -> None:
+    mock_server.library.albums["al-3"]["genre"] = None
+    mock_server.library.albums["al-3"]["year"] = None
+
+    albums = mock_server.subsonic().lists.get_all_albums(
+        sharding, page_size=2, from_year=1950, to_year=2024
+    )
+
+    assert sorted(album.id for album in albums) == sorted(mock_server.library.albums)
+
+    # The size of the catalog is known, so all the pages of the sweep are
+    # requested without waiting for the previous ones
+    sweep = [
+        params["offset"]
+        for endpoint, params in mock_server.request_log
+        if endpoint == "getAlbumList2" and params["type"] == ["alphabeticalByName"]
+    ]
+    assert len(sweep) == len(mock_server.library.albums) // 2 + 1
+
+    # The sweep can be disabled when every album has a genre
+    albums = mock_server.subsonic().lists.get_all_albums(
+        sharding, page_size=2, from_year=1950, to_year=2024, without_genre=False
+    )
+
+    assert "al-3" not in {album.id for album in albums}
+
+
+def test_get_all_albums_by_year(mock_server: MockServer) -> None:
+    albums = mock_server.subsonic().lists.get_all_albums(
+        CatalogSharding.YEAR, page_size=2, from_year=1950, to_year=2024
+    )
+
+    assert sorted(album.id for album in albums) == sorted(mock_server.library.albums)
+    assert mock_server.count_requests("getAlbumList2") >= 15
+
+
+def test_get_all_albums_without_duplicates(mock_server: MockServer) -> None:
+    albums = mock_server.subsonic().lists.get_all_albums(
+        CatalogSharding.GENRE_AND_YEAR, from_year=1950, to_year=2024
+    )
+
+    assert sorted(album.id for album in albums) == sorted(mock_server.library.albums)
+
+
+@pytest.mark.parametrize("sharding", list(CatalogSharding))
+def test_get_all_albums_is_concurrent(sharding: CatalogSharding) -> None:
+    with MockServer(SyntheticLibrary(5, 3, 4), latency=0.02) as server:
+        server.subsonic().lists.get_all_albums(
+            sharding, max_workers=8, page_size=2, from_year=1950, to_year=2024
+        )
+
+    assert 1 < server.peak_in_flight <= 8
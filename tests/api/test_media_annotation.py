@@ -2,9 +2,11 @@ from datetime import datetime
 from typing import Any
 
 import pytest
+import requests
 import responses
-from knuckles import Subsonic
+from knuckles import RequestMethod, Subsonic
 from knuckles.exceptions import InvalidRatingNumber
+from knuckles.mock_server import MockServer
 from responses import Response
 
 from tests.conftest import AddResponses, MockGenerator
@@ -94,6 +96,74 @@ def test_unstar_artist(
     assert type(response) is Subsonic
 
 
+@pytest.fixture
+def post_requests(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    urls: list[str] = []
+    post = requests.post
+
+    def spy(url: str, **kwargs: Any) -> requests.Response:
+        urls.append(url)
+        return post(url, **kwargs)
+
+    monkeypatch.setattr(requests, "post", spy)
+
+    return urls
+
+
+def test_bulk_star_single_get(
+    mock_server: MockServer, post_requests: list[str]
+) -> None:
+    subsonic = mock_server.subsonic()
+
+    subsonic.media_annotation.star(["so-0", "so-1"], ["al-0"], ["ar-0"])
+
+    assert mock_server.count_requests("star") == 1
+    assert post_requests == []
+
+    starred = subsonic.lists.get_starred()
+    assert [song.id for song in starred.songs] == ["so-0", "so-1"]
+    assert [album.id for album in starred.albums] == ["al-0"]
+    assert [artist.id for artist in starred.artists] == ["ar-0"]
+
+
+@pytest.mark.parametrize("request_method", list(RequestMethod))
+def test_bulk_star_switches_to_post(
+    mock_server: MockServer, post_requests: list[str], request_method: RequestMethod
+) -> None:
+    subsonic = mock_server.subsonic(request_method=request_method)
+    song_ids = list(mock_server.library.songs)
+
+    subsonic.media_annotation.star(
+        song_ids, album_ids=["al-0"], max_url_length=200, max_form_keys=20
+    )
+
+    # 14 IDs fit in each request besides the 6 authentication parameters
+    assert mock_server.count_requests("star") == 5
+    assert len(post_requests) == 5
+    assert [song.id for song in subsonic.lists.get_starred().songs] == song_ids
+
+    subsonic.media_annotation.unstar(song_ids[1:], max_form_keys=20)
+
+    assert [song.id for song in subsonic.lists.get_starred().songs] == song_ids[:1]
+
+
+def test_set_ratings(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    ratings = {f"so-{index}": index % 5 + 1 for index in range(20)}
+
+    subsonic.media_annotation.set_ratings(ratings, max_workers=4)
+
+    assert mock_server.count_requests("setRating") == 20
+    assert subsonic.browsing.get_song("so-3").user_rating == 4
+
+
+def test_set_invalid_ratings(mock_server: MockServer) -> None:
+    with pytest.raises(InvalidRatingNumber):
+        mock_server.subsonic().media_annotation.set_ratings({"so-0": 5, "so-1": 6})
+
+    assert mock_server.count_requests("setRating") == 0
+
+
 @pytest.mark.parametrize("rating", [1, 2, 3, 4, 5])
 @responses.activate
 def test_set_rating(
@@ -1,7 +1,10 @@
+from datetime import datetime, timezone
 from typing import Any
 
+import pytest
 import responses
-from knuckles import Subsonic
+from knuckles import Album, ScanProgress, Subsonic
+from knuckles.mock_server import MockServer
 from responses import Response
 
 from tests.conftest import AddResponses
@@ -35,3 +38,97 @@ def test_get_scan_status(
 
     assert response.scanning == scan_status["scanning"]
     assert response.count == scan_status["count"]
+
+
+def test_wait_for_scan(mock_server: MockServer) -> None:
+    mock_server.scan_rate = 200
+    subsonic = mock_server.subsonic()
+    progress: list[ScanProgress] = []
+
+    subsonic.media_library_scanning.start_scan()
+    status = subsonic.media_library_scanning.wait_for_scan(
+        on_progress=progress.append, min_interval=0.01, max_interval=0.05
+    )
+
+    assert not status.scanning
+    assert status.count == 60
+    assert progress[-1].eta == 0
+    assert all(
+        before.status.count <= after.status.count
+        for before, after in zip(progress, progress[1:])
+    )
+
+
+def test_wait_for_scan_eta(mock_server: MockServer) -> None:
+    mock_server.scan_rate = 200
+    subsonic = mock_server.subsonic()
+    progress: list[ScanProgress] = []
+
+    subsonic.media_library_scanning.start_scan()
+    subsonic.media_library_scanning.wait_for_scan(
+        on_progress=progress.append,
+        expected_count=60,
+        min_interval=0.05,
+        max_interval=0.05,
+    )
+
+    estimations = [update for update in progress if update.status.scanning]
+    assert any(update.eta is not None for update in estimations[1:])
+    assert all(update.rate is None or update.rate > 0 for update in progress)
+
+
+def test_wait_for_scan_timeout(mock_server: MockServer) -> None:
+    mock_server.scan_rate = 1
+    subsonic = mock_server.subsonic()
+
+    subsonic.media_library_scanning.start_scan()
+
+    with pytest.raises(TimeoutError):
+        subsonic.media_library_scanning.wait_for_scan(
+            timeout=0.2, min_interval=0.01, max_interval=0.05
+        )
+
+    # Without progress the polls are made less often
+    assert mock_server.count_requests("getScanStatus") < 10
+
+
+def test_wait_for_scan_refresh(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    added: list[list[Album]] = []
+
+    subsonic.media_library_scanning.wait_for_scan(
+        on_complete=added.append,
+        since=datetime(2020, 1, 1, 0, 11, tzinfo=timezone.utc),
+    )
+
+    assert [album.id for album in added[0]] == ["al-14", "al-13", "al-12"]
+
+
+def test_wait_for_scan_since_start(mock_server: MockServer) -> None:
+    mock_server.scan_rate = 200
+    subsonic = mock_server.subsonic()
+    added: list[list[Album]] = []
+
+    subsonic.media_library_scanning.start_scan()
+
+    # An album indexed by the scan before the wait starts
+    mock_server.library.albums["al-14"]["created"] = datetime.now(
+        timezone.utc
+    ).isoformat()
+
+    subsonic.media_library_scanning.wait_for_scan(
+        on_complete=added.append, min_interval=0.01, max_interval=0.05
+    )
+
+    assert [album.id for album in added[0]] == ["al-14"]
+
+
+def test_get_albums_added_since_pages(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+
+    albums = subsonic.media_library_scanning.get_albums_added_since(
+        datetime(2020, 1, 1, 0, 10, tzinfo=timezone.utc), page_size=2
+    )
+
+    assert [album.id for album in albums] == ["al-14", "al-13", "al-12", "al-11"]
+    assert mock_server.count_requests("getAlbumList2") == 3
@@ -0,0 +1,102 @@
+import os
+import pickle
+
+from knuckles import Subsonic, SubsonicPool, process_map
+from knuckles.mock_server import MockServer
+
+
+def album_duration(subsonic: Subsonic, album_id: str) -> tuple[int, int]:
+    album = subsonic.browsing.get_album(album_id)
+
+    return os.getpid(), sum(song.duration for song in album.songs)
+
+
+def test_pickle_subsonic(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(profile=True, identity_map=True)
+    subsonic.browsing.get_album("al-0")
+
+    loaded = pickle.loads(pickle.dumps(subsonic))
+
+    assert loaded.api.url == subsonic.api.url
+    assert loaded.api.password == subsonic.api.password
+
+    # The profiler and the identity map start empty
+    assert loaded.profiler is not None
+    assert loaded.profiler is not subsonic.profiler
+    assert loaded.api.profiler is loaded.profiler
+    assert len(loaded.identity_map) == 0
+
+    assert loaded.browsing.get_album("al-0").id == "al-0"
+    assert loaded.profiler.summary()[0].calls == 1
+
+
+def test_pickle_models(mock_server: MockServer) -> None:
+    album = mock_server.subsonic().browsing.get_album("al-0")
+
+    loaded = pickle.loads(pickle.dumps(album))
+
+    assert [song.id for song in loaded.songs] == [song.id for song in album.songs]
+    assert loaded.songs[0].generate().title == album.songs[0].title
+
+
+def test_process_map(mock_server: MockServer) -> None:
+    album_ids = list(mock_server.library.albums)
+
+    results = process_map(
+        mock_server.subsonic(), album_duration, album_ids, max_workers=2
+    )
+
+    assert [duration for _, duration in results] == [
+        sum(
+            mock_server.library.songs[song_id]["duration"]
+            for song_id in mock_server.library.album_songs[album_id]
+        )
+        for album_id in album_ids
+    ]
+    assert os.getpid() not in {pid for pid, _ in results}
+
+    # Every worker pings the server once before its first call
+    assert 1 <= mock_server.count_requests("ping") <= 2
+
+
+def test_pickle_pool(mock_server: MockServer) -> None:
+    replica = mock_server.subsonic(client="replica")
+    pool = SubsonicPool(
+        [mock_server.subsonic(), replica],
+        health_check_interval=60,
+        identity_map=True,
+    )
+    album = pool.browsing.get_album("al-0")
+
+    loaded = pickle.loads(pickle.dumps(pool))
+    pool.close()
+
+    assert [server.api.client for server in loaded.servers] == [
+        "knuckles-mock-server",
+        "replica",
+    ]
+    assert loaded.api._servers[1].subsonic is loaded.servers[1]
+    assert len(loaded.identity_map) == 0
+
+    # The health checks are started again
+    assert loaded._health_check_thread is not None
+    assert loaded._health_check_thread.is_alive()
+    loaded.close()
+
+    assert loaded.browsing.get_album("al-0").id == "al-0"
+    assert pickle.loads(pickle.dumps(album)).id == "al-0"
+
+
+def test_process_map_pool(mock_server: MockServer) -> None:
+    pool = SubsonicPool([mock_server.subsonic(), mock_server.subsonic()])
+    album_ids = list(mock_server.library.albums)[:4]
+
+    results = process_map(pool, album_duration, album_ids, max_workers=2)
+
+    assert [duration for _, duration in results] == [
+        sum(
+            mock_server.library.songs[song_id]["duration"]
+            for song_id in mock_server.library.album_songs[album_id]
+        )
+        for album_id in album_ids
+    ]
@@ -1,8 +1,10 @@
 from typing import Any
 
+import pytest
 import responses
 from dateutil import parser
-from knuckles import Subsonic
+from knuckles import RequestMethod, Subsonic
+from knuckles.mock_server import MockServer
 from responses import Response
 
 from tests.conftest import AddResponses
@@ -128,3 +130,158 @@ def test_delete_playlist(
     response = subsonic.playlists.delete_playlist(playlist["id"])
 
     assert isinstance(response, Subsonic)
+
+
+@pytest.fixture
+def song_ids(mock_server: MockServer) -> list[str]:
+    return list(mock_server.library.songs)
+
+
+def test_sync_playlist(mock_server: MockServer, song_ids: list[str]) -> None:
+    subsonic = mock_server.subsonic()
+    playlist = subsonic.playlists.create_playlist("Sync", song_ids=song_ids[:40])
+
+    desired = song_ids[:10] + song_ids[11:40] + song_ids[50:52]
+    synced = subsonic.playlists.sync_playlist(playlist.id, desired)
+
+    assert mock_server.count_requests("updatePlaylist") == 1
+    assert mock_server.request_log[-1][1]["songIndexToRemove"] == ["10"]
+    assert mock_server.request_log[-1][1]["songIdToAdd"] == song_ids[50:52]
+
+    assert synced.songs is not None
+    assert [song.id for song in synced.songs] == desired
+    assert synced.song_count == len(desired)
+
+    server_songs = subsonic.playlists.get_playlist(playlist.id).songs
+    assert server_songs is not None
+    assert [song.id for song in server_songs] == desired
+
+
+def test_sync_playlist_without_changes(
+    mock_server: MockServer, song_ids: list[str]
+) -> None:
+    subsonic = mock_server.subsonic()
+    playlist = subsonic.playlists.create_playlist("Sync", song_ids=song_ids[:5])
+
+    playlist.sync(song_ids[:5])
+
+    assert mock_server.count_requests("updatePlaylist") == 0
+
+
+def test_sync_playlist_reorder_and_split(
+    mock_server: MockServer, song_ids: list[str]
+) -> None:
+    subsonic = mock_server.subsonic()
+    playlist = subsonic.playlists.create_playlist("Sync", song_ids=song_ids[:30])
+
+    desired = song_ids[:5] + song_ids[20:30] + song_ids[5:20][::-1] + song_ids[40:]
+    subsonic.playlists.sync_playlist(
+        playlist.id, desired, max_url_length=100, max_form_keys=20
+    )
+
+    assert mock_server.count_requests("updatePlaylist") > 1
+
+    server_songs = subsonic.playlists.get_playlist(playlist.id).songs
+    assert server_songs is not None
+    assert [song.id for song in server_songs] == desired
+
+
+def test_remove_songs_in_any_order(
+    mock_server: MockServer, song_ids: list[str]
+) -> None:
+    subsonic = mock_server.subsonic()
+    playlist = subsonic.playlists.create_playlist("Remove", song_ids=song_ids[:5])
+
+    playlist.remove_songs([0, 3, 1])
+
+    assert playlist.songs is not None
+    assert [song.id for song in playlist.songs] == [song_ids[2], song_ids[4]]
+    assert playlist.song_count == 2
+
+    server_songs = subsonic.playlists.get_playlist(playlist.id).songs
+    assert server_songs is not None
+    assert [song.id for song in server_songs] == [song_ids[2], song_ids[4]]
+
+
+@pytest.mark.parametrize("request_method", list(RequestMethod))
+def test_create_large_playlist(
+    mock_server: MockServer, song_ids: list[str], request_method: RequestMethod
+) -> None:
+    subsonic = mock_server.subsonic(request_method=request_method)
+
+    playlist = subsonic.playlists.create_playlist(
+        "Large", "A comment", True, song_ids, chunk_size=25
+    )
+
+    # Comment and public are sent with the last chunk of songs
+    assert mock_server.count_requests("createPlaylist") == 1
+    assert mock_server.count_requests("updatePlaylist") == 2
+    assert mock_server.request_log[-1][1]["comment"] == ["A comment"]
+
+    assert playlist.songs is not None
+    assert [song.id for song in playlist.songs] == song_ids
+    assert playlist.song_count == len(song_ids)
+
+    created = subsonic.playlists.get_playlist(playlist.id)
+    assert created.songs is not None
+    assert [song.id for song in created.songs] == song_ids
+    assert created.comment == "A comment"
+    assert created.public is True
+
+
+def test_create_playlist_over_url_limit(
+    mock_server: MockServer, song_ids: list[str]
+) -> None:
+    subsonic = mock_server.subsonic()
+
+    subsonic.playlists.create_playlist("Large", song_ids=song_ids, max_url_length=500)
+
+    # Switching to POST is enough to send all the songs in one request
+    assert mock_server.count_requests("createPlaylist") == 1
+    assert mock_server.count_requests("updatePlaylist") == 0
+
+
+def test_create_playlist_appends_fit_in_url(
+    mock_server: MockServer, song_ids: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    subsonic = mock_server.subsonic()
+    api = subsonic.api
+
+    # Every chunk of the creation fits, but the same songs sent as
+    # appends would have a longer URL
+    max_url_length = max(
+        len(
+            api.generate_url(
+                "createPlaylist", {"name": "Large", "songId": song_ids[start:][:25]}
+            )
+        )
+        for start in range(0, len(song_ids), 25)
+    )
+
+    lengths: list[int] = []
+    raw_request = api.raw_request
+
+    def record(
+        endpoint: str,
+        extra_params: dict[str, Any] | None = None,
+        request_method: RequestMethod | None = None,
+    ) -> Any:
+        if (request_method or api.request_method) == RequestMethod.GET:
+            lengths.append(len(api.generate_url(endpoint, extra_params or {})))
+
+        return raw_request(endpoint, extra_params, request_method)
+
+    monkeypatch.setattr(api, "raw_request", record)
+
+    playlist = subsonic.playlists.create_playlist(
+        "Large",
+        song_ids=song_ids,
+        chunk_size=25,
+        max_url_length=max_url_length,
+    )
+
+    assert all(length <= max_url_length for length in lengths)
+
+    created = subsonic.playlists.get_playlist(playlist.id)
+    assert created.songs is not None
+    assert [song.id for song in created.songs] == song_ids
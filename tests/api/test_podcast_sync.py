@@ -0,0 +1,189 @@
+from pathlib import Path
+
+import pytest
+import requests
+from knuckles import PodcastSync
+from knuckles.mock_server import MockServer
+
+
+@pytest.fixture
+def channel_ids(mock_server: MockServer) -> list[str]:
+    subsonic = mock_server.subsonic()
+
+    for index in range(10):
+        subsonic.podcast.create_podcast_channel(f"https://example.com/{index}.xml")
+
+    channel_ids = [channel.id for channel in subsonic.podcast.get_podcast_channels()]
+
+    for channel_id in channel_ids:
+        for _ in range(3):
+            mock_server.add_podcast_episode(channel_id)
+
+    return channel_ids
+
+
+def test_first_sync(mock_server: MockServer, channel_ids: list[str]) -> None:
+    sync = PodcastSync(mock_server.subsonic(), max_workers=4)
+
+    result = sync.sync()
+
+    assert len(result.new_channels) == 10
+    assert len(result.new_episodes) == 30
+    assert sorted(result.downloads) == sorted(
+        episode.id for episode in result.new_episodes
+    )
+    assert result.failed_downloads == {}
+    assert mock_server.count_requests("downloadPodcastEpisode") == 30
+    assert len(sync.pending()) == 30
+
+
+def test_selective_fetching(mock_server: MockServer, channel_ids: list[str]) -> None:
+    sync = PodcastSync(mock_server.subsonic())
+    sync.sync()
+    sync.sync()
+
+    episode_id = mock_server.add_podcast_episode(channel_ids[4])
+    requests = len(mock_server.request_log)
+
+    result = sync.sync()
+
+    assert [episode.id for episode in result.new_episodes] == [episode_id]
+    assert result.fetched_channels == 1
+    assert result.downloads == [episode_id]
+
+    # The channel list, the newest episodes, one channel and one download
+    assert len(mock_server.request_log) - requests == 4
+
+
+def test_tracks_status(mock_server: MockServer, channel_ids: list[str]) -> None:
+    sync = PodcastSync(mock_server.subsonic())
+    first = sync.sync()
+
+    episode_id = first.downloads[0]
+    assert sync.status(episode_id) == "downloading"
+
+    # The pending episodes are fetched again to know their status
+    result = sync.sync()
+
+    assert result.fetched_channels == 10
+    assert sync.status(episode_id) == "completed"
+    assert sync.pending() == []
+    assert sync.status("missing") is None
+
+
+def test_removed_channel(mock_server: MockServer, channel_ids: list[str]) -> None:
+    subsonic = mock_server.subsonic()
+    sync = PodcastSync(subsonic, should_download=lambda episode: False)
+    sync.sync()
+
+    subsonic.podcast.delete_podcast_channel(channel_ids[0])
+
+    result = sync.sync()
+
+    assert result.removed_channels == [channel_ids[0]]
+    assert result.fetched_channels == 0
+    assert mock_server.count_requests("downloadPodcastEpisode") == 0
+
+
+def test_state_file(
+    mock_server: MockServer, channel_ids: list[str], tmp_path: Path
+) -> None:
+    state_file = tmp_path / "podcasts.json"
+
+    PodcastSync(mock_server.subsonic(), state_file).sync()
+    PodcastSync(mock_server.subsonic(), state_file).sync()
+
+    result = PodcastSync(mock_server.subsonic(), state_file).sync()
+
+    assert result.new_channels == []
+    assert result.new_episodes == []
+    assert result.fetched_channels == 0
+
+
+def test_declined_episodes(mock_server: MockServer, channel_ids: list[str]) -> None:
+    mock_server.add_podcast_episode(channel_ids[0], status="new")
+
+    sync = PodcastSync(mock_server.subsonic(), should_download=lambda episode: False)
+    sync.sync()
+
+    # The refused episodes stay as new without being fetched again
+    result = sync.sync()
+
+    assert result.fetched_channels == 0
+    assert result.downloads == []
+    assert sync.pending() == []
+
+
+def test_failed_downloads_are_retried(
+    mock_server: MockServer,
+    channel_ids: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    state_file = tmp_path / "podcasts.json"
+    subsonic = mock_server.subsonic()
+    episode_id = mock_server.add_podcast_episode(channel_ids[0], status="new")
+    download = subsonic.podcast.download_podcast_episode
+
+    def fail(episode_id: str) -> None:
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(subsonic.podcast, "download_podcast_episode", fail)
+    first = PodcastSync(subsonic, state_file).sync()
+
+    assert len(first.failed_downloads) == 31
+    assert first.downloads == []
+
+    # The accepted episodes are requested again, even after a restart
+    monkeypatch.setattr(subsonic.podcast, "download_podcast_episode", download)
+    sync = PodcastSync(subsonic, state_file)
+    result = sync.sync()
+
+    assert result.new_episodes == []
+    assert result.fetched_channels == 10
+    assert sorted(result.downloads) == sorted(first.failed_downloads)
+    assert sync.status(episode_id) == "downloading"
+
+    sync.sync()
+    result = sync.sync()
+
+    assert result.downloads == []
+    assert result.fetched_channels == 0
+
+
+def test_failed_downloads_are_abandoned(
+    mock_server: MockServer,
+    channel_ids: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    state_file = tmp_path / "podcasts.json"
+    subsonic = mock_server.subsonic()
+
+    # Download the other episodes so only the failing one is accepted
+    PodcastSync(subsonic).sync()
+
+    # The server accepts the request but the download keeps failing
+    episode_id = mock_server.add_podcast_episode(channel_ids[0], status="error")
+    monkeypatch.setattr(
+        subsonic.podcast, "download_podcast_episode", lambda episode_id: None
+    )
+
+    for _ in range(3):
+        result = PodcastSync(subsonic, state_file, max_download_attempts=3).sync()
+
+        assert result.downloads == [episode_id]
+        assert result.abandoned_downloads == []
+
+    sync = PodcastSync(subsonic, state_file, max_download_attempts=3)
+    result = sync.sync()
+
+    assert result.downloads == []
+    assert result.abandoned_downloads == [episode_id]
+
+    # The abandoned episode is no longer fetched nor requested
+    result = sync.sync()
+
+    assert result.fetched_channels == 0
+    assert result.downloads == []
+    assert result.abandoned_downloads == []
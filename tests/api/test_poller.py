@@ -0,0 +1,157 @@
+import threading
+from typing import Any, Callable
+
+import pytest
+from knuckles import ChatMessage, Jukebox, NowPlayingEntry, Poller, ScanStatus
+from knuckles.mock_server import MockServer
+
+
+class Events:
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+        self._condition = threading.Condition()
+
+    def __call__(self, value: Any) -> None:
+        with self._condition:
+            self.values.append(value)
+            self._condition.notify_all()
+
+    def wait_for(self, predicate: Callable[[list[Any]], bool]) -> None:
+        with self._condition:
+            assert self._condition.wait_for(lambda: predicate(self.values), 5)
+
+
+@pytest.fixture
+def poller(mock_server: MockServer) -> Poller:
+    return Poller(mock_server.subsonic(), min_interval=0.01, max_interval=0.05)
+
+
+def test_now_playing(mock_server: MockServer, poller: Poller) -> None:
+    events = Events()
+    subsonic = mock_server.subsonic()
+
+    with poller:
+        poller.on_now_playing(events)
+        events.wait_for(lambda values: len(values) == 1)
+
+        subsonic.media_annotation.scrobble(["so-1"], [], submission=False)
+        events.wait_for(lambda values: len(values) == 2)
+
+    entries: list[NowPlayingEntry] = events.values[-1]
+    assert events.values[0] == []
+    assert [entry.song.id for entry in entries] == ["so-1"]
+
+
+def test_chat_since(mock_server: MockServer, poller: Poller) -> None:
+    events = Events()
+    subsonic = mock_server.subsonic()
+    subsonic.chat.add_chat_message("first")
+
+    with poller:
+        poller.on_chat_message(events)
+        events.wait_for(lambda values: len(values) == 1)
+
+        subsonic.chat.add_chat_message("second")
+        subsonic.chat.add_chat_message("third")
+        events.wait_for(lambda values: sum(map(len, values)) == 3)
+
+    messages: list[ChatMessage] = [
+        message for batch in events.values for message in batch
+    ]
+    assert [message.message for message in messages] == ["first", "second", "third"]
+
+    # Every poll after the first one only asks for the new messages
+    polls = [
+        params
+        for endpoint, params in mock_server.request_log
+        if endpoint == "getChatMessages"
+    ]
+    assert "since" not in polls[0]
+    assert all("since" in params for params in polls[1:])
+
+
+def test_scan_status_only_emits_changes(
+    mock_server: MockServer, poller: Poller
+) -> None:
+    mock_server.scan_rate = 100
+    subsonic = mock_server.subsonic()
+    events = Events()
+
+    with poller:
+        poller.on_scan_status(events)
+        events.wait_for(lambda values: len(values) == 1)
+
+        subsonic.media_library_scanning.start_scan()
+        poller.refresh()
+        events.wait_for(lambda values: not values[-1].scanning and len(values) > 2)
+
+    statuses: list[ScanStatus] = events.values
+    keys = [(status.scanning, status.count) for status in statuses]
+    assert all(before != after for before, after in zip(keys, keys[1:]))
+    assert any(status.scanning for status in statuses)
+
+
+def test_jukebox_shared_subscribers(mock_server: MockServer, poller: Poller) -> None:
+    first = Events()
+    second = Events()
+    subsonic = mock_server.subsonic()
+
+    with poller:
+        poller.on_jukebox(first)
+        first.wait_for(lambda values: len(values) == 1)
+
+        # New subscribers receive the last known state right away
+        poller.on_jukebox(second)
+        assert len(second.values) == 1
+
+        subsonic.jukebox.set(["so-0", "so-1"])
+        second.wait_for(lambda values: len(values) == 2)
+        first.wait_for(lambda values: len(values) == 2)
+
+    jukebox: Jukebox = first.values[-1]
+    assert jukebox.playlist is not None
+    assert [song.id for song in jukebox.playlist] == ["so-0", "so-1"]
+    assert first.values[-1] is second.values[-1]
+
+
+def test_adaptive_interval(mock_server: MockServer) -> None:
+    poller = Poller(mock_server.subsonic(), min_interval=0.01, max_interval=10)
+    events = Events()
+
+    with poller:
+        poller.on_scan_status(events)
+        events.wait_for(lambda values: len(values) == 1)
+
+        threading.Event().wait(0.3)
+
+    # The interval doubles after every poll without changes
+    assert mock_server.count_requests("getScanStatus") < 10
+
+
+def test_unsubscribe_stops_polling(mock_server: MockServer, poller: Poller) -> None:
+    events = Events()
+
+    with poller:
+        unsubscribe = poller.on_scan_status(events)
+        events.wait_for(lambda values: len(values) == 1)
+        unsubscribe()
+
+        threading.Event().wait(0.1)
+        polls = mock_server.count_requests("getScanStatus")
+        threading.Event().wait(0.1)
+
+        assert mock_server.count_requests("getScanStatus") == polls
+
+
+def test_subscribe_while_waiting(mock_server: MockServer) -> None:
+    poller = Poller(mock_server.subsonic(), min_interval=60, max_interval=60)
+    scan_events = Events()
+    now_playing_events = Events()
+
+    with poller:
+        poller.on_scan_status(scan_events)
+        scan_events.wait_for(lambda values: len(values) == 1)
+
+        # The thread is waiting for the next scan status poll in a minute
+        poller.on_now_playing(now_playing_events)
+        now_playing_events.wait_for(lambda values: len(values) == 1)
@@ -0,0 +1,108 @@
+from typing import Iterator
+
+import pytest
+import requests
+from knuckles import RoutingStrategy, SubsonicPool
+from knuckles.mock_server import MockServer, SyntheticLibrary
+
+
+@pytest.fixture
+def replica_server() -> Iterator[MockServer]:
+    with MockServer(SyntheticLibrary(5, 3, 4, song_size=64 * 1024)) as server:
+        yield server
+
+
+def test_round_robin(mock_server: MockServer, replica_server: MockServer) -> None:
+    pool = SubsonicPool(
+        [mock_server.subsonic(), replica_server.subsonic()],
+        RoutingStrategy.ROUND_ROBIN,
+    )
+
+    for _ in range(4):
+        pool.browsing.get_album("al-0")
+
+    assert mock_server.count_requests("getAlbum") == 2
+    assert replica_server.count_requests("getAlbum") == 2
+
+
+def test_least_latency(mock_server: MockServer, replica_server: MockServer) -> None:
+    mock_server.latency = 0.05
+    pool = SubsonicPool([mock_server.subsonic(), replica_server.subsonic()])
+
+    health = pool.health_check()
+
+    assert health[0].latency is not None and health[1].latency is not None
+    assert health[0].latency > health[1].latency
+
+    for _ in range(3):
+        pool.system.ping()
+
+    # One ping from the health check, the rest go to the fastest server
+    assert mock_server.count_requests("ping") == 1
+    assert replica_server.count_requests("ping") == 4
+
+
+def test_failover(mock_server: MockServer, replica_server: MockServer) -> None:
+    pool = SubsonicPool(
+        [mock_server.subsonic(), replica_server.subsonic()],
+        RoutingStrategy.ROUND_ROBIN,
+    )
+    mock_server.stop()
+
+    for _ in range(3):
+        assert pool.browsing.get_song("so-0").id == "so-0"
+
+    assert replica_server.count_requests("getSong") == 3
+    assert [server.healthy for server in pool.health()] == [False, True]
+
+
+def test_mutating_requests_are_pinned(
+    mock_server: MockServer, replica_server: MockServer
+) -> None:
+    pool = SubsonicPool(
+        [mock_server.subsonic(), replica_server.subsonic()],
+        RoutingStrategy.ROUND_ROBIN,
+    )
+
+    for _ in range(4):
+        pool.media_annotation.star_song("so-0")
+
+    assert mock_server.count_requests("star") == 4
+    assert replica_server.count_requests("star") == 0
+
+
+def test_primary_down(mock_server: MockServer, replica_server: MockServer) -> None:
+    pool = SubsonicPool([mock_server.subsonic(), replica_server.subsonic()])
+    mock_server.stop()
+
+    with pytest.raises(requests.ConnectionError):
+        pool.media_annotation.star_song("so-0")
+
+    assert replica_server.count_requests("star") == 0
+
+
+def test_background_health_checks(
+    mock_server: MockServer, replica_server: MockServer
+) -> None:
+    with SubsonicPool(
+        [mock_server.subsonic(), replica_server.subsonic()],
+        health_check_interval=60,
+    ) as pool:
+        pool.close()
+
+    assert all(server.healthy for server in pool.health())
+    assert mock_server.count_requests("ping") == 1
+    assert replica_server.count_requests("ping") == 1
+
+
+def test_stream_url_points_to_a_replica(
+    mock_server: MockServer, replica_server: MockServer
+) -> None:
+    pool = SubsonicPool([mock_server.subsonic(), replica_server.subsonic()])
+    mock_server.stop()
+    pool.system.ping()
+
+    url = pool.media_retrieval.stream("so-0")
+
+    assert replica_server.url in url
+    assert requests.get(url).status_code == 200
@@ -0,0 +1,111 @@
+import io
+from typing import Any
+
+import knuckles
+import pytest
+import responses
+from knuckles import Subsonic
+from knuckles.mock_server import MockServer, SyntheticLibrary
+from responses import Response
+
+from tests.conftest import AddResponses
+
+
+@pytest.fixture
+def profiled_subsonic(subsonic: Subsonic) -> Subsonic:
+    return knuckles.Subsonic(
+        url=subsonic.api.url,
+        user=subsonic.api.username,
+        password=subsonic.api.password,
+        client=subsonic.api.client,
+        request_method=subsonic.api.request_method,
+        profile=True,
+    )
+
+
+def test_profiling_disabled_by_default(subsonic: Subsonic) -> None:
+    assert subsonic.profiler is None
+    assert subsonic.api.profiler is None
+
+
+@responses.activate
+def test_profile_helper_method(
+    add_responses: AddResponses,
+    profiled_subsonic: Subsonic,
+    mock_get_album_list_alphabetical_by_name: list[Response],
+    album: dict[str, Any],
+    num_of_album: int,
+    album_list_offset: int,
+    music_folders: list[dict[str, Any]],
+) -> None:
+    add_responses(mock_get_album_list_alphabetical_by_name)
+
+    response = profiled_subsonic.lists.get_album_list_alphabetical_by_name(
+        num_of_album, album_list_offset, music_folders[0]["id"]
+    )
+
+    assert response[0].id == album["id"]
+
+    assert len(profiled_subsonic.profiler.records) == 1
+    record = profiled_subsonic.profiler.records[0]
+    assert record.method == "Lists.get_album_list_alphabetical_by_name"
+    assert record.network > 0
+    assert record.decode > 0
+    assert record.model_build > 0
+    assert record.total >= record.network + record.decode
+
+
+@responses.activate
+def test_profile_nested_calls(
+    add_responses: AddResponses,
+    profiled_subsonic: Subsonic,
+    mock_get_album: list[Response],
+    mock_get_album_info: list[Response],
+    album: dict[str, Any],
+) -> None:
+    add_responses(mock_get_album)
+    add_responses(mock_get_album_info)
+
+    profiled_subsonic.browsing.get_album(album["id"]).generate()
+
+    summary = {entry.method: entry for entry in profiled_subsonic.profiler.summary()}
+
+    assert summary["Browsing.get_album"].calls == 2
+    assert summary["Browsing.get_album_info"].calls == 1
+
+
+@responses.activate
+def test_dump_summary(
+    add_responses: AddResponses,
+    profiled_subsonic: Subsonic,
+    mock_get_album: list[Response],
+    album: dict[str, Any],
+) -> None:
+    add_responses(mock_get_album)
+
+    profiled_subsonic.browsing.get_album(album["id"])
+
+    output = io.StringIO()
+    profiled_subsonic.profiler.dump_summary(output)
+
+    assert "Model build" in output.getvalue()
+    assert "Browsing.get_album" in output.getvalue()
+
+    profiled_subsonic.profiler.reset()
+    assert profiled_subsonic.profiler.records == []
+
+
+def test_profile_worker_threads() -> None:
+    library = SyntheticLibrary(num_of_artists=5, albums_per_artist=3)
+
+    with MockServer(library, latency=0.05) as server:
+        subsonic = server.subsonic(profile=True)
+        subsonic.lists.get_all_albums(page_size=2, without_genre=False)
+
+    records = subsonic.profiler.records
+    record = next(record for record in records if record.method.endswith("all_albums"))
+
+    # The time of the pages requested from the workers is not model build
+    assert any(record.method == "Lists.get_album_list_by_genre" for record in records)
+    assert record.total > 0.1
+    assert record.model_build < record.total / 2
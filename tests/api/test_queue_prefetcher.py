@@ -0,0 +1,102 @@
+import time
+from pathlib import Path
+
+from knuckles import QueuePrefetcher, StreamCache
+from knuckles.mock_server import MockServer
+
+
+def wait_until_ready(prefetcher: QueuePrefetcher, *song_ids: str) -> None:
+    for _ in range(500):
+        if all(prefetcher.is_ready(song_id) for song_id in song_ids):
+            return
+        time.sleep(0.01)
+
+    raise AssertionError("The songs were not prefetched in time")
+
+
+def streamed_ids(mock_server: MockServer) -> set[str]:
+    return {
+        params["id"][0]
+        for endpoint, params in mock_server.request_log
+        if endpoint == "stream"
+    }
+
+
+def test_play_queue(mock_server: MockServer, tmp_path: Path) -> None:
+    subsonic = mock_server.subsonic()
+    subsonic.bookmarks.save_play_queue(["so-0", "so-1", "so-2", "so-3", "so-4"], "so-1")
+
+    with StreamCache(subsonic, tmp_path) as cache:
+        with QueuePrefetcher(cache, lookahead=2, max_bitrate_rate=128) as prefetcher:
+            prefetcher.set_queue(subsonic.bookmarks.get_play_queue())
+            wait_until_ready(prefetcher, "so-1", "so-2", "so-3")
+
+            assert streamed_ids(mock_server) == {"so-1", "so-2", "so-3"}
+
+            requests = mock_server.count_requests("stream")
+            assert prefetcher.open("so-2").read() == (
+                mock_server.library.song_content("so-2")
+            )
+
+            # The song is read from the disk
+            assert mock_server.count_requests("stream") == requests
+
+    bitrates = {
+        params["maxBitRate"][0]
+        for endpoint, params in mock_server.request_log
+        if endpoint == "stream"
+    }
+    assert bitrates == {"128"}
+
+
+def test_advance(mock_server: MockServer, tmp_path: Path) -> None:
+    subsonic = mock_server.subsonic()
+    playlist = subsonic.playlists.create_playlist(
+        "Queue", song_ids=["so-5", "so-6", "so-7"]
+    )
+
+    with StreamCache(subsonic, tmp_path) as cache:
+        with QueuePrefetcher(cache, lookahead=1) as prefetcher:
+            prefetcher.set_queue(playlist)
+            wait_until_ready(prefetcher, "so-5", "so-6")
+
+            assert streamed_ids(mock_server) == {"so-5", "so-6"}
+
+            assert prefetcher.advance() == "so-6"
+            wait_until_ready(prefetcher, "so-7")
+            assert not prefetcher.is_ready("so-5")
+
+            assert prefetcher.advance() == "so-7"
+            assert prefetcher.advance() is None
+
+
+def test_open_outside_queue(mock_server: MockServer, tmp_path: Path) -> None:
+    with StreamCache(mock_server.subsonic(), tmp_path) as cache:
+        with QueuePrefetcher(cache) as prefetcher:
+            assert prefetcher.open("so-9").read() == (
+                mock_server.library.song_content("so-9")
+            )
+
+
+def test_repeated_songs(mock_server: MockServer, tmp_path: Path) -> None:
+    subsonic = mock_server.subsonic()
+    playlist = subsonic.playlists.create_playlist(
+        "Queue", song_ids=["so-0", "so-1", "so-0", "so-2"]
+    )
+
+    with StreamCache(subsonic, tmp_path) as cache:
+        with QueuePrefetcher(cache, lookahead=1) as prefetcher:
+            prefetcher.set_queue(playlist)
+
+            assert [prefetcher.advance() for _ in range(4)] == [
+                "so-1",
+                "so-0",
+                "so-2",
+                None,
+            ]
+
+            # The next occurrence of a repeated song is played
+            prefetcher.set_queue(playlist, "so-1")
+            prefetcher.set_current("so-0")
+
+            assert prefetcher.advance() == "so-2"
@@ -0,0 +1,143 @@
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from knuckles import ScrobbleBuffer
+from knuckles.mock_server import MockServer, SyntheticLibrary
+
+
+def played_at(minute: int) -> datetime:
+    return datetime(2024, 1, 1, 0, minute, tzinfo=timezone.utc)
+
+
+def test_batched_flush(mock_server: MockServer) -> None:
+    buffer = ScrobbleBuffer(
+        mock_server.subsonic(), max_batch_size=3, flush_interval=None
+    )
+
+    for index in range(5):
+        buffer.add(f"so-{index}", played_at(index))
+
+    assert buffer.flush() == 5
+    assert len(buffer) == 0
+
+    scrobbles = [
+        params for endpoint, params in mock_server.request_log if endpoint == "scrobble"
+    ]
+    assert [params["id"] for params in scrobbles] == [
+        ["so-0", "so-1", "so-2"],
+        ["so-3", "so-4"],
+    ]
+    assert scrobbles[0]["time"][1] == str(int(played_at(1).timestamp()) * 1000)
+    assert scrobbles[0]["submission"] == ["True"]
+
+
+def test_flush_when_full(mock_server: MockServer) -> None:
+    with ScrobbleBuffer(
+        mock_server.subsonic(), max_batch_size=2, flush_interval=60
+    ) as buffer:
+        buffer.add("so-0").add("so-1")
+
+        for _ in range(100):
+            if mock_server.count_requests("scrobble") == 1:
+                break
+            time.sleep(0.01)
+
+        assert mock_server.count_requests("scrobble") == 1
+
+
+def test_flush_interval(mock_server: MockServer) -> None:
+    with ScrobbleBuffer(mock_server.subsonic(), flush_interval=0.05) as buffer:
+        buffer.add("so-0")
+
+        for _ in range(100):
+            if len(buffer) == 0:
+                break
+            time.sleep(0.01)
+
+        assert len(buffer) == 0
+        assert mock_server.count_requests("scrobble") == 1
+
+
+def test_rejected_scrobbles(mock_server: MockServer) -> None:
+    buffer = ScrobbleBuffer(mock_server.subsonic(), flush_interval=None)
+
+    buffer.add("missing")
+
+    assert buffer.flush() == 0
+    assert len(buffer) == 0
+    assert [scrobble.song_id for scrobble in buffer.rejected] == ["missing"]
+
+
+def test_failed_scrobbles_are_kept(mock_server: MockServer, tmp_path: Path) -> None:
+    journal = tmp_path / "scrobbles.jsonl"
+    subsonic = mock_server.subsonic(password="wrong")
+
+    with ScrobbleBuffer(subsonic, journal, flush_interval=None) as buffer:
+        buffer.add("so-0", played_at(0))
+
+        # Invalid credentials do not reject the plays
+        assert buffer.flush() == 0
+        assert len(buffer) == 1
+        assert buffer.rejected == []
+
+    assert len(journal.read_text().splitlines()) == 1
+
+
+def test_offline_journal(mock_server: MockServer, tmp_path: Path) -> None:
+    journal = tmp_path / "scrobbles.jsonl"
+    subsonic = mock_server.subsonic()
+    mock_server.stop()
+
+    with ScrobbleBuffer(subsonic, journal, flush_interval=None) as buffer:
+        for index in range(3):
+            buffer.add(f"so-{index}", played_at(index))
+
+        assert buffer.flush() == 0
+        assert len(buffer) == 3
+
+    assert len(journal.read_text().splitlines()) == 3
+
+    # Simulate a crash while a play was being written
+    with journal.open("a") as file:
+        file.write('{"id": "so-')
+
+    with MockServer(SyntheticLibrary(5, 3, 4)) as server:
+        with ScrobbleBuffer(server.subsonic(), journal, flush_interval=None) as buffer:
+            assert [scrobble.song_id for scrobble in buffer._pending] == [
+                "so-0",
+                "so-1",
+                "so-2",
+            ]
+            assert buffer.flush() == 3
+
+        assert server.request_log[-1][1]["id"] == ["so-0", "so-1", "so-2"]
+        assert server.request_log[-1][1]["time"][2] == str(
+            int(played_at(2).timestamp()) * 1000
+        )
+
+    assert journal.read_text() == ""
+
+
+def test_only_missing_songs_are_rejected(mock_server: MockServer) -> None:
+    buffer = ScrobbleBuffer(
+        mock_server.subsonic(), max_batch_size=6, flush_interval=None
+    )
+
+    for index, song_id in enumerate(
+        ["so-0", "so-1", "missing-0", "so-2", "so-3", "missing-1", "so-4"]
+    ):
+        buffer.add(song_id, played_at(index))
+
+    assert buffer.flush() == 5
+    assert len(buffer) == 0
+    assert [scrobble.song_id for scrobble in buffer.rejected] == [
+        "missing-0",
+        "missing-1",
+    ]
+
+    # Every play of the existing songs is registered once
+    subsonic = mock_server.subsonic()
+    assert [
+        subsonic.browsing.get_song(f"so-{index}").play_count for index in range(5)
+    ] == [1] * 5
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from knuckles.mock_server import MockServer
+
+pytest.importorskip("numpy")
+
+from knuckles import (  # noqa: E402
+    Operator,
+    Rule,
+    SmartPlaylist,
+    SmartPlaylistEngine,
+)
+
+
+def test_evaluate(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    songs = mock_server.library.songs
+
+    for song_id in ["so-3", "so-10", "so-33"]:
+        subsonic.media_annotation.set_rating(song_id, 5)
+
+    subsonic.media_annotation.set_rating("so-20", 2)
+
+    engine = SmartPlaylistEngine(subsonic)
+    playlist = SmartPlaylist(
+        "Favourites", [Rule("user_rating", Operator.GREATER_OR_EQUAL, 4)]
+    )
+
+    assert engine.evaluate(playlist) == ["so-3", "so-10", "so-33"]
+
+    genre = songs["so-10"]["genre"]
+    playlist = SmartPlaylist(
+        "Favourites of a genre",
+        [
+            Rule("user_rating", Operator.GREATER_OR_EQUAL, 4),
+            Rule("genre", Operator.EQUAL, genre),
+        ],
+    )
+
+    assert engine.evaluate(playlist) == [
+        song_id
+        for song_id in ["so-3", "so-10", "so-33"]
+        if songs[song_id]["genre"] == genre
+    ]
+
+
+def test_catalog_is_cached(mock_server: MockServer) -> None:
+    engine = SmartPlaylistEngine(mock_server.subsonic(), page_size=25)
+    playlist = SmartPlaylist("Nineties", [Rule("year", Operator.BETWEEN, (1990, 1999))])
+
+    first = engine.evaluate(playlist)
+    requests = mock_server.count_requests("search3")
+
+    assert requests == 3
+    assert engine.evaluate(playlist) == first
+    assert mock_server.count_requests("search3") == requests
+    assert first == [
+        song_id
+        for song_id, song in mock_server.library.songs.items()
+        if 1990 <= song["year"] <= 1999
+    ]
+
+
+def test_not_played_recently(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    now = datetime.now(timezone.utc)
+
+    subsonic.media_annotation.scrobble(["so-0"], [now - timedelta(days=2)])
+    subsonic.media_annotation.scrobble(["so-1"], [now - timedelta(days=40)])
+
+    engine = SmartPlaylistEngine(subsonic)
+    recent = SmartPlaylist("Recent", [Rule("played", Operator.IN_THE_LAST_DAYS, 30)])
+    forgotten = SmartPlaylist(
+        "Forgotten", [Rule("played", Operator.NOT_IN_THE_LAST_DAYS, 30)]
+    )
+
+    assert engine.evaluate(recent) == ["so-0"]
+
+    # The songs never played have not been played recently either
+    assert len(engine.evaluate(forgotten)) == 59
+    assert "so-0" not in engine.evaluate(forgotten)
+
+
+def test_match_any_sort_and_limit(mock_server: MockServer) -> None:
+    engine = SmartPlaylistEngine(mock_server.subsonic())
+    playlist = SmartPlaylist(
+        "Two artists",
+        [
+            Rule("artist_id", Operator.EQUAL, "ar-0"),
+            Rule("artist_id", Operator.IN, ["ar-4"]),
+        ],
+        match_all=False,
+        sort="duration",
+        descending=True,
+        limit=5,
+    )
+
+    songs = mock_server.library.songs
+    expected = sorted(
+        (
+            song_id
+            for song_id, song in songs.items()
+            if song["artistId"] in ("ar-0", "ar-4")
+        ),
+        key=lambda song_id: -songs[song_id]["duration"],
+    )[:5]
+
+    assert engine.evaluate(playlist) == expected
+
+
+def test_invalid_rule(mock_server: MockServer) -> None:
+    engine = SmartPlaylistEngine(mock_server.subsonic())
+
+    with pytest.raises(ValueError):
+        engine.evaluate(
+            SmartPlaylist("Invalid", [Rule("genre", Operator.GREATER, "Jazz")])
+        )
+
+    with pytest.raises(ValueError):
+        engine.evaluate(
+            SmartPlaylist("Invalid", [Rule("year", Operator.IN_THE_LAST_DAYS, 3)])
+        )
+
+
+def test_push(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    engine = SmartPlaylistEngine(subsonic)
+    playlist = SmartPlaylist(
+        "First artist", [Rule("artist_id", Operator.EQUAL, "ar-0")]
+    )
+
+    created = engine.push(playlist)
+
+    assert [song.id for song in subsonic.playlists.get_playlist(created.id).songs] == [
+        f"so-{index}" for index in range(12)
+    ]
+
+    # Only the changes are sent when the playlist already exists
+    subsonic.media_annotation.set_rating("so-5", 1)
+    engine.refresh()
+    playlist = playlist._replace(
+        rules=[*playlist.rules, Rule("user_rating", Operator.NOT_EQUAL, 1)]
+    )
+    updated = engine.push(playlist, created.id)
+
+    assert [song.id for song in subsonic.playlists.get_playlist(updated.id).songs] == [
+        f"so-{index}" for index in range(12) if index != 5
+    ]
+    assert mock_server.count_requests("createPlaylist") == 1
+    assert mock_server.count_requests("updatePlaylist") == 1
@@ -0,0 +1,145 @@
+import math
+
+import pytest
+from knuckles.mock_server import MockServer
+
+pytest.importorskip("numpy")
+
+from knuckles import SongTable  # noqa: E402
+
+
+@pytest.fixture
+def table(mock_server: MockServer) -> SongTable:
+    return SongTable.from_search(mock_server.subsonic(), song_count=500)
+
+
+def test_from_search(mock_server: MockServer, table: SongTable) -> None:
+    songs = mock_server.library.songs
+
+    assert len(table) == len(songs)
+    assert table.sum("duration") == sum(song["duration"] for song in songs.values())
+    assert table.sum("size") == 64 * 1024 * len(songs)
+    assert sorted(table.categories("album_id")) == sorted(mock_server.library.albums)
+
+
+def test_missing_values(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    subsonic.media_annotation.set_rating("so-0", 4)
+
+    table = SongTable.from_album(subsonic, "al-0")
+
+    assert table["user_rating"][0] == 4
+    assert all(math.isnan(rating) for rating in table["user_rating"][1:])
+    assert table.sum("user_rating") == 4
+
+
+def test_filter(mock_server: MockServer, table: SongTable) -> None:
+    recent = table.filter(table["year"] >= 2000)
+
+    assert sorted(song.id for song in recent.to_songs()) == sorted(
+        song_id
+        for song_id, song in mock_server.library.songs.items()
+        if song["year"] >= 2000
+    )
+
+    by_artist = table.filter(table.is_in("artist_id", ["ar-1", "unknown"]))
+
+    assert len(by_artist) == 12
+    assert set(by_artist["artist_id"]) == {"ar-1"}
+
+
+def test_sort(table: SongTable) -> None:
+    longest = table.sort("duration", descending=True)
+    durations = longest["duration"]
+
+    assert list(durations) == sorted(durations, reverse=True)
+    assert longest.song(0).duration == durations[0]
+
+    by_genre = table.sort("genre")
+
+    assert list(by_genre["genre"]) == sorted(table["genre"])
+
+
+def test_sort_is_stable(table: SongTable) -> None:
+    ids = [song.id for song in table.sort("album_id").to_songs()]
+
+    # The songs of every album keep their track order
+    assert ids[:4] == ["so-0", "so-1", "so-2", "so-3"]
+
+
+def test_group_by(mock_server: MockServer, table: SongTable) -> None:
+    durations: dict[str, float] = {}
+    counts: dict[str, float] = {}
+
+    for song in mock_server.library.songs.values():
+        durations[song["genre"]] = durations.get(song["genre"], 0) + song["duration"]
+        counts[song["genre"]] = counts.get(song["genre"], 0) + 1
+
+    assert table.group_by("genre", "duration") == durations
+    assert table.group_by("genre", aggregation="count") == counts
+
+    means = table.group_by("album_id", "duration", "mean")
+
+    assert means["al-0"] == pytest.approx(
+        sum(mock_server.library.songs[f"so-{i}"]["duration"] for i in range(4)) / 4
+    )
+
+
+def test_group_by_filtered_table(table: SongTable) -> None:
+    counts = table.filter(table.is_in("artist_id", ["ar-0"])).group_by(
+        "album_id", aggregation="count"
+    )
+
+    assert counts == {"al-0": 4, "al-1": 4, "al-2": 4}
+
+
+def test_concat(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    pages = [
+        SongTable.from_search(subsonic, song_count=25, song_offset=offset)
+        for offset in range(0, 60, 25)
+    ]
+
+    table = SongTable.concat(subsonic, pages)
+
+    assert len(table) == 60
+    assert len(set(table["artist_id"])) == 5
+
+
+def test_concat_keeps_columns(
+    mock_server: MockServer, table: SongTable, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    subsonic = mock_server.subsonic()
+    parts = [
+        table.filter(table["year"] % 2 == 0).sort("genre"),
+        SongTable.from_album(subsonic, "al-1"),
+        table.filter(table["year"] % 2 == 1),
+    ]
+    expected = SongTable.from_entries(
+        subsonic, [entry for part in parts for entry in part._selected_entries()]
+    )
+
+    # The dates are not parsed again
+    monkeypatch.setattr("knuckles._song_table.parser.parse", None)
+    joined = SongTable.concat(subsonic, parts)
+
+    assert joined.ids() == expected.ids()
+    for column in ["duration", "created", "played"]:
+        assert joined[column].tolist() == pytest.approx(
+            expected[column].tolist(), nan_ok=True
+        )
+    for column in ["genre", "artist_id", "album_id"]:
+        assert joined[column].tolist() == expected[column].tolist()
+    assert joined.group_by("genre", "duration") == expected.group_by(
+        "genre", "duration"
+    )
+    assert len(SongTable.concat(subsonic, [])) == 0
+
+
+def test_from_songs_by_genre(mock_server: MockServer) -> None:
+    genre = mock_server.library.genre_names()[0]
+    table = SongTable.from_songs_by_genre(mock_server.subsonic(), genre, 500)
+
+    assert len(table) > 0
+    assert set(table["genre"]) == {genre}
+    assert len(SongTable.from_random_songs(mock_server.subsonic(), 7)) == 7
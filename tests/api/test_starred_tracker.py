@@ -0,0 +1,76 @@
+from knuckles import StarredChanges, StarredTracker
+from knuckles.mock_server import MockServer, SyntheticLibrary
+
+
+def test_first_poll_reports_everything(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    subsonic.media_annotation.star(["so-0", "so-1"], ["al-0"], ["ar-0"])
+
+    changes = StarredTracker().poll(subsonic)
+
+    assert changes.username == mock_server.username
+    assert [song.id for song in changes.added_songs] == ["so-0", "so-1"]
+    assert [album.id for album in changes.added_albums] == ["al-0"]
+    assert [artist.id for artist in changes.added_artists] == ["ar-0"]
+    assert changes.removed_songs == []
+
+
+def test_poll_diff(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    tracker = StarredTracker()
+    events: list[StarredChanges] = []
+    tracker.subscribe(events.append)
+
+    subsonic.media_annotation.star(["so-0", "so-1"], ["al-0"])
+    tracker.poll(subsonic)
+
+    subsonic.media_annotation.unstar(["so-0"], ["al-0"])
+    subsonic.media_annotation.star(["so-2"], artist_ids=["ar-1"])
+    changes = tracker.poll(subsonic)
+
+    assert [song.id for song in changes.added_songs] == ["so-2"]
+    assert [song.id for song in changes.removed_songs] == ["so-0"]
+    assert changes.added_albums == []
+    assert [album.id for album in changes.removed_albums] == ["al-0"]
+    assert [artist.id for artist in changes.added_artists] == ["ar-1"]
+
+    # Polls without changes do not emit events
+    assert not tracker.poll(subsonic).has_changes
+    assert events == [events[0], changes]
+
+
+def test_unsubscribe(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    tracker = StarredTracker()
+    events: list[StarredChanges] = []
+
+    unsubscribe = tracker.subscribe(events.append)
+    unsubscribe()
+
+    subsonic.media_annotation.star_song("so-0")
+    tracker.poll(subsonic)
+
+    assert events == []
+
+
+def test_snapshots_per_user(mock_server: MockServer) -> None:
+    with MockServer(SyntheticLibrary(5, 3, 4), username="other") as other_server:
+        admin = mock_server.subsonic()
+        other = other_server.subsonic()
+        admin.media_annotation.star_song("so-0")
+        other.media_annotation.star_song("so-1")
+
+        tracker = StarredTracker()
+        first = tracker.poll_all([admin, other])
+
+        assert [changes.username for changes in first] == ["admin", "other"]
+        assert [song.id for song in first[1].added_songs] == ["so-1"]
+
+        other.media_annotation.unstar_song("so-1")
+        second = tracker.poll_all([admin, other])
+
+        assert not second[0].has_changes
+        assert [song.id for song in second[1].removed_songs] == ["so-1"]
+
+        tracker.forget("admin")
+        assert tracker.poll(admin).has_changes
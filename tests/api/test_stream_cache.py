@@ -0,0 +1,123 @@
+import io
+from pathlib import Path
+
+import pytest
+from knuckles import Segment, StreamCache
+from knuckles._stream_cache import _parse_m3u8
+from knuckles.mock_server import MockServer
+
+
+def test_stream(mock_server: MockServer, tmp_path: Path) -> None:
+    with StreamCache(mock_server.subsonic(), tmp_path, segment_size=16384) as cache:
+        reader = cache.open_stream("so-3")
+
+        assert len(reader.segments) == 4
+        assert reader.read() == mock_server.library.song_content("so-3")
+
+
+def test_listeners_share_fetches(mock_server: MockServer, tmp_path: Path) -> None:
+    with StreamCache(mock_server.subsonic(), tmp_path, segment_size=16384) as cache:
+        first = cache.open_stream("so-3")
+        second = cache.open_stream("so-3")
+
+        assert first.read() == second.read()
+
+    assert mock_server.count_requests("stream") == 4
+    assert cache.misses == 4
+
+
+def test_seek(mock_server: MockServer, tmp_path: Path) -> None:
+    content = mock_server.library.song_content("so-3")
+
+    with StreamCache(mock_server.subsonic(), tmp_path, segment_size=16384) as cache:
+        reader = cache.open_stream("so-3")
+
+        assert reader.seekable()
+        assert reader.seek(40000) == 40000
+        assert reader.read(100) == content[40000:40100]
+        assert reader.seek(-10, io.SEEK_END) == len(content) - 10
+        assert reader.read() == content[-10:]
+
+
+def test_reuse_directory(mock_server: MockServer, tmp_path: Path) -> None:
+    with StreamCache(mock_server.subsonic(), tmp_path, segment_size=16384) as cache:
+        cache.open_stream("so-3").read()
+
+    with StreamCache(mock_server.subsonic(), tmp_path, segment_size=16384) as cache:
+        assert cache.size == len(mock_server.library.song_content("so-3"))
+
+        cache.open_stream("so-3").read()
+
+    # Only the first segment is requested again to learn the size
+    assert mock_server.count_requests("stream") == 5
+    assert cache.hits == 4
+
+
+def test_eviction(mock_server: MockServer, tmp_path: Path) -> None:
+    with StreamCache(
+        mock_server.subsonic(),
+        tmp_path,
+        max_size=32768,
+        prefetch=0,
+        segment_size=16384,
+    ) as cache:
+        content = cache.open_stream("so-3").read()
+
+        assert content == mock_server.library.song_content("so-3")
+        assert cache.size <= 32768
+        assert len(list(tmp_path.glob("*.segment"))) == 2
+
+
+def test_hls(mock_server: MockServer, tmp_path: Path) -> None:
+    song = mock_server.library.songs["so-5"]
+
+    with StreamCache(mock_server.subsonic(), tmp_path) as cache:
+        reader = cache.open_hls("so-5")
+
+        assert (
+            sum(segment.duration or 0 for segment in reader.segments)
+            == (song["duration"])
+        )
+        assert reader.read() == mock_server.library.song_content("so-5")
+
+        index = reader.seek_time(15)
+        assert index == 1
+        assert reader.tell() == reader.segments[0].size
+
+    assert mock_server.count_requests("stream") == len(reader.segments)
+
+
+def test_parse_m3u8() -> None:
+    segments, variants = _parse_m3u8(
+        "#EXTM3U\n"
+        "#EXT-X-STREAM-INF:BANDWIDTH=128000\n"
+        "low/index.m3u8\n"
+        "#EXTINF:10,\n"
+        "#EXT-X-BYTERANGE:100@0\n"
+        "segments.ts\n"
+        "#EXTINF:5.5,\n"
+        "#EXT-X-BYTERANGE:50\n"
+        "segments.ts\n"
+        "#EXTINF:10,\n"
+        "https://cdn.example.com/last.ts\n",
+        "https://example.com/rest/hls.m3u8?id=1",
+    )
+
+    assert variants == ["https://example.com/rest/low/index.m3u8"]
+    assert segments == [
+        Segment("https://example.com/rest/segments.ts", 10, (0, 100)),
+        Segment("https://example.com/rest/segments.ts", 5.5, (100, 50)),
+        Segment("https://cdn.example.com/last.ts", 10, None),
+    ]
+
+
+def test_seek_unknown_sizes(mock_server: MockServer, tmp_path: Path) -> None:
+    with StreamCache(mock_server.subsonic(), tmp_path) as cache:
+        reader = cache.open_hls("so-5")
+        reader.segments = [
+            segment._replace(byte_range=None) for segment in reader.segments
+        ]
+
+        assert not reader.seekable()
+        with pytest.raises(io.UnsupportedOperation):
+            reader.seek(10)
@@ -1,5 +1,5 @@
 import urllib.parse
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, Iterator, Protocol
 
 import knuckles
 import pytest
@@ -7,6 +7,7 @@ import requests
 import responses
 from _pytest.fixtures import FixtureRequest
 from knuckles import Subsonic
+from knuckles.mock_server import MockServer, SyntheticLibrary
 from responses import GET, POST, Response, matchers
 
 pytest_plugins = [
@@ -198,3 +199,13 @@ def add_responses() -> AddResponses:
             responses.add(response)
 
     return inner
+
+
+@pytest.fixture
+def mock_server() -> Iterator[MockServer]:
+    library = SyntheticLibrary(
+        num_of_artists=5, albums_per_artist=3, songs_per_album=4, song_size=64 * 1024
+    )
+
+    with MockServer(library) as server:
+        yield server
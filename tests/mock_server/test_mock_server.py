@@ -0,0 +1,100 @@
+import time
+
+import knuckles
+import pytest
+import requests
+from knuckles.exceptions import ErrorCode40, ErrorCode70
+from knuckles.mock_server import MockServer
+
+
+@pytest.mark.parametrize("request_method", list(knuckles.RequestMethod))
+def test_ping(mock_server: MockServer, request_method: knuckles.RequestMethod) -> None:
+    subsonic = mock_server.subsonic(request_method=request_method)
+
+    assert subsonic.system.ping().status == "ok"
+    assert mock_server.count_requests("ping") == 1
+
+
+def test_plain_text_password(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(use_token=False)
+
+    assert subsonic.system.ping().status == "ok"
+
+
+def test_wrong_password(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(password="wrong")
+
+    with pytest.raises(ErrorCode40):
+        subsonic.system.ping()
+
+
+def test_not_found(mock_server: MockServer) -> None:
+    with pytest.raises(ErrorCode70):
+        mock_server.subsonic().browsing.get_album("missing")
+
+
+def test_browsing(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+
+    artists = subsonic.browsing.get_artists()
+    artist = subsonic.browsing.get_artist(artists[0].id)
+    album = subsonic.browsing.get_album(artist.albums[0].id)
+
+    assert len(artists) == len(mock_server.library.artists)
+    assert len(artist.albums) == 3
+    assert len(album.songs) == 4
+    assert album.songs[0].album.id == album.id
+
+
+def test_album_list_paging(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+
+    first_page = subsonic.lists.get_album_list_alphabetical_by_name(10, 0)
+    second_page = subsonic.lists.get_album_list_alphabetical_by_name(10, 10)
+
+    assert len(first_page) == 10
+    assert len(second_page) == len(mock_server.library.albums) - 10
+    assert {album.id for album in first_page}.isdisjoint(
+        album.id for album in second_page
+    )
+
+
+def test_search(mock_server: MockServer) -> None:
+    result = mock_server.subsonic().searching.search("song 1", song_count=100)
+
+    assert result.songs
+    assert all("song 1" in song.title.lower() for song in result.songs)
+
+
+def test_star(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+
+    subsonic.media_annotation.star_song("so-1")
+    subsonic.media_annotation.star_album("al-1")
+
+    starred = subsonic.lists.get_starred()
+
+    assert [song.id for song in starred.songs] == ["so-1"]
+    assert [album.id for album in starred.albums] == ["al-1"]
+    assert starred.artists is None
+
+
+def test_stream_range(mock_server: MockServer) -> None:
+    url = mock_server.subsonic().media_retrieval.stream("so-1")
+    content = mock_server.library.song_content("so-1")
+
+    response = requests.get(url, headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.content == content[100:200]
+    assert response.headers["Content-Range"] == f"bytes 100-199/{len(content)}"
+
+
+def test_latency(mock_server: MockServer) -> None:
+    mock_server.latency = 0.2
+    subsonic = mock_server.subsonic()
+
+    start = time.perf_counter()
+    subsonic.system.ping()
+
+    assert time.perf_counter() - start >= 0.2
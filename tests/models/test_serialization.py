@@ -0,0 +1,166 @@
+import json
+from datetime import datetime
+
+import pytest
+from knuckles import Album, Song, SubsonicPool, from_msgpack, to_msgpack
+from knuckles.mock_server import MockServer
+
+
+def test_to_dict(mock_server: MockServer) -> None:
+    song = mock_server.subsonic().browsing.get_song("so-0")
+    data = song.to_dict()
+
+    assert data["_type"] == "Song"
+    assert data["id"] == "so-0"
+    assert data["artist"] == {**data["artist"], "_type": "Artist", "id": "ar-0"}
+    assert data["created"] == {"_datetime": song.created.isoformat()}
+    assert "_subsonic" not in data
+
+    # The dictionary can be encoded to JSON as is
+    json.dumps(data)
+
+
+def test_round_trip(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    other = mock_server.subsonic(client="other")
+    album = subsonic.browsing.get_album("al-0")
+
+    loaded = Album.from_dict(other, json.loads(json.dumps(album.to_dict())))
+
+    assert loaded.to_dict() == album.to_dict()
+    assert isinstance(loaded.created, datetime)
+    assert isinstance(loaded.songs[0], Song)
+    assert (
+        loaded.songs[0].replay_gain.track_gain == album.songs[0].replay_gain.track_gain
+    )
+
+    # The loaded models are bound to the given client
+    assert loaded._subsonic is other
+    assert loaded.songs[0].artist._subsonic is other
+    assert loaded.songs[0].generate().id == "so-0"
+
+
+def test_dictionaries(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic()
+    index = subsonic.browsing.get_artists_indexed("0", 0)
+
+    loaded = type(index).from_dict(subsonic, index.to_dict())
+
+    assert loaded.index.keys() == index.index.keys()
+    assert loaded.to_dict() == index.to_dict()
+
+
+def test_wrong_type(mock_server: MockServer) -> None:
+    song = mock_server.subsonic().browsing.get_song("so-0")
+
+    with pytest.raises(TypeError):
+        Album.from_dict(mock_server.subsonic(), song.to_dict())
+
+
+def test_cycles(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    album = subsonic.browsing.get_album("al-0")
+
+    assert album.songs[0].album is album
+
+    data = album.to_dict()
+
+    assert data["songs"][0]["album"] == {"_type": "Album", "_ref": "al-0"}
+
+    loaded = Album.from_dict(mock_server.subsonic(), data)
+
+    assert loaded.songs[0].album is loaded
+
+
+def test_msgpack(mock_server: MockServer) -> None:
+    pytest.importorskip("msgpack")
+
+    subsonic = mock_server.subsonic()
+    models = [
+        *subsonic.browsing.get_album("al-1").songs,
+        subsonic.browsing.get_artist("ar-2"),
+    ]
+
+    payload = to_msgpack(models)
+    loaded = from_msgpack(subsonic, payload)
+
+    assert [type(model) for model in loaded] == [type(model) for model in models]
+    assert [model.to_dict() for model in loaded] == [
+        model.to_dict() for model in models
+    ]
+    assert len(payload) < len(json.dumps([model.to_dict() for model in models]))
+
+
+def test_cycles_with_known_instances(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+    album = subsonic.browsing.get_album("al-0")
+
+    loaded = Album.from_dict(subsonic, album.to_dict())
+
+    # The loaded album is the known one and the references point to it
+    assert loaded is album
+    assert loaded.songs[0].album is album
+
+
+def test_pool(mock_server: MockServer) -> None:
+    pool = SubsonicPool([mock_server.subsonic()])
+    album = pool.browsing.get_album("al-0")
+
+    loaded = Album.from_dict(pool, album.to_dict())
+
+    assert loaded.to_dict() == album.to_dict()
+    assert loaded._subsonic is pool
+
+
+def test_cycle_without_id(mock_server: MockServer) -> None:
+    song = mock_server.subsonic().browsing.get_song("so-0")
+    song.replay_gain.itself = song.replay_gain  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError):
+        song.to_dict()
+
+
+def _count_encodings(value: object, counts: dict[tuple[str, str], int]) -> None:
+    if isinstance(value, list):
+        for item in value:
+            _count_encodings(item, counts)
+
+    if not isinstance(value, dict):
+        return
+
+    if "_type" in value and "_ref" not in value and "id" in value:
+        key = (value["_type"], value["id"])
+        counts[key] = counts.get(key, 0) + 1
+
+    for item in value.values():
+        _count_encodings(item, counts)
+
+
+def test_shared_models(mock_server: MockServer) -> None:
+    subsonic = mock_server.subsonic(identity_map=True)
+
+    # Link every song with its album and artist, the identity map only
+    # keeps them while they are referenced
+    albums = [
+        subsonic.browsing.get_album(album.id)
+        for artist in subsonic.browsing.get_artists()
+        for album in subsonic.browsing.get_artist(artist.id).albums or []
+    ]
+
+    song = subsonic.browsing.get_song("so-0")
+    data = song.to_dict()
+
+    counts: dict[tuple[str, str], int] = {}
+    _count_encodings(data, counts)
+
+    # Every model is encoded once and referenced everywhere else
+    assert counts
+    assert set(counts.values()) == {1}
+    # Without references the payload is ten times bigger
+    assert len(json.dumps(data)) < 2000 * len(counts)
+
+    loaded = Song.from_dict(mock_server.subsonic(), data)
+
+    assert loaded.to_dict() == data
+    assert loaded.album.songs[0].album is loaded.album
+    assert len(albums) == 15